@@ -0,0 +1,1187 @@
+#!/usr/bin/env python3
+"""
+Pipeline Benchmarks
+
+Measure data-pipeline performance offline, using the replay backend instead
+of the FiinQuantX API.
+"""
+
+import argparse
+import copy
+import multiprocessing
+import os
+import shutil
+import tempfile
+import time
+import tracemalloc
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+import numpy as np
+import pandas as pd
+from loguru import logger
+
+from src.backtesting.trades import _long_only_trades_jit, _long_only_trades_numpy
+from src.data.data_fetcher import create_data_fetcher
+from src.data.feature_engineering import FeatureEngineer
+from src.data.feature_store import FeatureStore
+from src.data.panel import Panel
+from src.data.quantile_sketch import causal_regime, regime_settings
+from src.data import indicators
+from src.data.indicators import LocalIndicator, PandasIndicator
+from src.data import labeling
+from src.data.label_search import search_labeling_params
+from src.data.label_store import LABEL_COLUMNS, LabelStore, label_bars
+from src.data.labeling import (
+    _event_driven_labels_loop, analyze_labeling_quality, apply_triple_barrier_labeling,
+    event_driven_labels, labeling_params, rolling_volatility
+)
+from src.data.replay_client import synthetic_ohlcv
+from src.data.schema import apply_schema, read_market_csv
+from src.data.streaming_features import (
+    StreamingFeatureEngineer, VolatilityRegime, create_streaming_feature_engineer
+)
+from src.pipeline.data_pipeline import DataPipeline
+from src.utils.config_loader import config_loader
+from src.utils.jit import NUMBA_AVAILABLE, python_function
+from src.utils.profiling import minor_page_faults, peak_rss_mb
+
+
+def benchmark_fetch(args: argparse.Namespace) -> None:
+    """Compare fetch wall time across concurrency and caching modes"""
+    base_config = copy.deepcopy(config_loader.load_config("data_config"))
+    data_config = base_config['data']
+    data_config['backend'] = 'replay'
+    data_config['replay'].update({
+        'source': args.source,
+        'latency_ms': args.latency_ms,
+        'login_ms': 0,
+    })
+    tickers = data_config['custom_tickers']
+    cache_dir = tempfile.mkdtemp(prefix="fetch_cache_")
+
+    modes = {
+        'single request': {'fetch': {'enabled': False}, 'cache': {'enabled': False}},
+        'scheduler': {'fetch': {**data_config['fetch'], 'enabled': True,
+                                'max_workers': args.workers, 'batch_size': args.batch_size,
+                                'rate_per_sec': 1000, 'burst': args.workers},
+                      'cache': {'enabled': False}},
+        'cache (cold)': {'fetch': {'enabled': False}, 'cache': {'enabled': True, 'dir': cache_dir}},
+        'cache (warm)': {'fetch': {'enabled': False}, 'cache': {'enabled': True, 'dir': cache_dir}},
+    }
+
+    try:
+        print(f"{'mode':<16}{'rows':>10}{'api calls':>12}{'wall (s)':>12}")
+        for name, overrides in modes.items():
+            config = copy.deepcopy(base_config)
+            config['data'].update(overrides)
+            fetcher = create_data_fetcher(None, None, config)
+
+            started = time.perf_counter()
+            data = fetcher.fetch_trading_data(
+                tickers=tickers,
+                fields=data_config['fields'],
+                start_date=data_config['start_date'],
+                end_date=data_config['end_date'],
+            )
+            elapsed = time.perf_counter() - started
+
+            calls = fetcher.client.stats['calls']
+            print(f"{name:<16}{len(data):>10}{calls:>12}{elapsed:>12.3f}")
+    finally:
+        shutil.rmtree(cache_dir, ignore_errors=True)
+
+
+def _run_pipeline_mode(mode: str, config: dict, workdir: str, save_intermediate: bool) -> dict:
+    """Run one pipeline mode inside workdir (executed in a fresh process)
+
+    Follows run_data_pipeline / run_streaming_data_pipeline, so peak RSS
+    includes writing the train/val/test splits.
+    """
+    logger.remove()
+    os.chdir(workdir)
+    Path("data/raw").mkdir(parents=True, exist_ok=True)
+
+    config = copy.deepcopy(config)
+    config['data']['pipeline']['mode'] = mode
+    pipeline = DataPipeline(None, None)
+    started = time.perf_counter()
+    if mode == 'streaming':
+        final_path = pipeline.run_streaming_pipeline(config, save_intermediate)
+        rows = sum(pipeline.split_dataset_file(final_path, config))
+    else:
+        final_data = pipeline.run_data_pipeline(config, save_intermediate)
+        pipeline.split_data(final_data, config)
+        rows = len(final_data)
+    return {'rows': rows, 'seconds': time.perf_counter() - started, 'peak_rss_mb': peak_rss_mb()}
+
+
+def _final_outputs_identical(workdirs: dict) -> tuple:
+    """Whether the batch and streaming final datasets and splits are identical
+
+    hit_time / vbar_end hold row positions of the fetched frame, which are
+    relative to the ticker batch in streaming mode, so they are left out.
+    """
+    def read(mode: str, name: str) -> pd.DataFrame:
+        return (pd.read_csv(os.path.join(workdirs[mode], f"data/final/{name}.csv"))
+                .drop(columns=['hit_time', 'vbar_end'], errors='ignore'))
+
+    final_identical = read('batch', 'final_dataset').equals(read('streaming', 'final_dataset'))
+    splits_identical = all(read('batch', f"{name}_data").equals(read('streaming', f"{name}_data"))
+                           for name in ('train', 'val', 'test'))
+    return final_identical, splits_identical
+
+
+def benchmark_pipeline(args: argparse.Namespace) -> None:
+    """Compare runtime and peak memory of the batch and streaming pipelines
+
+    With several --tickers counts, both modes run at each count: streaming
+    peak RSS should stay flat while batch peak RSS grows with the universe.
+    """
+    config = copy.deepcopy({**config_loader.load_config("data_config"),
+                            **config_loader.load_config("labeling_config")})
+    data_config = config['data']
+    data_config['backend'] = 'replay'
+    data_config['replay'].update({
+        'source': args.source if args.source == 'synthetic' else os.path.abspath(args.source),
+        'latency_ms': 0,
+        'jitter_ms': 0,
+        'bandwidth_mbps': None,
+        'login_ms': 0,
+    })
+    data_config['cache']['enabled'] = False
+    data_config['ingestion']['mode'] = 'full'
+    data_config['pipeline']['batch_size'] = args.batch_size
+
+    # Each mode runs in a fresh process so that peak RSS is not shared
+    context = multiprocessing.get_context('spawn')
+    print(f"{'tickers':>8}  {'mode':<12}{'rows':>10}{'wall (s)':>12}{'peak RSS (MB)':>16}")
+    for n_tickers in args.tickers or [None]:
+        if n_tickers is not None:
+            data_config['custom_tickers'] = [f"T{i:04d}" for i in range(n_tickers)]
+        workdirs = {}
+        try:
+            for mode in ('batch', 'streaming'):
+                workdirs[mode] = tempfile.mkdtemp(prefix=f"pipeline_{mode}_")
+                with context.Pool(1) as pool:
+                    stats = pool.apply(_run_pipeline_mode,
+                                       (mode, config, workdirs[mode], args.save_intermediate))
+                peak = stats['peak_rss_mb']
+                peak_text = f"{peak:.0f}" if peak is not None else "n/a"
+                label = n_tickers if n_tickers is not None else 'config'
+                print(f"{label:>8}  {mode:<12}{stats['rows']:>10}{stats['seconds']:>12.2f}{peak_text:>16}")
+
+            final_identical, splits_identical = _final_outputs_identical(workdirs)
+            print(f"{'':>8}  final datasets identical: {final_identical}, "
+                  f"train/val/test splits identical: {splits_identical}")
+        finally:
+            for workdir in workdirs.values():
+                shutil.rmtree(workdir, ignore_errors=True)
+
+
+INDICATOR_CALLS = {
+    'ema': lambda fi, g: fi.ema(g['close'], window=20),
+    'sma': lambda fi, g: fi.sma(g['close'], window=50),
+    'macd': lambda fi, g: fi.macd(g['close'], window_fast=12, window_slow=26),
+    'macd_signal': lambda fi, g: fi.macd_signal(g['close'], window_fast=12, window_slow=26, window_sign=9),
+    'macd_diff': lambda fi, g: fi.macd_diff(g['close'], window_fast=12, window_slow=26, window_sign=9),
+    'rsi': lambda fi, g: fi.rsi(g['close'], window=14),
+    'stoch': lambda fi, g: fi.stoch(g['high'], g['low'], g['close'], window=14),
+    'stoch_signal': lambda fi, g: fi.stoch_signal(g['high'], g['low'], g['close'], window=14),
+    'bollinger_hband': lambda fi, g: fi.bollinger_hband(g['close'], window=20, window_dev=2),
+    'bollinger_lband': lambda fi, g: fi.bollinger_lband(g['close'], window=20, window_dev=2),
+    'atr': lambda fi, g: fi.atr(g['high'], g['low'], g['close'], window=14),
+    'adx': lambda fi, g: fi.adx(g['high'], g['low'], g['close'], window=14),
+    'mfi': lambda fi, g: fi.mfi(g['high'], g['low'], g['close'], g['volume'], window=14),
+    'vwap': lambda fi, g: fi.vwap(g['high'], g['low'], g['close'], g['volume'], window=14),
+    'obv': lambda fi, g: fi.obv(g['close'], g['volume']),
+}
+
+
+def benchmark_indicators(args: argparse.Namespace) -> int:
+    """Check the NumPy indicator kernels against a reference and time both"""
+    if args.reference == 'fiin':
+        from src.data.session import get_session_manager
+        reference = get_session_manager().get_client().FiinIndicator()
+    else:
+        reference = PandasIndicator()
+    local = LocalIndicator()
+
+    data = read_market_csv(args.source)
+    stats = {name: {'max_rel_err': 0.0, 'nan_mismatch': 0, 'local_s': 0.0, 'reference_s': 0.0}
+             for name in INDICATOR_CALLS}
+
+    for _, group in data.groupby('ticker', observed=True):
+        for name, call in INDICATOR_CALLS.items():
+            started = time.perf_counter()
+            ours = call(local, group).to_numpy(dtype=np.float64)
+            stats[name]['local_s'] += time.perf_counter() - started
+
+            started = time.perf_counter()
+            theirs = pd.Series(call(reference, group)).to_numpy(dtype=np.float64)
+            stats[name]['reference_s'] += time.perf_counter() - started
+
+            stats[name]['nan_mismatch'] += int((np.isnan(ours) != np.isnan(theirs)).sum())
+            both = ~np.isnan(ours) & ~np.isnan(theirs)
+            if both.any():
+                rel_err = np.abs(ours[both] - theirs[both]) / np.maximum(1.0, np.abs(theirs[both]))
+                stats[name]['max_rel_err'] = max(stats[name]['max_rel_err'], float(rel_err.max()))
+
+    failed = 0
+    print(f"{'indicator':<18}{'max rel err':>14}{'NaN diff':>10}{'local (ms)':>12}"
+          f"{args.reference + ' (ms)':>14}{'':>6}")
+    for name, s in stats.items():
+        ok = s['max_rel_err'] <= args.tolerance and s['nan_mismatch'] == 0
+        failed += not ok
+        print(f"{name:<18}{s['max_rel_err']:>14.2e}{s['nan_mismatch']:>10}"
+              f"{s['local_s'] * 1e3:>12.1f}{s['reference_s'] * 1e3:>14.1f}{'ok' if ok else 'FAIL':>6}")
+    return 1 if failed else 0
+
+
+def benchmark_rolling(args: argparse.Namespace) -> int:
+    """Rolling min, max and percentile rank kernels vs pandas on a close panel
+
+    Kernels run once on the packed (rows x tickers) panel; pandas runs
+    column-wise on the same array. Results must match exactly.
+    """
+    data = _load_market_data(args)
+    close = Panel(data, columns=['close']).values['close']
+    frame = pd.DataFrame(close)
+    kernels = {
+        'min': (indicators.rolling_min, lambda rolling: rolling.min()),
+        'max': (indicators.rolling_max, lambda rolling: rolling.max()),
+        'rank': (indicators.rolling_rank_pct, lambda rolling: rolling.rank(pct=True)),
+    }
+
+    print(f"{close.shape[0]} rows x {close.shape[1]} tickers")
+    print(f"{'op':<6}{'window':>8}{'kernel ms':>11}{'pandas ms':>11}{'speedup':>9}  identical")
+    identical = True
+    for window in args.windows:
+        for name, (kernel, reference) in kernels.items():
+            started = time.perf_counter()
+            result = kernel(close, window)
+            kernel_s = time.perf_counter() - started
+            started = time.perf_counter()
+            expected = reference(frame.rolling(window)).to_numpy()
+            pandas_s = time.perf_counter() - started
+            same = np.array_equal(result, expected, equal_nan=True)
+            identical &= same
+            print(f"{name:<6}{window:>8}{kernel_s * 1e3:>11.1f}{pandas_s * 1e3:>11.1f}"
+                  f"{pandas_s / kernel_s:>8.1f}x  {same}")
+    return 0 if identical else 1
+
+
+def _load_market_data(args: argparse.Namespace) -> pd.DataFrame:
+    """Trading data from a CSV, or synthetic bars for --tickers symbols"""
+    if args.source == 'synthetic':
+        tickers = [f"SYN{i:04d}" for i in range(args.tickers)]
+        return apply_schema(synthetic_ohlcv(tickers, args.start_date, args.end_date))
+    return read_market_csv(args.source)
+
+
+def _run_feature_engine(engine: str, source: dict, repeat: int, n_workers: int = 1) -> dict:
+    """Time and memory-profile one feature engine (executed in a fresh process)"""
+    logger.remove()
+    config = config_loader.load_config("data_config")
+    data = _load_market_data(argparse.Namespace(**source))
+    engineer = FeatureEngineer(None, indicator_backend='local', engine=engine, n_workers=n_workers)
+
+    faults = minor_page_faults()
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        result = engineer.engineer_features(data, config)
+        timings.append(time.perf_counter() - started)
+    if faults is not None:
+        faults = (minor_page_faults() - faults) / repeat
+
+    tracemalloc.start()
+    engineer.engineer_features(data, config)
+    traced_peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+
+    return {
+        'rows': len(data),
+        'tickers': int(data['ticker'].nunique()),
+        'seconds': min(timings),
+        'page_faults': faults,
+        'traced_peak_mb': traced_peak / 1024 ** 2,
+        'columns': [(col, str(dtype)) for col, dtype in result.dtypes.items()],
+        'hash': int(pd.util.hash_pandas_object(result).sum()),
+    }
+
+
+def benchmark_features(args: argparse.Namespace) -> int:
+    """Compare the per-ticker and panel feature engines (local indicators)
+
+    Reports wall time per 10k rows, minor page faults (fresh memory touched,
+    i.e. allocation volume) and the peak of traced allocations. With
+    --workers above 1, both engines are also run on a process pool (page
+    faults and traced memory then only cover the parent process).
+    """
+    source = {'source': args.source, 'tickers': args.tickers,
+              'start_date': args.start_date, 'end_date': args.end_date}
+
+    # Each engine runs in a fresh process so page faults are not shared
+    context = multiprocessing.get_context('spawn')
+    results = {}
+    runs = [(engine, 1) for engine in ('per_ticker', 'panel')]
+    if args.workers > 1:
+        runs += [(engine, args.workers) for engine in ('per_ticker', 'panel')]
+    for engine, n_workers in runs:
+        name = engine if n_workers == 1 else f"{engine} x{n_workers}"
+        # Executor processes are not daemonic, so they can start their own workers
+        with ProcessPoolExecutor(max_workers=1, mp_context=context) as executor:
+            results[name] = executor.submit(_run_feature_engine, engine, source, args.repeat, n_workers).result()
+
+    first = results['per_ticker']
+    print(f"{first['rows']} rows, {first['tickers']} tickers, {len(first['columns'])} columns")
+    print(f"{'engine':<16}{'ms / 10k rows':>15}{'page faults / 10k rows':>24}{'traced peak (MB)':>18}")
+    for engine, stats in results.items():
+        per_10k = 1e4 / stats['rows']
+        faults = stats['page_faults']
+        faults_text = f"{faults * per_10k:.0f}" if faults is not None else "n/a"
+        print(f"{engine:<16}{stats['seconds'] * 1e3 * per_10k:>15.1f}{faults_text:>24}"
+              f"{stats['traced_peak_mb']:>18.1f}")
+
+    identical = all(stats['columns'] == first['columns'] and stats['hash'] == first['hash']
+                    for stats in results.values())
+    print(f"features identical: {identical}")
+    return 0 if identical else 1
+
+
+def benchmark_plan(args: argparse.Namespace) -> None:
+    """Per-op timings of the feature plan on the panel engine"""
+    config = config_loader.load_config("data_config")
+    data = _load_market_data(args)
+    engineer = FeatureEngineer(None, indicator_backend='local', engine='panel')
+    engineer.engineer_features(data, config)
+
+    timings = sorted(engineer.plan_timings, key=lambda t: t['seconds'], reverse=True)
+    total = sum(t['seconds'] for t in timings)
+    print(f"{len(data)} rows, {data['ticker'].nunique()} tickers, {len(timings)} ops, {total:.2f}s")
+    print(f"{'ms':>9}{'share':>8}{'uses':>6}  op")
+    for timing in timings[:args.top] if args.top else timings:
+        print(f"{timing['seconds'] * 1e3:>9.1f}{timing['seconds'] / total:>8.1%}"
+              f"{timing['consumers']:>6}  {timing['node']}")
+
+
+def benchmark_feature_store(args: argparse.Namespace) -> int:
+    """Cold, warm and one-indicator-changed runs against a fresh feature store
+
+    Each run is checked against the same config computed without a store. A
+    last run drops each ticker's last bar, which misses every block and
+    replaces the tickers' entries rather than adding to them.
+    """
+    config = config_loader.load_config("data_config")
+    data = _load_market_data(args)
+    changed = copy.deepcopy(config)
+    tech_config = changed['features']['technical_indicators']
+    tech_config['rsi_period'] = tech_config.get('rsi_period', 14) + 1
+
+    store_dir = tempfile.mkdtemp(prefix="feature_store_")
+    try:
+        store = FeatureStore(store_dir)
+        engineer = FeatureEngineer(None, indicator_backend='local', engine=args.engine, feature_store=store)
+        reference = FeatureEngineer(None, indicator_backend='local', engine=args.engine)
+
+        print(f"{len(data)} rows, {data['ticker'].nunique()} tickers, engine {args.engine}")
+        print(f"{'run':<14}{'seconds':>9}{'blocks hit':>12}{'computed':>10}  identical")
+        identical = True
+        started = time.perf_counter()
+        baseline = reference.engineer_features(data, config)
+        print(f"{'no store':<14}{time.perf_counter() - started:>9.2f}{'':>12}{'':>10}")
+        shorter = data.drop(data.groupby('ticker', observed=True).tail(1).index)
+        runs = (('cold', data, config), ('warm', data, config), ('rsi changed', data, changed),
+                ('bar dropped', shorter, config))
+        for run, run_data, run_config in runs:
+            hits, misses = store.stats['hits'], store.stats['misses']
+            started = time.perf_counter()
+            result = engineer.engineer_features(run_data, run_config)
+            elapsed = time.perf_counter() - started
+            if run_data is data and run_config is config:
+                expected = baseline
+            else:
+                expected = reference.engineer_features(run_data, run_config)
+            same = result.equals(expected) and list(result.dtypes) == list(expected.dtypes)
+            identical &= same
+            print(f"{run:<14}{elapsed:>9.2f}{store.stats['hits'] - hits:>12}"
+                  f"{store.stats['misses'] - misses:>10}  {same}")
+        entries = len(list(Path(store_dir).glob('*/*.arrow')))
+        print(f"store entries: {entries} for {data['ticker'].nunique()} tickers")
+    finally:
+        shutil.rmtree(store_dir, ignore_errors=True)
+    return 0 if identical else 1
+
+
+def benchmark_streaming(args: argparse.Namespace) -> int:
+    """Check streaming feature states against the batch FeatureEngineer
+
+    Bars are fed one at a time; halfway through, the states are saved to a
+    JSON checkpoint and the rest of the stream continues from the restored
+    copy. Every streamed value is compared with the batch feature of the
+    same row. Two cases are skipped and counted: ADX of tickers shorter
+    than 2 * window (batch gives NaN for the whole ticker, ta's warm-up
+    zeros are streamed), and Bollinger positions where the band is narrower
+    than 1e-7 of the close (the batch value is rounding noise there).
+    """
+    config = config_loader.load_config("data_config")
+    data = _load_market_data(args)
+    # Streaming order: each ticker's bars in time order, tickers in group order
+    data = data.sort_values('ticker', kind='stable').reset_index(drop=True)
+    batch = FeatureEngineer(None, indicator_backend='local').engineer_features(data, config)
+    batch = batch.reset_index(drop=True)
+
+    half = len(data) // 2
+    checkpoint_dir = tempfile.mkdtemp(prefix="streaming_state_")
+    try:
+        started = time.perf_counter()
+        engineer = create_streaming_feature_engineer(config)
+        first = engineer.update_frame(data.iloc[:half])
+        checkpoint = os.path.join(checkpoint_dir, "state.json")
+        engineer.save(checkpoint)
+        resumed = StreamingFeatureEngineer.load(checkpoint)
+        second = resumed.update_frame(data.iloc[half:])
+        elapsed = time.perf_counter() - started
+        checkpoint_kb = os.path.getsize(checkpoint) / 1024
+    finally:
+        shutil.rmtree(checkpoint_dir, ignore_errors=True)
+    streamed = pd.concat([first, second])
+
+    uninterrupted = create_streaming_feature_engineer(config).update_frame(data)
+    resume_identical = uninterrupted.equals(streamed)
+
+    print(f"{len(data)} bars, {data['ticker'].nunique()} tickers: "
+          f"{elapsed / len(data) * 1e6:.0f} us per bar, checkpoint {checkpoint_kb:.0f} KB "
+          f"({len(resumed.tickers)} tickers), resume identical: {resume_identical}")
+
+    skip = pd.DataFrame(False, index=streamed.index, columns=streamed.columns)
+    adx_window = config['features'].get('technical_indicators', {}).get('adx_period')
+    if 'adx' in skip and adx_window:
+        lengths = data.groupby('ticker', observed=True)['ticker'].transform('size')
+        skip['adx'] = (lengths < 2 * adx_window).to_numpy()
+    if 'bb_position' in skip:
+        skip['bb_position'] = ~(streamed['bb_width'].abs() >= 1e-7).to_numpy()
+
+    failed = 0
+    print(f"{'feature':<26}{'max rel err':>14}{'NaN diff':>10}{'skipped':>9}{'':>6}")
+    for col in streamed.columns:
+        keep = ~skip[col].to_numpy()
+        ours = streamed[col].to_numpy(dtype=np.float64)[keep]
+        theirs = batch[col].to_numpy(dtype=np.float64)[keep]
+        nan_diff = int((np.isnan(ours) != np.isnan(theirs)).sum())
+        both = ~np.isnan(ours) & ~np.isnan(theirs)
+        with np.errstate(invalid='ignore'):
+            rel_err = np.abs(ours[both] - theirs[both]) / np.maximum(1.0, np.abs(theirs[both]))
+        rel_err = np.where(ours[both] == theirs[both], 0.0, rel_err)
+        max_err = float(rel_err.max()) if both.any() else 0.0
+        ok = max_err <= args.tolerance and nan_diff == 0
+        failed += not ok
+        print(f"{col:<26}{max_err:>14.2e}{nan_diff:>10}{int((~keep).sum()):>9}{'ok' if ok else 'FAIL':>6}")
+    return 1 if failed or not resume_identical else 0
+
+
+def benchmark_regime(args: argparse.Namespace) -> int:
+    """Causal volatility regimes: look-ahead, batch / streaming parity and speed
+
+    Checks that regimes of a history truncated halfway match the full run on
+    the shared bars (full-sample terciles are shown for comparison), that
+    the per-ticker and panel engines agree, and that feeding each ticker's
+    batch rolling volatility through the streaming sketch gives the batch
+    regimes exactly. Streaming features are compared too; their rolling
+    volatility differs from pandas by rounding, so a few bars on a bucket
+    edge may change regime.
+    """
+    config = copy.deepcopy(config_loader.load_config("data_config"))
+    regime_config = config['features']['regime_features']
+    regime_config.update(volatility_regime_mode='causal', volatility_regime_scope=args.scope,
+                         volatility_regime_accuracy=args.accuracy)
+    settings = regime_settings(regime_config)
+    full_config = copy.deepcopy(config)
+    full_config['features']['regime_features']['volatility_regime_mode'] = 'full_sample'
+    data = _load_market_data(args)
+    data = data.sort_values(['timestamp', 'ticker'] if args.scope == 'universe' else 'ticker',
+                            kind='stable').reset_index(drop=True)
+    print(f"{len(data)} bars, {data['ticker'].nunique()} tickers, scope {args.scope}, "
+          f"accuracy {args.accuracy}")
+
+    ok = True
+    results = {}
+    for engine in ('per_ticker', 'panel'):
+        started = time.perf_counter()
+        results[engine] = FeatureEngineer(None, indicator_backend='local', engine=engine).engineer_features(
+            data, config, features=['vol_regime'])
+        print(f"{engine + ' batch':<28}{time.perf_counter() - started:>8.2f}s")
+    same = results['per_ticker'].equals(results['panel'])
+    ok &= same
+    print(f"{'engines identical':<28}{same!s:>9}")
+    batch = results['per_ticker']
+
+    cut = data['timestamp'].sort_values().iloc[len(data) // 2]
+    truncated = data[data['timestamp'] <= cut]
+    print(f"{'mode':<14}{'changed bars in first half (of ' + str(len(truncated)) + ')':>44}")
+    for mode, mode_config in (('causal', config), ('full_sample', full_config)):
+        engineer = FeatureEngineer(None, indicator_backend='local')
+        full = engineer.engineer_features(data, mode_config, features=['vol_regime'])
+        head = engineer.engineer_features(truncated, mode_config, features=['vol_regime'])
+        merged = full.merge(head, on=['ticker', 'timestamp'], suffixes=('', '_head'))
+        changed = int((~np.isclose(merged['vol_regime'], merged['vol_regime_head'], equal_nan=True)).sum())
+        ok &= mode != 'causal' or changed == 0
+        print(f"{mode:<14}{changed:>44}")
+
+    # The sketch fed bar by bar, on the batch's own rolling volatility
+    window = regime_config['volatility_regime_window']
+    rolling_vol = data.groupby('ticker', observed=True)['close'].transform(
+        lambda close: close.pct_change().rolling(window).std()).to_numpy()
+    started = time.perf_counter()
+    if args.scope == 'universe':
+        regime = VolatilityRegime(settings['relative_accuracy'], settings['min_periods'])
+        times = data['timestamp'].to_numpy().astype(np.int64)
+        streamed = np.array([regime.update(vol, t) for vol, t in zip(rolling_vol, times)])
+        expected = causal_regime(rolling_vol, times, settings['relative_accuracy'], settings['min_periods'])
+    else:
+        streamed = np.full(len(data), np.nan)
+        expected = np.full(len(data), np.nan)
+        for positions in data.groupby('ticker', observed=True).indices.values():
+            regime = VolatilityRegime(settings['relative_accuracy'], settings['min_periods'])
+            streamed[positions] = [regime.update(vol) for vol in rolling_vol[positions]]
+            expected[positions] = causal_regime(rolling_vol[positions],
+                                                relative_accuracy=settings['relative_accuracy'],
+                                                min_periods=settings['min_periods'])
+    elapsed = time.perf_counter() - started
+    sketch_diff = int((~np.isclose(streamed, expected, equal_nan=True)).sum())
+    ok &= sketch_diff == 0
+    print(f"{'sketch vs batch mismatches':<28}{sketch_diff:>9}  ({elapsed / len(data) * 1e6:.1f} us per bar)")
+
+    features = StreamingFeatureEngineer(config).update_frame(data)
+    merged = data[['ticker', 'timestamp']].assign(streamed=features['vol_regime'].to_numpy()).merge(
+        batch[['ticker', 'timestamp', 'vol_regime']], on=['ticker', 'timestamp'])
+    feature_diff = int((~np.isclose(merged['streamed'], merged['vol_regime'], equal_nan=True)).sum())
+    print(f"{'streaming features mismatch':<28}{feature_diff:>9}  (rolling volatility rounding)")
+
+    full = FeatureEngineer(None, indicator_backend='local').engineer_features(
+        data, full_config, features=['vol_regime'])
+    both = batch['vol_regime'].notna() & full['vol_regime'].notna()
+    agreement = float((batch['vol_regime'][both] == full['vol_regime'][both]).mean()) if both.any() else 0.0
+    print(f"{'agreement with full sample':<28}{agreement:>9.1%}")
+    return 0 if ok else 1
+
+
+def benchmark_labeling(args: argparse.Namespace) -> int:
+    """Vectorized triple-barrier labeling vs the reference loop for several horizons
+
+    Every ticker is labeled with the barriers of labeling_config; outputs
+    must be identical. With --workers, the whole frame is also labeled by
+    ``apply_triple_barrier_labeling`` serially and on a process pool.
+    """
+    labeling = config_loader.load_config("labeling_config")['labeling']
+    barriers = labeling.get('barriers', {})
+    vol_window = int(labeling.get('volatility', {}).get('window', 20))
+    params = {
+        'tp_pct': barriers.get('tp_pct'),
+        'sl_pct': barriers.get('sl_pct'),
+        'tp_k': barriers.get('tp_k'),
+        'sl_k': barriers.get('sl_k'),
+        'vol_is_pct': labeling.get('volatility', {}).get('is_percentage', True),
+        'use_hl': labeling.get('use_hl', True),
+        'tie_policy': args.tie_policy or labeling.get('tie_policy', 'ambiguous'),
+        'min_ret': labeling.get('min_ret', 0.002),
+    }
+    data = _load_market_data(args)
+    tickers = [(df, rolling_volatility(df['close'], window=vol_window))
+               for _, df in data.groupby('ticker', observed=True)]
+    print(f"{len(data)} bars, {len(tickers)} tickers, tie policy {params['tie_policy']}")
+    print(f"{'N':>4}{'loop':>10}{'vectorized':>12}{'speedup':>9}  identical")
+
+    identical = True
+    for horizon in args.horizons:
+        timings, outputs = {}, {}
+        for name, label in (('loop', _event_driven_labels_loop), ('vectorized', event_driven_labels)):
+            started = time.perf_counter()
+            outputs[name] = [label(df, N=horizon, vol=vol, **params) for df, vol in tickers]
+            timings[name] = time.perf_counter() - started
+        same = all(a.equals(b) and list(a.dtypes) == list(b.dtypes)
+                   for a, b in zip(outputs['loop'], outputs['vectorized']))
+        identical &= same
+        print(f"{horizon:>4}{timings['loop']:>9.2f}s{timings['vectorized']:>11.3f}s"
+              f"{timings['loop'] / timings['vectorized']:>8.0f}x  {same}")
+
+    if args.workers > 1:
+        # Whole-frame labeling, serial vs process pool
+        config = {**config_loader.load_config("data_config"), **config_loader.load_config("labeling_config")}
+        config['labeling']['tie_policy'] = params['tie_policy']
+        timings, outputs = {}, {}
+        for workers in (1, args.workers):
+            started = time.perf_counter()
+            outputs[workers] = apply_triple_barrier_labeling(data, config, n_workers=workers)
+            timings[workers] = time.perf_counter() - started
+        same = outputs[1].equals(outputs[args.workers])
+        identical &= same
+        summary = outputs[args.workers].attrs['labeling_summary']
+        print(f"apply_triple_barrier_labeling: serial {timings[1]:.2f}s, {args.workers} workers "
+              f"{timings[args.workers]:.2f}s, identical {same}, {summary['labeled']}/{summary['tickers']} "
+              f"tickers labeled, {len(summary['failed'])} failed")
+    return 0 if identical else 1
+
+
+def benchmark_label_search(args: argparse.Namespace) -> int:
+    """Batched labeling parameter search vs labeling once per combination
+
+    Times ``search_labeling_params`` over optimization.param_grid, then
+    labels the data with ``apply_triple_barrier_labeling`` for a sample of
+    combinations (the top ranked ones plus random ones) and checks that
+    ``analyze_labeling_quality`` gives the same row. The per-combination
+    time of those runs estimates the cost of the naive search.
+    """
+    config = {**config_loader.load_config("data_config"), **config_loader.load_config("labeling_config")}
+    data = _load_market_data(args)
+    n_tickers = data['ticker'].nunique()
+
+    started = time.perf_counter()
+    table = search_labeling_params(data, config, n_workers=args.workers)
+    search_time = time.perf_counter() - started
+    print(f"{len(data)} bars, {n_tickers} tickers, {len(table)} combinations")
+    print(f"search ({args.workers} worker(s)): {search_time:.2f}s")
+    print(table.head(args.top).to_string(index=False))
+
+    rng = np.random.default_rng(args.seed)
+    top = list(range(min(args.top, len(table))))
+    rest = np.arange(len(top), len(table))
+    sample = top + sorted(rng.choice(rest, size=min(args.samples, len(rest)), replace=False).tolist())
+    identical, naive_time = True, 0.0
+    for position in sample:
+        row = table.iloc[position]
+        combo = copy.deepcopy(config)
+        combo_labeling = combo['labeling']
+        combo_labeling.setdefault('vertical_barrier', {})['days'] = int(row['N'])
+        combo_labeling.setdefault('barriers', {}).update({'tp_k': row['tp_k'], 'sl_k': row['sl_k']})
+        combo_labeling.setdefault('volatility', {})['window'] = int(row['vol_window'])
+        started = time.perf_counter()
+        quality = analyze_labeling_quality(apply_triple_barrier_labeling(data, combo), combo)
+        naive_time += time.perf_counter() - started
+        same = (
+            quality['total_labels'] == row['total_labels']
+            and quality.get('balance_score') == row['balance_score']
+            and all(quality['label_distribution'][label]['percentage'] == row[f'{name}_pct']
+                    for label, name in ((-1, 'sell'), (0, 'hold'), (1, 'buy')))
+            and all(row[f'hit_{hit_type}'] == count
+                    for hit_type, count in quality['hit_type_distribution'].items())
+        )
+        identical &= same
+    estimate = naive_time / len(sample) * len(table)
+    print(f"{len(sample)} combinations relabeled: identical {identical}")
+    print(f"naive search estimate: {estimate:.1f}s ({estimate / search_time:.0f}x the batched search)")
+    return 0 if identical else 1
+
+
+def benchmark_relabel(args: argparse.Namespace) -> int:
+    """Incremental relabeling of a label store vs relabeling the full history
+
+    The store is built from all but the last --days dates, then each date is
+    appended with ``LabelStore.update``; every --revise-th date also revises
+    the previous bar. Each day is timed against labeling every ticker's full
+    history and writing it to a fresh store; the final store must equal the
+    full recompute.
+    """
+    config = {**config_loader.load_config("data_config"), **config_loader.load_config("labeling_config")}
+    params = labeling_params(config)
+    data = _load_market_data(args).sort_values(['ticker', 'timestamp'], kind='stable').reset_index(drop=True)
+    dates = np.sort(data['timestamp'].unique())
+    store_dir = tempfile.mkdtemp(prefix="label_store_")
+    full_dir = tempfile.mkdtemp(prefix="label_store_full_")
+    rng = np.random.default_rng(args.seed)
+
+    try:
+        store = LabelStore(store_dir)
+        started = time.perf_counter()
+        store.update(data[data['timestamp'] < dates[-args.days]], config)
+        print(f"{len(data)} bars, {data['ticker'].nunique()} tickers, initial store in "
+              f"{time.perf_counter() - started:.2f}s")
+
+        timings = {'incremental': 0.0, 'full': 0.0}
+        for day, date in enumerate(dates[-args.days:]):
+            new_bars = data[data['timestamp'] == date]
+            if args.revise and day % args.revise == 0:
+                previous = data[data['timestamp'] == dates[-args.days + day - 1]]
+                close = previous['close'] * (1 + rng.normal(0, 0.01, len(previous)))
+                data.loc[previous.index, 'close'] = close
+                data.loc[previous.index, 'high'] = np.maximum(previous['high'], close)
+                data.loc[previous.index, 'low'] = np.minimum(previous['low'], close)
+                new_bars = pd.concat([data.loc[previous.index], new_bars])
+
+            started = time.perf_counter()
+            store.update(new_bars, config)
+            timings['incremental'] += time.perf_counter() - started
+
+            # Full recompute: relabel every history and rewrite a fresh store
+            shutil.rmtree(full_dir, ignore_errors=True)
+            started = time.perf_counter()
+            history = data[data['timestamp'] <= date]
+            full = [label_bars(bars.reset_index(drop=True), params)
+                    for _, bars in history.groupby('ticker', observed=True)]
+            LabelStore(full_dir).append(apply_schema(pd.concat(full, ignore_index=True)))
+            timings['full'] += time.perf_counter() - started
+
+        stored = store.load().sort_values(['ticker', 'timestamp'], kind='stable').reset_index(drop=True)
+        expected = apply_schema(pd.concat(full, ignore_index=True))
+        identical = len(stored) == len(expected) and all(
+            np.array_equal(stored[col].astype(object).to_numpy(), expected[col].astype(object).to_numpy())
+            if col in ('ticker', 'hit_type')
+            else stored[col].astype(expected[col].dtype).equals(expected[col])
+            for col in list(data.columns) + list(LABEL_COLUMNS)
+        )
+        print(f"{args.days} daily updates: incremental {timings['incremental']:.2f}s, full rebuild "
+              f"{timings['full']:.2f}s ({timings['full'] / timings['incremental']:.1f}x), identical {identical}")
+        return 0 if identical else 1
+    finally:
+        shutil.rmtree(store_dir, ignore_errors=True)
+        shutil.rmtree(full_dir, ignore_errors=True)
+
+
+def benchmark_jit(args: argparse.Namespace) -> int:
+    """Parity and speed of the labeling and trade simulation kernels
+
+    Runs each kernel compiled (when Numba is installed), as plain Python and
+    as NumPy, and checks that labels and trades are identical to the
+    reference loops; the trade simulation against the row-by-row loop needs
+    the backtest engine's dependencies. The first compiled call shows the
+    compile time, or the on-disk cache load time on later runs.
+    """
+    labeling_config = config_loader.load_config("labeling_config")['labeling']
+    barriers = labeling_config.get('barriers', {})
+    vol_window = int(labeling_config.get('volatility', {}).get('window', 20))
+    horizon = int(labeling_config.get('vertical_barrier', {}).get('days', 10))
+    data = _load_market_data(args)
+    groups = [df for _, df in data.groupby('ticker', observed=True)]
+    print(f"{len(data)} bars, {len(groups)} tickers, numba {'available' if NUMBA_AVAILABLE else 'not installed'}")
+
+    identical = True
+    first_call = time.perf_counter()
+    close = groups[0]['close'].to_numpy(dtype=np.float64)
+    labeling.first_barrier_touch(close, close, close[:-1], close[:-1], np.ones(len(close) - 1, dtype=bool), 1)
+    print(f"first kernel call (compile / cache load): {time.perf_counter() - first_call:.3f}s")
+
+    # First-touch kernels on the configured barriers
+    kernels = {'numpy': labeling._first_touch_numpy, 'python': python_function(labeling._first_touch_jit)}
+    if NUMBA_AVAILABLE:
+        kernels['numba'] = labeling._first_touch_jit
+    inputs = []
+    for df in groups:
+        close = df['close'].to_numpy(dtype=np.float64)
+        vol = rolling_volatility(df['close'], window=vol_window).to_numpy()[:-1]
+        ub = np.where(np.isfinite(vol), close[:-1] * (1 + barriers.get('tp_k', 2.0) * vol), np.inf)
+        lb = np.where(np.isfinite(vol), close[:-1] * (1 - barriers.get('sl_k', 1.0) * vol), -np.inf)
+        inputs.append((df['high'].to_numpy(dtype=np.float64), df['low'].to_numpy(dtype=np.float64),
+                       ub, lb, ~((ub == np.inf) & (lb == -np.inf)), horizon))
+    outputs = {}
+    print(f"{'first touch':<22}{'seconds':>9}  identical")
+    for name, kernel in kernels.items():
+        started = time.perf_counter()
+        outputs[name] = [kernel(*arrays) for arrays in inputs]
+        elapsed = time.perf_counter() - started
+        same = all(all(np.array_equal(a, b) for a, b in zip(ours, theirs))
+                   for ours, theirs in zip(outputs[name], outputs['numpy']))
+        identical &= same
+        print(f"{name:<22}{elapsed:>9.3f}  {same}")
+
+    params = {
+        'N': horizon, 'tp_pct': barriers.get('tp_pct'), 'sl_pct': barriers.get('sl_pct'),
+        'tp_k': barriers.get('tp_k'), 'sl_k': barriers.get('sl_k'),
+        'tie_policy': labeling_config.get('tie_policy', 'ambiguous'),
+        'min_ret': labeling_config.get('min_ret', 0.002),
+    }
+    same = all(event_driven_labels(df, vol=vol, **params).equals(_event_driven_labels_loop(df, vol=vol, **params))
+               for df, vol in ((df, rolling_volatility(df['close'], window=vol_window)) for df in groups))
+    identical &= same
+    print(f"{'labels vs loop':<22}{'':>9}  {same}")
+
+    # Trade kernels on random signals, checked against the Python loop
+    rng = np.random.default_rng(args.seed)
+    signals = pd.DataFrame({
+        'signal': rng.choice([-1, 0, 1], size=len(data), p=[0.2, 0.5, 0.3]),
+        'confidence': rng.random(len(data)),
+    }, index=data.index)
+    kernels = {'python': python_function(_long_only_trades_jit), 'numpy': _long_only_trades_numpy}
+    if NUMBA_AVAILABLE:
+        kernels['numba'] = _long_only_trades_jit
+    ticker_signals = [signals.loc[df.index, 'signal'].to_numpy(dtype=np.float64) for df in groups]
+    outputs = {}
+    print(f"{'long-only trades':<22}{'seconds':>9}  identical")
+    for name, kernel in kernels.items():
+        started = time.perf_counter()
+        outputs[name] = [kernel(signal, args.holding_period) for signal in ticker_signals]
+        elapsed = time.perf_counter() - started
+        same = all(all(np.array_equal(a, b) for a, b in zip(ours, theirs))
+                   for ours, theirs in zip(outputs[name], outputs['python']))
+        identical &= same
+        print(f"{name:<22}{elapsed:>9.3f}  {same}")
+
+    try:
+        from src.backtesting.backtest_engine import BacktestEngine
+    except ImportError as e:
+        print(f"trade simulation vs row loop skipped: {e}")
+        return 0 if identical else 1
+
+    timings, trades = {}, {}
+    for name, simulate in (('kernel', BacktestEngine._simulate_ticker_trades),
+                           ('loop', BacktestEngine._simulate_ticker_trades_loop)):
+        started = time.perf_counter()
+        trades[name] = [simulate(df, signals.loc[df.index], str(df['ticker'].iloc[0]), args.holding_period, 0.001)
+                        for df in groups]
+        timings[name] = time.perf_counter() - started
+    same = trades['kernel'] == trades['loop']
+    identical &= same
+    n_trades = sum(len(ticker_trades) for ticker_trades in trades['kernel'])
+    print(f"trades ({n_trades}): kernel {timings['kernel']:.3f}s, loop {timings['loop']:.2f}s, identical {same}")
+    return 0 if identical else 1
+
+
+def main():
+    """Main function for benchmarks"""
+    parser = argparse.ArgumentParser(
+        description="Pipeline Benchmarks",
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog=(
+            """
+Examples:
+  # Fetch modes against the replay backend with 200ms simulated latency
+  python benchmark.py fetch --latency-ms 200
+
+  # Batch vs streaming pipeline on 200 synthetic tickers
+  python benchmark.py pipeline --source synthetic --tickers 200
+
+  # Same at growing universe sizes: streaming peak RSS stays flat
+  python benchmark.py pipeline --source synthetic --tickers 25 50 100 200
+
+  # NumPy indicator kernels vs FiinIndicator (needs FiinQuantX credentials)
+  python benchmark.py indicators --reference fiin
+
+  # Rolling min / max / rank kernels vs pandas for windows 20-250
+  python benchmark.py rolling --source synthetic --tickers 200
+
+  # Per-ticker vs panel feature engine on 500 synthetic tickers
+  python benchmark.py features --source synthetic --tickers 500
+
+  # Same, plus both engines on 4 worker processes
+  python benchmark.py features --source synthetic --tickers 500 --workers 4
+
+  # Slowest ops of the feature plan
+  python benchmark.py plan --source synthetic --tickers 200 --top 15
+
+  # Streaming (bar-by-bar) features vs batch, with a checkpoint round trip
+  python benchmark.py streaming
+
+  # Feature store: cold, warm and one-indicator-changed runs
+  python benchmark.py featurestore --source synthetic --tickers 200
+
+  # Causal volatility regimes with thresholds pooled across tickers
+  python benchmark.py regime --scope universe
+
+  # Vectorized triple-barrier labeling vs the reference loop at N=10/20/60
+  python benchmark.py labeling --source synthetic --tickers 100
+
+  # Same, plus process-pool labeling of the whole frame on 4 workers
+  python benchmark.py labeling --source synthetic --tickers 100 --workers 4
+
+  # Compiled (Numba) vs NumPy / Python kernels: identical labels and trades
+  python benchmark.py jit
+
+  # Labeling parameter grid in one batched pass vs labeling per combination
+  python benchmark.py labelsearch --workers 4
+
+  # 20 daily appends to a label store, relabeling only the affected tails
+  python benchmark.py relabel --days 20
+"""
+        ),
+    )
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    fetch_parser = subparsers.add_parser("fetch", help="Fetch concurrency and caching")
+    fetch_parser.add_argument(
+        "--source",
+        default="data/raw/trading_data.csv",
+        help="Replay source CSV or 'synthetic' (default: data/raw/trading_data.csv)",
+    )
+    fetch_parser.add_argument(
+        "--latency-ms", type=float, default=200, help="Simulated latency per request (default: 200)"
+    )
+    fetch_parser.add_argument(
+        "--workers", type=int, default=4, help="Scheduler thread pool size (default: 4)"
+    )
+    fetch_parser.add_argument(
+        "--batch-size", type=int, default=4, help="Tickers per scheduler chunk (default: 4)"
+    )
+    fetch_parser.set_defaults(func=benchmark_fetch)
+
+    pipeline_parser = subparsers.add_parser("pipeline", help="Batch vs streaming pipeline")
+    pipeline_parser.add_argument(
+        "--source",
+        default="data/raw/trading_data.csv",
+        help="Replay source CSV or 'synthetic' (default: data/raw/trading_data.csv)",
+    )
+    pipeline_parser.add_argument(
+        "--tickers", type=int, nargs="+", default=None,
+        help="Numbers of synthetic tickers to run, override custom_tickers (default: config list)",
+    )
+    pipeline_parser.add_argument(
+        "--batch-size", type=int, default=1, help="Tickers per streaming batch (default: 1)"
+    )
+    pipeline_parser.add_argument(
+        "--save-intermediate", action="store_true", help="Also write raw/labeled/featured CSVs"
+    )
+    pipeline_parser.set_defaults(func=benchmark_pipeline)
+
+    indicators_parser = subparsers.add_parser("indicators", help="Indicator kernel parity and speed")
+    indicators_parser.add_argument(
+        "--source", default="data/raw/trading_data.csv",
+        help="Trading data CSV (default: data/raw/trading_data.csv)",
+    )
+    indicators_parser.add_argument(
+        "--reference", choices=["pandas", "fiin"], default="pandas",
+        help="Reference implementation: pandas (offline) or fiin (FiinIndicator) (default: pandas)",
+    )
+    indicators_parser.add_argument(
+        "--tolerance", type=float, default=1e-9,
+        help="Maximum relative error, relative to max(1, |reference|) (default: 1e-9)",
+    )
+    indicators_parser.set_defaults(func=benchmark_indicators)
+
+    rolling_parser = subparsers.add_parser("rolling", help="Rolling extreme / rank kernels vs pandas")
+    rolling_parser.add_argument(
+        "--source", default="data/raw/trading_data.csv",
+        help="Trading data CSV or 'synthetic' (default: data/raw/trading_data.csv)",
+    )
+    rolling_parser.add_argument(
+        "--tickers", type=int, default=200, help="Number of synthetic tickers (default: 200)"
+    )
+    rolling_parser.add_argument(
+        "--start-date", default="2015-01-01", help="Synthetic start date (default: 2015-01-01)"
+    )
+    rolling_parser.add_argument(
+        "--end-date", default="2024-12-31", help="Synthetic end date (default: 2024-12-31)"
+    )
+    rolling_parser.add_argument(
+        "--windows", type=int, nargs="+", default=[20, 50, 120, 250],
+        help="Window lengths (default: 20 50 120 250)",
+    )
+    rolling_parser.set_defaults(func=benchmark_rolling)
+
+    features_parser = subparsers.add_parser("features", help="Feature engine time and memory")
+    features_parser.add_argument(
+        "--source", default="data/raw/trading_data.csv",
+        help="Trading data CSV or 'synthetic' (default: data/raw/trading_data.csv)",
+    )
+    features_parser.add_argument(
+        "--tickers", type=int, default=200, help="Number of synthetic tickers (default: 200)"
+    )
+    features_parser.add_argument(
+        "--start-date", default="2015-01-01", help="Synthetic start date (default: 2015-01-01)"
+    )
+    features_parser.add_argument(
+        "--end-date", default="2024-12-31", help="Synthetic end date (default: 2024-12-31)"
+    )
+    features_parser.add_argument(
+        "--repeat", type=int, default=3, help="Timed runs per engine, best time reported (default: 3)"
+    )
+    features_parser.add_argument(
+        "--workers", type=int, default=1,
+        help="Also run both engines on this many worker processes (default: 1, serial only)",
+    )
+    features_parser.set_defaults(func=benchmark_features)
+
+    plan_parser = subparsers.add_parser("plan", help="Per-op timings of the feature plan")
+    plan_parser.add_argument(
+        "--source", default="data/raw/trading_data.csv",
+        help="Trading data CSV or 'synthetic' (default: data/raw/trading_data.csv)",
+    )
+    plan_parser.add_argument(
+        "--tickers", type=int, default=200, help="Number of synthetic tickers (default: 200)"
+    )
+    plan_parser.add_argument(
+        "--start-date", default="2015-01-01", help="Synthetic start date (default: 2015-01-01)"
+    )
+    plan_parser.add_argument(
+        "--end-date", default="2024-12-31", help="Synthetic end date (default: 2024-12-31)"
+    )
+    plan_parser.add_argument(
+        "--top", type=int, default=0, help="Only show the slowest N ops (default: all)"
+    )
+    plan_parser.set_defaults(func=benchmark_plan)
+
+    streaming_parser = subparsers.add_parser("streaming", help="Streaming feature parity and speed")
+    streaming_parser.add_argument(
+        "--source", default="data/raw/trading_data.csv",
+        help="Trading data CSV or 'synthetic' (default: data/raw/trading_data.csv)",
+    )
+    streaming_parser.add_argument(
+        "--tickers", type=int, default=20, help="Number of synthetic tickers (default: 20)"
+    )
+    streaming_parser.add_argument(
+        "--start-date", default="2015-01-01", help="Synthetic start date (default: 2015-01-01)"
+    )
+    streaming_parser.add_argument(
+        "--end-date", default="2024-12-31", help="Synthetic end date (default: 2024-12-31)"
+    )
+    streaming_parser.add_argument(
+        "--tolerance", type=float, default=1e-5,
+        help="Maximum relative error, relative to max(1, |batch|); batch features are float32 "
+             "(default: 1e-5)",
+    )
+    streaming_parser.set_defaults(func=benchmark_streaming)
+
+    store_parser = subparsers.add_parser("featurestore", help="Feature store hit rates and speed")
+    store_parser.add_argument(
+        "--source", default="data/raw/trading_data.csv",
+        help="Trading data CSV or 'synthetic' (default: data/raw/trading_data.csv)",
+    )
+    store_parser.add_argument(
+        "--tickers", type=int, default=200, help="Number of synthetic tickers (default: 200)"
+    )
+    store_parser.add_argument(
+        "--start-date", default="2015-01-01", help="Synthetic start date (default: 2015-01-01)"
+    )
+    store_parser.add_argument(
+        "--end-date", default="2024-12-31", help="Synthetic end date (default: 2024-12-31)"
+    )
+    store_parser.add_argument(
+        "--engine", choices=["per_ticker", "panel"], default="panel",
+        help="Feature engine used for missing blocks (default: panel)",
+    )
+    store_parser.set_defaults(func=benchmark_feature_store)
+
+    regime_parser = subparsers.add_parser("regime", help="Causal volatility regime parity and look-ahead")
+    regime_parser.add_argument(
+        "--source", default="data/raw/trading_data.csv",
+        help="Trading data CSV or 'synthetic' (default: data/raw/trading_data.csv)",
+    )
+    regime_parser.add_argument(
+        "--tickers", type=int, default=20, help="Number of synthetic tickers (default: 20)"
+    )
+    regime_parser.add_argument(
+        "--start-date", default="2015-01-01", help="Synthetic start date (default: 2015-01-01)"
+    )
+    regime_parser.add_argument(
+        "--end-date", default="2024-12-31", help="Synthetic end date (default: 2024-12-31)"
+    )
+    regime_parser.add_argument(
+        "--scope", choices=["ticker", "universe"], default="ticker",
+        help="Regime thresholds per ticker or pooled over all tickers (default: ticker)",
+    )
+    regime_parser.add_argument(
+        "--accuracy", type=float, default=0.01, help="Relative accuracy of the sketch (default: 0.01)"
+    )
+    regime_parser.set_defaults(func=benchmark_regime)
+
+    labeling_parser = subparsers.add_parser("labeling", help="Triple-barrier labeling parity and speed")
+    labeling_parser.add_argument(
+        "--source", default="data/raw/trading_data.csv",
+        help="Trading data CSV or 'synthetic' (default: data/raw/trading_data.csv)",
+    )
+    labeling_parser.add_argument(
+        "--tickers", type=int, default=20, help="Number of synthetic tickers (default: 20)"
+    )
+    labeling_parser.add_argument(
+        "--start-date", default="2015-01-01", help="Synthetic start date (default: 2015-01-01)"
+    )
+    labeling_parser.add_argument(
+        "--end-date", default="2024-12-31", help="Synthetic end date (default: 2024-12-31)"
+    )
+    labeling_parser.add_argument(
+        "--horizons", type=int, nargs="+", default=[10, 20, 60],
+        help="Vertical barriers N to run (default: 10 20 60)",
+    )
+    labeling_parser.add_argument(
+        "--tie-policy", choices=["ambiguous", "tp", "sl", "closest"], default=None,
+        help="Override the configured tie policy",
+    )
+    labeling_parser.add_argument(
+        "--workers", type=int, default=1,
+        help="Also compare serial and process-pool labeling of the whole frame (default: 1)",
+    )
+    labeling_parser.set_defaults(func=benchmark_labeling)
+
+    jit_parser = subparsers.add_parser("jit", help="Labeling / trade simulation kernel parity")
+    jit_parser.add_argument(
+        "--source", default="data/raw/trading_data.csv",
+        help="Trading data CSV or 'synthetic' (default: data/raw/trading_data.csv)",
+    )
+    jit_parser.add_argument(
+        "--tickers", type=int, default=20, help="Number of synthetic tickers (default: 20)"
+    )
+    jit_parser.add_argument(
+        "--start-date", default="2015-01-01", help="Synthetic start date (default: 2015-01-01)"
+    )
+    jit_parser.add_argument(
+        "--end-date", default="2024-12-31", help="Synthetic end date (default: 2024-12-31)"
+    )
+    jit_parser.add_argument(
+        "--holding-period", type=int, default=10, help="Trade holding period in bars (default: 10)"
+    )
+    jit_parser.add_argument(
+        "--seed", type=int, default=0, help="Seed of the random trade signals (default: 0)"
+    )
+    jit_parser.set_defaults(func=benchmark_jit)
+
+    search_parser = subparsers.add_parser("labelsearch", help="Batched labeling parameter search")
+    search_parser.add_argument(
+        "--source", default="data/raw/trading_data.csv",
+        help="Trading data CSV or 'synthetic' (default: data/raw/trading_data.csv)",
+    )
+    search_parser.add_argument(
+        "--tickers", type=int, default=20, help="Number of synthetic tickers (default: 20)"
+    )
+    search_parser.add_argument(
+        "--start-date", default="2015-01-01", help="Synthetic start date (default: 2015-01-01)"
+    )
+    search_parser.add_argument(
+        "--end-date", default="2024-12-31", help="Synthetic end date (default: 2024-12-31)"
+    )
+    search_parser.add_argument(
+        "--workers", type=int, default=1, help="Search worker processes (default: 1)"
+    )
+    search_parser.add_argument(
+        "--top", type=int, default=5, help="Top ranked combinations to show and check (default: 5)"
+    )
+    search_parser.add_argument(
+        "--samples", type=int, default=5, help="Random combinations to check (default: 5)"
+    )
+    search_parser.add_argument(
+        "--seed", type=int, default=0, help="Seed of the sampled combinations (default: 0)"
+    )
+    search_parser.set_defaults(func=benchmark_label_search)
+
+    relabel_parser = subparsers.add_parser("relabel", help="Incremental label store updates")
+    relabel_parser.add_argument(
+        "--source", default="data/raw/trading_data.csv",
+        help="Trading data CSV or 'synthetic' (default: data/raw/trading_data.csv)",
+    )
+    relabel_parser.add_argument(
+        "--tickers", type=int, default=20, help="Number of synthetic tickers (default: 20)"
+    )
+    relabel_parser.add_argument(
+        "--start-date", default="2015-01-01", help="Synthetic start date (default: 2015-01-01)"
+    )
+    relabel_parser.add_argument(
+        "--end-date", default="2024-12-31", help="Synthetic end date (default: 2024-12-31)"
+    )
+    relabel_parser.add_argument(
+        "--days", type=int, default=20, help="Dates appended one at a time (default: 20)"
+    )
+    relabel_parser.add_argument(
+        "--revise", type=int, default=5,
+        help="Also revise the previous bar every N dates, 0 to never (default: 5)",
+    )
+    relabel_parser.add_argument(
+        "--seed", type=int, default=0, help="Seed of the bar revisions (default: 0)"
+    )
+    relabel_parser.set_defaults(func=benchmark_relabel)
+
+    args = parser.parse_args()
+
+    logger.remove()
+    logger.add(lambda msg: print(msg, end=""), level="WARNING")
+
+    return args.func(args) or 0
+
+
+if __name__ == "__main__":
+    exit(main())
@@ -11,7 +11,7 @@ from pathlib import Path
 from loguru import logger
 from dotenv import load_dotenv
 
-from src.pipeline.data_pipeline import run_data_pipeline
+from src.pipeline.data_pipeline import run_data_pipeline, run_streaming_data_pipeline
 from src.pipeline.training_pipeline import run_training_pipeline
 from src.utils.config_loader import config_loader
 
@@ -80,9 +80,14 @@ def run_complete_pipeline(
             logger.info("📊 Phase 1: Data Pipeline")
             logger.info("-" * 30)
 
-            final_data = run_data_pipeline(username, password)
+            # data.pipeline.mode: "streaming" keeps memory bounded by a ticker batch
+            data_config = config_loader.load_config("data_config")
+            if data_config.get('data', {}).get('pipeline', {}).get('mode', 'batch') == 'streaming':
+                n_samples = run_streaming_data_pipeline(username, password)
+            else:
+                n_samples = len(run_data_pipeline(username, password))
 
-            logger.info(f"✅ Data pipeline completed with {len(final_data)} samples")
+            logger.info(f"✅ Data pipeline completed with {n_samples} samples")
 
             if data_only:
                 logger.info("Data-only mode: stopping after data pipeline")
@@ -21,10 +21,10 @@ def _unique_filename(prefix: str = "custom_test_data") -> str:
 
 
 def prepare_backtest_features(
-    username, password, tickers, start_date, end_date, config
+    username, password, tickers, start_date, end_date, config, features=None
 ):
     # 1. Fetch raw data
-    fetcher = create_data_fetcher(username, password)
+    fetcher = create_data_fetcher(username, password, config)
     data = fetcher.fetch_trading_data(
         tickers=tickers,
         fields=['open', 'high', 'low', 'close', 'volume'],
@@ -35,9 +35,9 @@ def prepare_backtest_features(
     )
     data = fetcher.validate_data(data)
     # 2. Feature engineering
-    feature_engineer = create_feature_engineer(fetcher.client)
-    features = feature_engineer.engineer_features(data, config)
-    return features
+    feature_engineer = create_feature_engineer(fetcher.client, config)
+    # Only the indicators behind the requested columns are computed
+    return feature_engineer.engineer_features(data, config, features=features)
 
 
 if __name__ == "__main__":
@@ -53,20 +53,24 @@ if __name__ == "__main__":
     config.update(config_loader.load_config("data_config"))
     config.update(config_loader.load_config("labeling_config"))
 
-    # Feature engineering cho dữ liệu mới
-    features = prepare_backtest_features(
-        username, password, tickers, start_date, end_date, config
-    )
-
     # ======= Đảm bảo đủ feature giống file test gốc =======
     ref_path = "data/final/test_data.csv"
+    feature_cols = None
     if os.path.exists(ref_path):
-        test_ref = pd.read_csv(ref_path)
+        # Chỉ đọc header: cần danh sách cột, không cần dữ liệu
+        test_ref = pd.read_csv(ref_path, nrows=0)
         # Loại bỏ các cột meta không phải feature
         ignore_cols = ['label', 'hit_time', 'hit_type', 'ub', 'lb', 'vbar_end']
         feature_cols = [
             col for col in test_ref.columns if col not in ignore_cols
         ]
+
+    # Feature engineering cho dữ liệu mới (chỉ các feature có trong file tham chiếu)
+    features = prepare_backtest_features(
+        username, password, tickers, start_date, end_date, config, feature_cols
+    )
+
+    if feature_cols is not None:
         # Bổ sung cột còn thiếu vào features
         for col in feature_cols:
             if col not in features.columns:
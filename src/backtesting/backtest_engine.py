@@ -4,12 +4,16 @@ import os
 import pandas as pd
 import numpy as np
 import joblib
-from typing import List, Tuple, Optional
+from typing import Any, Dict, List, Tuple, Optional
 from dataclasses import dataclass
 from loguru import logger
 
+from ..data.benchmark_store import BenchmarkStore, create_benchmark_store
 from ..data.data_fetcher import FiinDataFetcher
-from FiinQuantX import FiinSession
+from ..data.feature_engineering import model_feature_names
+from ..data.session import get_session_manager
+from ..utils.config_loader import config_loader
+from .trades import long_only_trades
 from dotenv import load_dotenv
 
 
@@ -59,25 +63,32 @@ class BacktestResults:
     benchmark_df: Optional[pd.DataFrame] = None
 
 
-def get_benchmark_returns_from_fiin(start_date: str, end_date: str) -> pd.DataFrame:
-    """Fetch VNINDEX daily returns from FiinQuantX between specified dates."""
+def fetch_index_from_fiin(index: str, start_date: str, end_date: str) -> pd.DataFrame:
+    """Fetch daily closes of an index (VNINDEX, VN30, ...) from FiinQuantX."""
     load_dotenv()
 
-    client = FiinSession(
+    client = get_session_manager().get_client(
         username=os.getenv("FIIN_USERNAME"),
         password=os.getenv("FIIN_PASSWORD"),
-    ).login()
+    )
 
     event = client.Fetch_Trading_Data(
         realtime=False,
-        tickers=["VNINDEX"],
+        tickers=[index],
         fields=["close"],
         adjusted=True,
         by="1d",
         from_date=start_date,
         to_date=end_date
     )
-    benchmark_df = event.get_data()
+    data = event.get_data()
+    data["timestamp"] = pd.to_datetime(data["timestamp"])
+    return data
+
+
+def get_benchmark_returns_from_fiin(start_date: str, end_date: str) -> pd.DataFrame:
+    """Fetch VNINDEX daily returns from FiinQuantX between specified dates."""
+    benchmark_df = fetch_index_from_fiin("VNINDEX", start_date, end_date)
     benchmark_df.set_index("timestamp", inplace=True)
     benchmark_df.sort_index(inplace=True)
 
@@ -88,15 +99,28 @@ def get_benchmark_returns_from_fiin(start_date: str, end_date: str) -> pd.DataFr
 class BacktestEngine:
     """Backtesting engine for model evaluation"""
 
-    def __init__(self, model_path: str, scaler_path: str):
+    def __init__(
+        self,
+        model_path: str,
+        scaler_path: str,
+        benchmark_store: Optional[BenchmarkStore] = None,
+        benchmark_index: str = "VNINDEX"
+    ):
         """Initialize backtest engine
 
         Args:
             model_path: Path to trained model
             scaler_path: Path to feature scaler
+            benchmark_store: Local benchmark index store, None to fetch the
+                benchmark from FiinQuantX on every run
+            benchmark_index: Index the strategy is compared against
         """
         self.model = joblib.load(model_path)
         self.scaler = joblib.load(scaler_path)
+        self.benchmark_store = benchmark_store
+        self.benchmark_index = benchmark_index
+        # Columns the scaler / model were fitted on, None for unnamed inputs
+        self.feature_names = model_feature_names(self.scaler) or model_feature_names(self.model)
         logger.info(f"Loaded model from {model_path}")
         logger.info(f"Loaded scaler from {scaler_path}")
 
@@ -109,13 +133,16 @@ class BacktestEngine:
         Returns:
             Scaled features DataFrame
         """
-        # Select feature columns (exclude non-feature columns)
-        exclude_cols = [
-            'ticker', 'timestamp', 'label', 'hit_time', 'hit_type',
-            'ub', 'lb', 'vbar_end'
-        ]
-
-        feature_cols = [col for col in data.columns if col not in exclude_cols]
+        if self.feature_names:
+            # Exactly the columns the scaler and model were fitted on
+            feature_cols = self.feature_names
+        else:
+            # Select feature columns (exclude non-feature columns)
+            exclude_cols = [
+                'ticker', 'timestamp', 'label', 'hit_time', 'hit_type',
+                'ub', 'lb', 'vbar_end'
+            ]
+            feature_cols = [col for col in data.columns if col not in exclude_cols]
         X = data[feature_cols].copy()
 
         # Handle missing values
@@ -219,15 +246,60 @@ class BacktestEngine:
         )
         return trades
 
+    @staticmethod
     def _simulate_ticker_trades(
-        self,
         data: pd.DataFrame,
         signals: pd.DataFrame,
         ticker: str,
         holding_period: int,
         transaction_cost: float,
     ) -> List[Trade]:
-        """Simulate trades for single ticker (long-only for VN stock market)"""
+        """Simulate trades for single ticker (long-only for VN stock market)
+
+        Buy on signal 1 when flat; sell on signal -1 or after holding_period
+        bars, and at the last bar if still holding. Entry and exit bars come
+        from ``long_only_trades``; prices and returns are computed on the
+        whole trade arrays at once.
+        """
+        signal = signals.loc[data.index, 'signal'].to_numpy(dtype=np.float64)
+        entries, exits = long_only_trades(signal, holding_period)
+        if not len(entries):
+            return []
+
+        close = data['close'].to_numpy()
+        # Fees are charged on both legs
+        entry_prices = close[entries] * (1 + transaction_cost)
+        exit_prices = close[exits] * (1 - transaction_cost)
+        returns = (exit_prices - entry_prices) / entry_prices
+        confidence = signals.loc[data.index, 'confidence'].to_numpy()[entries]
+        timestamps = data['timestamp']
+
+        return [
+            Trade(
+                entry_date=entry_date,
+                exit_date=exit_date,
+                ticker=ticker,
+                signal=1,  # Entry luôn là 1
+                entry_price=entry_price,
+                exit_price=exit_price,
+                return_pct=return_pct,
+                holding_days=holding_days,
+                confidence=entry_confidence,
+            )
+            for entry_date, exit_date, entry_price, exit_price, return_pct, holding_days, entry_confidence
+            in zip(timestamps.iloc[entries].tolist(), timestamps.iloc[exits].tolist(), entry_prices.tolist(),
+                   exit_prices.tolist(), returns.tolist(), (exits - entries).tolist(), confidence.tolist())
+        ]
+
+    @staticmethod
+    def _simulate_ticker_trades_loop(
+        data: pd.DataFrame,
+        signals: pd.DataFrame,
+        ticker: str,
+        holding_period: int,
+        transaction_cost: float,
+    ) -> List[Trade]:
+        """Reference row-by-row simulation, kept to check ``_simulate_ticker_trades`` against"""
         trades = []
         position = 0  # 0: no position, 1: holding
         entry_date = None
@@ -390,9 +462,15 @@ class BacktestEngine:
             else float('inf')
         )
 
-        # Benchmark comparison via Fiin
+        # Benchmark comparison, served from the local store unless disabled
+        # (backtest.benchmark_store.enabled)
         benchmark_df: Optional[pd.DataFrame] = None
-        benchmark_df = get_benchmark_returns_from_fiin(start_date, end_date)
+        if self.benchmark_store is not None:
+            benchmark_df = self.benchmark_store.returns(
+                self.benchmark_index, start_date, end_date, fetch_fn=fetch_index_from_fiin
+            )
+        else:
+            benchmark_df = get_benchmark_returns_from_fiin(start_date, end_date)
 
         print("Benchmark fetch period:", start_date, "to", end_date)
         print("benchmark_df.shape:", benchmark_df.shape)
@@ -579,14 +657,33 @@ class BacktestEngine:
         return results
 
 
-def create_backtest_engine(model_path: str, scaler_path: str) -> BacktestEngine:
+def create_backtest_engine(
+    model_path: str,
+    scaler_path: str,
+    benchmark_store: Optional[BenchmarkStore] = None,
+    benchmark_index: str = "VNINDEX",
+    config: Optional[Dict[str, Any]] = None
+) -> BacktestEngine:
     """Create BacktestEngine instance
 
     Args:
         model_path: Path to trained model
         scaler_path: Path to feature scaler
+        benchmark_store: Benchmark index store, None to create it from
+            backtest.benchmark_store (no store, i.e. fetching the benchmark
+            on every run, when disabled)
+        benchmark_index: Index the strategy is compared against
+        config: Configuration with the backtest section, None for model_config
 
     Returns:
         BacktestEngine instance
     """
-    return BacktestEngine(model_path, scaler_path)
+    if benchmark_store is None:
+        if config is None:
+            config = config_loader.load_config("model_config")
+        benchmark_store = create_benchmark_store(config)
+    return BacktestEngine(
+        model_path, scaler_path,
+        benchmark_store=benchmark_store,
+        benchmark_index=benchmark_index
+    )
@@ -9,6 +9,7 @@ import json
 from loguru import logger
 
 from .backtest_engine import create_backtest_engine, BacktestResults
+from ..data.schema import read_market_csv
 
 
 class BacktestRunner:
@@ -48,10 +49,8 @@ class BacktestRunner:
             BacktestResults object
         """
         logger.info(f"Loading test data from {test_data_path}")
-        test_data = pd.read_csv(test_data_path)
-
-        # Ensure timestamp is datetime
-        test_data['timestamp'] = pd.to_datetime(test_data['timestamp'])
+        # Timestamps are parsed once and dtypes compacted on load
+        test_data = read_market_csv(test_data_path)
 
         # Run backtest
         self.results = self.engine.run_backtest(
@@ -0,0 +1,76 @@
+"""Trade entry / exit kernels of the long-only backtest"""
+
+import numpy as np
+
+from ..utils.jit import NUMBA_AVAILABLE, jit
+
+
+def _long_only_trades_numpy(signal, holding_period):
+    """Entry and exit bar of every long-only trade
+
+    Buy on signal 1 when flat; sell on signal -1 or after holding_period
+    bars. The exit of a position opened at each buy bar is known without
+    simulating (first sell after it, or the holding limit), and so is the
+    buy that follows that exit; trades are the chain of those jumps from the
+    first buy, followed with pointer doubling.
+
+    Args:
+        signal: Signal of each bar (1 buy, -1 sell, anything else hold)
+        holding_period: Bars after which a position is closed
+
+    Returns:
+        Entry and exit bar positions of the trades, in order; a position
+        still open at the end exits on the last bar
+    """
+    n = len(signal)
+    buys = np.flatnonzero(signal == 1)
+    if not len(buys):
+        return np.empty(0, dtype=np.int64), np.empty(0, dtype=np.int64)
+    sells = np.flatnonzero(signal == -1)
+
+    # Exit of a position opened at each buy, capped at the last bar
+    following_sell = np.searchsorted(sells, buys, side='right')
+    next_sell = np.append(sells, n)[following_sell]
+    exits = np.minimum(np.minimum(next_sell, buys + max(int(holding_period), 1)), n - 1)
+
+    # Buy opening the next position (len(buys): none), then the k-th trade
+    # is next_buy applied k times to the first buy
+    next_buy = np.append(np.searchsorted(buys, exits, side='right'), len(buys))
+    steps = np.arange(len(buys))
+    trade = np.zeros(len(buys), dtype=np.int64)
+    bit = 0
+    while (1 << bit) < len(buys):
+        take = ((steps >> bit) & 1).astype(bool)
+        trade[take] = next_buy[trade[take]]
+        next_buy = next_buy[next_buy]
+        bit += 1
+    trade = trade[trade < len(buys)]
+    return buys[trade].astype(np.int64), exits[trade].astype(np.int64)
+
+
+@jit
+def _long_only_trades_jit(signal, holding_period):
+    """Loop kernel of ``_long_only_trades_numpy``, walking the bars once"""
+    n = len(signal)
+    entries = np.empty(n, dtype=np.int64)
+    exits = np.empty(n, dtype=np.int64)
+    count = 0
+    entry = -1
+    for i in range(n):
+        if entry < 0:
+            if signal[i] == 1:
+                entry = i
+        elif signal[i] == -1 or i - entry >= holding_period:
+            entries[count] = entry
+            exits[count] = i
+            count += 1
+            entry = -1
+    if entry >= 0:
+        entries[count] = entry
+        exits[count] = n - 1
+        count += 1
+    return entries[:count], exits[:count]
+
+
+# Compiled loop when Numba is installed, pointer-doubling NumPy otherwise
+long_only_trades = _long_only_trades_jit if NUMBA_AVAILABLE else _long_only_trades_numpy
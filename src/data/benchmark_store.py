@@ -0,0 +1,247 @@
+"""Memory-mapped local store of benchmark index closes"""
+
+import json
+import os
+import threading
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Union
+
+import numpy as np
+import pandas as pd
+from loguru import logger
+
+from .cache import _to_day, merge_intervals, missing_intervals
+
+
+class BenchmarkStore:
+    """Daily closes of benchmark indices (VNINDEX, VN30, HNXINDEX, ...)
+
+    Layout::
+
+        <root>/<INDEX>/dates.npy       # datetime64[D], ascending
+        <root>/<INDEX>/close.npy       # float64
+        <root>/<INDEX>/day_pos.npy     # int64, bars before each calendar day
+        <root>/<INDEX>/meta.json       # covered date intervals
+
+    Arrays are memory-mapped on read. ``day_pos[d]`` counts the bars dated
+    before calendar day ``dates[0] + d``, so a date range is sliced with two
+    array lookups instead of a search. Ranges not yet covered are fetched
+    through ``fetch_fn`` and merged in; today is never marked as covered.
+    """
+
+    def __init__(self, root: str = "data/store/benchmark"):
+        """Initialize store
+
+        Args:
+            root: Root directory of the store
+        """
+        self.root = Path(root)
+        self._arrays: Dict[str, Dict[str, np.ndarray]] = {}
+        self._lock = threading.RLock()
+
+    def _index_dir(self, index: str) -> Path:
+        return self.root / index
+
+    def _coverage(self, index: str) -> List:
+        meta_path = self._index_dir(index) / "meta.json"
+        if not meta_path.exists():
+            return []
+        with open(meta_path, 'r', encoding='utf-8') as f:
+            meta = json.load(f)
+        return [(pd.Timestamp(s), pd.Timestamp(e)) for s, e in meta['covered']]
+
+    def _load(self, index: str) -> Optional[Dict[str, np.ndarray]]:
+        """Memory-map the arrays of an index (cached per process)"""
+        if index not in self._arrays:
+            index_dir = self._index_dir(index)
+            if not (index_dir / "dates.npy").exists():
+                return None
+            self._arrays[index] = {
+                name: np.load(index_dir / f"{name}.npy", mmap_mode='r')
+                for name in ('dates', 'close', 'day_pos')
+            }
+        return self._arrays[index]
+
+    def _write(self, index: str, dates: np.ndarray, close: np.ndarray, covered: List) -> None:
+        """Atomically rewrite the arrays and coverage of an index"""
+        index_dir = self._index_dir(index)
+        index_dir.mkdir(parents=True, exist_ok=True)
+
+        days = (dates - dates[0]).astype(np.int64)
+        day_pos = np.searchsorted(days, np.arange(days[-1] + 2), side='left').astype(np.int64)
+
+        # Drop the memory maps before replacing the files they point to
+        self._arrays.pop(index, None)
+        for name, values in (('dates', dates), ('close', close), ('day_pos', day_pos)):
+            tmp_path = index_dir / f"{name}.tmp.npy"
+            np.save(tmp_path, values)
+            os.replace(tmp_path, index_dir / f"{name}.npy")
+
+        self._write_coverage(index, covered)
+
+    def _write_coverage(self, index: str, covered: List) -> None:
+        """Atomically persist the covered intervals of an index"""
+        index_dir = self._index_dir(index)
+        index_dir.mkdir(parents=True, exist_ok=True)
+        tmp_path = index_dir / "meta.json.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump({'covered': [[s.strftime('%Y-%m-%d'), e.strftime('%Y-%m-%d')]
+                                   for s, e in covered]}, f, indent=2)
+        os.replace(tmp_path, index_dir / "meta.json")
+
+    def update(
+        self,
+        index: str,
+        fetch_fn: Callable[[str, str, str], pd.DataFrame],
+        start_date: Union[str, pd.Timestamp],
+        end_date: Optional[Union[str, pd.Timestamp]] = None
+    ) -> int:
+        """Fetch the parts of [start_date, end_date] not covered yet
+
+        Args:
+            index: Index symbol
+            fetch_fn: Callable(index, from_date, to_date) returning a frame
+                with timestamp and close columns
+            start_date: First date of the range
+            end_date: Last date of the range, None for today
+
+        Returns:
+            Number of bars fetched
+        """
+        start, end = _to_day(start_date), _to_day(end_date)
+        today = pd.Timestamp.today().normalize()
+
+        with self._lock:
+            covered = self._coverage(index)
+            missing = missing_intervals(start, end, covered)
+            if not missing:
+                return 0
+
+            frames = []
+            for m_start, m_end in missing:
+                data = fetch_fn(index, m_start.strftime('%Y-%m-%d'), m_end.strftime('%Y-%m-%d'))
+                if data is not None and not data.empty:
+                    frames.append(data[['timestamp', 'close']])
+            fetched = sum(len(frame) for frame in frames)
+            logger.info(f"Benchmark store: fetched {fetched} {index} bars for {len(missing)} missing ranges")
+
+            arrays = self._load(index)
+            if arrays is not None:
+                frames.insert(0, pd.DataFrame({'timestamp': np.asarray(arrays['dates']),
+                                               'close': np.asarray(arrays['close'])}))
+
+            covered = merge_intervals(covered + [
+                (m_start, min(m_end, today - pd.Timedelta(days=1))) for m_start, m_end in missing
+                if m_start < today
+            ])
+
+            if frames:
+                data = pd.concat(frames, ignore_index=True)
+                data['timestamp'] = pd.to_datetime(data['timestamp']).dt.normalize()
+                # Freshly fetched bars replace stored ones of the same day
+                data = data.drop_duplicates(subset=['timestamp'], keep='last').sort_values('timestamp')
+                self._write(index,
+                            data['timestamp'].to_numpy(dtype='datetime64[D]'),
+                            data['close'].to_numpy(dtype=np.float64),
+                            covered)
+            elif covered:
+                # Nothing to store yet, keep the coverage so empty ranges are not re-fetched
+                self._write_coverage(index, covered)
+            return fetched
+
+    def closes(
+        self,
+        index: str,
+        start_date: Union[str, pd.Timestamp],
+        end_date: Union[str, pd.Timestamp]
+    ) -> pd.Series:
+        """Stored closes of an index between two dates (inclusive)
+
+        Args:
+            index: Index symbol
+            start_date: First date
+            end_date: Last date
+
+        Returns:
+            Close series indexed by timestamp (a view on the memory map)
+        """
+        arrays = self._load(index)
+        if arrays is None:
+            return pd.Series(dtype=np.float64, name='close')
+
+        dates, day_pos = arrays['dates'], arrays['day_pos']
+        first = dates[0]
+        n_days = len(day_pos) - 1
+        start_day = (np.datetime64(_to_day(start_date).date(), 'D') - first).astype(np.int64)
+        end_day = (np.datetime64(_to_day(end_date).date(), 'D') - first).astype(np.int64) + 1
+        lo = day_pos[min(max(start_day, 0), n_days)]
+        hi = day_pos[min(max(end_day, 0), n_days)]
+
+        return pd.Series(
+            arrays['close'][lo:hi],
+            index=pd.DatetimeIndex(dates[lo:hi].astype('datetime64[ns]'), name='timestamp'),
+            name='close'
+        )
+
+    def returns(
+        self,
+        index: str,
+        start_date: Union[str, pd.Timestamp],
+        end_date: Union[str, pd.Timestamp],
+        fetch_fn: Optional[Callable[[str, str, str], pd.DataFrame]] = None
+    ) -> pd.DataFrame:
+        """Daily closes and returns of an index, fetching uncovered ranges first
+
+        Args:
+            index: Index symbol
+            start_date: First date
+            end_date: Last date
+            fetch_fn: Callable(index, from_date, to_date) used for uncovered
+                ranges, None to serve stored bars only
+
+        Returns:
+            DataFrame indexed by timestamp with close and return columns
+        """
+        if fetch_fn is not None:
+            self.update(index, fetch_fn, start_date, end_date)
+
+        benchmark_df = self.closes(index, start_date, end_date).to_frame()
+        benchmark_df['return'] = benchmark_df['close'].pct_change()
+        return benchmark_df
+
+
+_default_store: Optional[BenchmarkStore] = None
+
+
+def get_benchmark_store() -> BenchmarkStore:
+    """Return the process-wide benchmark store"""
+    global _default_store
+    if _default_store is None:
+        _default_store = BenchmarkStore()
+    return _default_store
+
+
+def set_benchmark_store(store: BenchmarkStore) -> None:
+    """Replace the process-wide benchmark store"""
+    global _default_store
+    _default_store = store
+
+
+def create_benchmark_store(config: Dict[str, Any]) -> Optional[BenchmarkStore]:
+    """Create the benchmark store from backtest.benchmark_store, None when disabled
+
+    The store is enabled unless configured otherwise; with the default
+    directory the process-wide store (and its memory-mapped arrays) is reused.
+
+    Args:
+        config: Configuration with an optional backtest.benchmark_store section
+
+    Returns:
+        BenchmarkStore instance or None
+    """
+    store_config = (config or {}).get('backtest', {}).get('benchmark_store', {})
+    if not store_config.get('enabled', True):
+        return None
+    store = get_benchmark_store()
+    root = Path(store_config.get('dir', store.root))
+    return store if root == store.root else BenchmarkStore(str(root))
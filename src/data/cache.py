@@ -0,0 +1,236 @@
+"""On-disk Parquet cache for FiinQuantX trading data"""
+
+import hashlib
+import json
+import os
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Tuple, Union
+
+import pandas as pd
+from loguru import logger
+
+Interval = Tuple[pd.Timestamp, pd.Timestamp]
+
+
+def _to_day(value: Optional[Union[str, pd.Timestamp]]) -> pd.Timestamp:
+    """Normalize a date-like value to midnight (None means today)"""
+    if value is None:
+        return pd.Timestamp.today().normalize()
+    return pd.Timestamp(value).normalize()
+
+
+def merge_intervals(intervals: List[Interval]) -> List[Interval]:
+    """Merge overlapping or adjacent (by one day) date intervals
+
+    Args:
+        intervals: List of inclusive (start, end) intervals
+
+    Returns:
+        Sorted list of disjoint intervals
+    """
+    merged: List[Interval] = []
+    for start, end in sorted(intervals):
+        if merged and start <= merged[-1][1] + pd.Timedelta(days=1):
+            merged[-1] = (merged[-1][0], max(merged[-1][1], end))
+        else:
+            merged.append((start, end))
+    return merged
+
+
+def missing_intervals(start: pd.Timestamp, end: pd.Timestamp,
+                      covered: List[Interval]) -> List[Interval]:
+    """Return the parts of [start, end] not contained in covered intervals
+
+    Args:
+        start: Requested start date (inclusive)
+        end: Requested end date (inclusive)
+        covered: Disjoint, sorted covered intervals
+
+    Returns:
+        List of missing inclusive intervals
+    """
+    missing: List[Interval] = []
+    cursor = start
+    for c_start, c_end in covered:
+        if c_end < cursor:
+            continue
+        if c_start > end:
+            break
+        if c_start > cursor:
+            missing.append((cursor, c_start - pd.Timedelta(days=1)))
+        cursor = max(cursor, c_end + pd.Timedelta(days=1))
+        if cursor > end:
+            break
+    if cursor <= end:
+        missing.append((cursor, end))
+    return missing
+
+
+class TradingDataCache:
+    """Parquet cache keyed by (ticker, field set, timeframe, adjusted, date range)
+
+    Each (ticker, field set, timeframe, adjusted) combination is stored as one
+    Parquet file, with a JSON sidecar recording which date ranges it covers.
+    Requests are answered from disk where covered and only the missing date
+    ranges are fetched from the API.
+    """
+
+    def __init__(self, cache_dir: str = "data/cache/trading"):
+        """Initialize cache
+
+        Args:
+            cache_dir: Root directory of the cache
+        """
+        self.cache_dir = Path(cache_dir)
+        self.stats = {'hits': 0, 'partial': 0, 'misses': 0, 'bytes_read': 0}
+
+    def _entry_dir(self, fields: List[str], timeframe: str, adjusted: bool) -> Path:
+        """Directory holding all tickers of one field set / timeframe / adjustment"""
+        fields_key = hashlib.sha1(",".join(sorted(fields)).encode()).hexdigest()[:12]
+        adjust_key = "adj" if adjusted else "raw"
+        return self.cache_dir / timeframe / adjust_key / fields_key
+
+    def _load_coverage(self, meta_path: Path) -> List[Interval]:
+        """Load covered date intervals from sidecar file"""
+        if not meta_path.exists():
+            return []
+        with open(meta_path, 'r', encoding='utf-8') as f:
+            meta = json.load(f)
+        return [(pd.Timestamp(s), pd.Timestamp(e)) for s, e in meta.get('coverage', [])]
+
+    def _save_entry(self, data_path: Path, meta_path: Path, data: pd.DataFrame,
+                    coverage: List[Interval]) -> None:
+        """Atomically write cached frame and its coverage sidecar"""
+        data_path.parent.mkdir(parents=True, exist_ok=True)
+        if not data.empty:
+            tmp_path = data_path.with_suffix('.parquet.tmp')
+            data.to_parquet(tmp_path, index=False)
+            os.replace(tmp_path, data_path)
+
+        meta = {'coverage': [[s.strftime('%Y-%m-%d'), e.strftime('%Y-%m-%d')] for s, e in coverage]}
+        tmp_meta = meta_path.with_suffix('.json.tmp')
+        with open(tmp_meta, 'w', encoding='utf-8') as f:
+            json.dump(meta, f)
+        os.replace(tmp_meta, meta_path)
+
+    def fetch(
+        self,
+        fetch_fn: Callable[[List[str], str, str], pd.DataFrame],
+        tickers: Union[str, List[str]],
+        fields: List[str],
+        start_date: str,
+        end_date: Optional[str] = None,
+        timeframe: str = "1d",
+        adjusted: bool = True
+    ) -> pd.DataFrame:
+        """Serve a trading data request, fetching only uncovered date ranges
+
+        Args:
+            fetch_fn: Callable(tickers, from_date, to_date) hitting the API
+            tickers: Ticker symbol(s)
+            fields: Data fields to fetch
+            start_date: Start date (YYYY-MM-DD)
+            end_date: End date (YYYY-MM-DD), None for current date
+            timeframe: Data frequency (1d, 1h, etc.)
+            adjusted: Whether to use adjusted prices
+
+        Returns:
+            DataFrame with trading data for the requested range
+        """
+        if isinstance(tickers, str):
+            tickers = [tickers]
+
+        start = _to_day(start_date)
+        end = _to_day(end_date)
+        # Today's bar may still change, so never mark it as covered
+        last_final_day = pd.Timestamp.today().normalize() - pd.Timedelta(days=1)
+
+        entry_dir = self._entry_dir(fields, timeframe, adjusted)
+        counts = {'hits': 0, 'partial': 0, 'misses': 0}
+        coverage: Dict[str, List[Interval]] = {}
+        requests: Dict[Tuple[Interval, ...], List[str]] = {}
+
+        for ticker in tickers:
+            coverage[ticker] = self._load_coverage(entry_dir / f"{ticker}.json")
+            missing = missing_intervals(start, end, coverage[ticker])
+            if not missing:
+                counts['hits'] += 1
+            else:
+                counts['misses' if missing == [(start, end)] else 'partial'] += 1
+                requests.setdefault(tuple(missing), []).append(ticker)
+
+        # Fetch missing ranges, one API call per distinct range and ticker group
+        fetched: Dict[str, List[pd.DataFrame]] = {}
+        for missing, group in requests.items():
+            for m_start, m_end in missing:
+                data = fetch_fn(group, m_start.strftime('%Y-%m-%d'), m_end.strftime('%Y-%m-%d'))
+                if data is None or data.empty:
+                    continue
+                data['timestamp'] = pd.to_datetime(data['timestamp'])
+                for ticker, ticker_data in data.groupby('ticker', sort=False):
+                    fetched.setdefault(ticker, []).append(ticker_data)
+
+        resolved: Dict[str, pd.DataFrame] = {}
+        bytes_read = 0
+        for missing, group in requests.items():
+            for ticker in group:
+                data_path = entry_dir / f"{ticker}.parquet"
+                frames = fetched.get(ticker, [])
+                if data_path.exists():
+                    bytes_read += data_path.stat().st_size
+                    frames = [pd.read_parquet(data_path)] + frames
+                merged = pd.concat(frames, ignore_index=True) if frames else pd.DataFrame()
+                if not merged.empty:
+                    merged = (merged.drop_duplicates(subset=['timestamp'], keep='last')
+                              .sort_values('timestamp')
+                              .reset_index(drop=True))
+
+                new_coverage = [(s, min(e, last_final_day)) for s, e in missing if s <= last_final_day]
+                coverage[ticker] = merge_intervals(coverage[ticker] + new_coverage)
+                if coverage[ticker] or not merged.empty:
+                    self._save_entry(data_path, entry_dir / f"{ticker}.json", merged, coverage[ticker])
+                resolved[ticker] = merged
+
+        # Assemble the response: fully covered tickers are read straight from disk
+        frames = []
+        for ticker in tickers:
+            if ticker in resolved:
+                ticker_data = resolved[ticker]
+                if not ticker_data.empty:
+                    in_range = ((ticker_data['timestamp'] >= start) &
+                                (ticker_data['timestamp'] < end + pd.Timedelta(days=1)))
+                    ticker_data = ticker_data[in_range]
+            else:
+                data_path = entry_dir / f"{ticker}.parquet"
+                if not data_path.exists():
+                    continue
+                bytes_read += data_path.stat().st_size
+                ticker_data = pd.read_parquet(
+                    data_path,
+                    filters=[('timestamp', '>=', start),
+                             ('timestamp', '<', end + pd.Timedelta(days=1))]
+                )
+            if not ticker_data.empty:
+                frames.append(ticker_data)
+
+        for key, value in counts.items():
+            self.stats[key] += value
+        self.stats['bytes_read'] += bytes_read
+        logger.info(
+            f"Trading data cache: {counts['hits']} hits, {counts['partial']} partial, "
+            f"{counts['misses']} misses, {bytes_read / 1024:.1f} KB read"
+        )
+
+        if not frames:
+            return pd.DataFrame()
+        return pd.concat(frames, ignore_index=True)
+
+    def clear(self) -> None:
+        """Remove all cached entries"""
+        if self.cache_dir.exists():
+            for path in sorted(self.cache_dir.rglob('*'), reverse=True):
+                if path.is_file():
+                    path.unlink()
+                else:
+                    path.rmdir()
+        logger.info(f"Cleared trading data cache at {self.cache_dir}")
@@ -3,49 +3,83 @@
 import pandas as pd
 import numpy as np
 from datetime import datetime, timedelta
-from typing import List, Dict, Optional, Union
+from typing import Dict, Iterator, List, Optional, Union
 from loguru import logger
-from FiinQuantX import FiinSession
+
+from .cache import TradingDataCache
+from .fetch_scheduler import FetchScheduler
+from .market_store import MarketDataStore
+from .quality import DataQualityValidator
+from .replay_client import ReplayClient
+from .schema import apply_schema
+from .session import SessionManager, get_session_manager
+from .universe_store import UniverseStore
 
 
 class FiinDataFetcher:
     """Data fetcher for FiinQuantX API"""
 
-    def __init__(self, username: str, password: str):
+    def __init__(
+        self,
+        username: str,
+        password: str,
+        cache_dir: Optional[str] = None,
+        scheduler: Optional[FetchScheduler] = None,
+        session_manager: Optional[SessionManager] = None,
+        validator: Optional[DataQualityValidator] = None,
+        universe_store: Optional[UniverseStore] = None
+    ):
         """Initialize FiinQuantX session
 
         Args:
             username: FiinQuantX username
             password: FiinQuantX password
+            cache_dir: Directory of the on-disk trading data cache, None to disable
+            scheduler: Chunked fetch scheduler, None for one request per fetch
+            session_manager: Session manager, defaults to the process-wide one
+            validator: Data-quality validator used by validate_data
+            universe_store: Local constituent store, None to call TickerList every time
         """
         self.username = username
         self.password = password
-        self.client = None
+        self.session_manager = session_manager or get_session_manager()
+        self.cache = TradingDataCache(cache_dir) if cache_dir else None
+        self.scheduler = scheduler
+        self.validator = validator or DataQualityValidator()
+        self.universe_store = universe_store
+        self.quality_report = None
         self.login()
 
+    @property
+    def client(self):
+        """Shared FiinQuantX client, refreshed lazily by the session manager"""
+        return self.session_manager.get_client(self.username, self.password)
+
     def login(self) -> None:
-        """Login to FiinQuantX"""
-        try:
-            self.client = FiinSession(
-                username=self.username,
-                password=self.password
-            ).login()
-            logger.info("Successfully logged in to FiinQuantX")
-        except Exception as e:
-            logger.error(f"Failed to login to FiinQuantX: {e}")
-            raise
+        """Login to FiinQuantX (reuses the shared session if already logged in)"""
+        self.session_manager.get_client(self.username, self.password)
 
-    def get_ticker_list(self, universe: str = "VN30") -> List[str]:
+    def get_ticker_list(self, universe: str = "VN30", as_of: Optional[str] = None) -> List[str]:
         """Get list of tickers from universe
 
         Args:
             universe: Universe name (VN30, VN100, etc.)
+            as_of: Date (YYYY-MM-DD) of the constituents, None for the latest;
+                requires the universe store
 
         Returns:
             List of ticker symbols
         """
+        def fetch_tickers(name: str) -> List[str]:
+            return self.client.TickerList(ticker=name)
+
         try:
-            tickers = self.client.TickerList(ticker=universe)
+            if self.universe_store is not None:
+                tickers = self.universe_store.constituents(universe, as_of, fetch_fn=fetch_tickers)
+            elif as_of is not None:
+                raise ValueError("Point-in-time constituents require the universe store")
+            else:
+                tickers = fetch_tickers(universe)
             logger.info(f"Retrieved {len(tickers)} tickers from {universe}")
             return tickers
         except Exception as e:
@@ -59,7 +93,8 @@ class FiinDataFetcher:
         start_date: str,
         end_date: Optional[str] = None,
         timeframe: str = "1d",
-        adjusted: bool = True
+        adjusted: bool = True,
+        use_cache: bool = True
     ) -> pd.DataFrame:
         """Fetch trading data from FiinQuantX
 
@@ -70,30 +105,45 @@ class FiinDataFetcher:
             end_date: End date (YYYY-MM-DD), None for current date
             timeframe: Data frequency (1d, 1h, etc.)
             adjusted: Whether to use adjusted prices
+            use_cache: Serve from the local cache when one is configured
 
         Returns:
             DataFrame with trading data
         """
-        try:
-            logger.info(f"Fetching data for {tickers} from {start_date}")
-
-            data = self.client.Fetch_Trading_Data(
+        def request(request_tickers, from_date, to_date):
+            return self.client.Fetch_Trading_Data(
                 realtime=False,
-                tickers=tickers,
+                tickers=request_tickers,
                 fields=fields,
                 adjusted=adjusted,
                 by=timeframe,
-                from_date=start_date,
-                to_date=end_date
+                from_date=from_date,
+                to_date=to_date
             ).get_data()
 
+        def fetch_remote(request_tickers, from_date, to_date):
+            if self.scheduler is not None:
+                return self.scheduler.run(request, request_tickers, from_date, to_date)
+            return request(request_tickers, from_date, to_date)
+
+        try:
+            logger.info(f"Fetching data for {tickers} from {start_date}")
+
+            if self.cache is not None and use_cache:
+                data = self.cache.fetch(
+                    fetch_remote, tickers, fields, start_date, end_date, timeframe, adjusted
+                )
+            else:
+                data = fetch_remote(tickers, start_date, end_date)
+
             if data is None or data.empty:
                 logger.warning("No data retrieved")
                 return pd.DataFrame()
 
-            # Convert timestamp to datetime
+            # Convert timestamp to datetime and cast to the compact schema
             if 'timestamp' in data.columns:
                 data['timestamp'] = pd.to_datetime(data['timestamp'])
+            data = apply_schema(data)
 
             logger.info(f"Retrieved {len(data)} rows of data")
             return data
@@ -102,6 +152,51 @@ class FiinDataFetcher:
             logger.error(f"Failed to fetch trading data: {e}")
             raise
 
+    def ingest_incremental(
+        self,
+        store: MarketDataStore,
+        tickers: List[str],
+        fields: List[str],
+        start_date: str,
+        end_date: Optional[str] = None,
+        timeframe: str = "1d",
+        adjusted: bool = True
+    ) -> int:
+        """Fetch only bars newer than each ticker's last stored bar
+
+        Tickers sharing the same range are fetched in one request. History
+        before the store's coverage (start_date moved earlier) is backfilled,
+        and the coverage is recorded once every range was fetched.
+
+        Args:
+            store: Partitioned market-data store to append to
+            tickers: Ticker symbols
+            fields: Data fields to fetch
+            start_date: Start date for tickers not yet in the store
+            end_date: End date (YYYY-MM-DD), None for current date
+            timeframe: Data frequency (1d, 1h, etc.)
+            adjusted: Whether to use adjusted prices
+
+        Returns:
+            Number of rows appended to the store
+        """
+        appended = 0
+        for (from_date, to_date), group in store.pending_ranges(tickers, start_date, end_date).items():
+            delta = self.fetch_trading_data(
+                tickers=group,
+                fields=fields,
+                start_date=from_date,
+                end_date=to_date or end_date,
+                timeframe=timeframe,
+                adjusted=adjusted,
+                use_cache=False
+            )
+            appended += store.append(delta)
+        store.mark_covered(tickers, start_date)
+
+        logger.info(f"Incremental ingestion appended {appended} rows")
+        return appended
+
     def validate_data(self, data: pd.DataFrame) -> pd.DataFrame:
         """Validate and clean fetched data
 
@@ -117,29 +212,8 @@ class FiinDataFetcher:
 
         initial_rows = len(data)
 
-        # Remove rows with all NaN values in OHLC
-        ohlc_cols = ['open', 'high', 'low', 'close']
-        available_ohlc = [col for col in ohlc_cols if col in data.columns]
-
-        if available_ohlc:
-            data = data.dropna(subset=available_ohlc, how='all')
-
-        # Basic data quality checks
-        if 'high' in data.columns and 'low' in data.columns:
-            # High should be >= Low
-            invalid_hl = data['high'] < data['low']
-            if invalid_hl.any():
-                logger.warning(f"Found {invalid_hl.sum()} rows where high < low")
-                data = data[~invalid_hl]
-
-        # Remove negative prices
-        price_cols = ['open', 'high', 'low', 'close']
-        for col in price_cols:
-            if col in data.columns:
-                negative_prices = data[col] <= 0
-                if negative_prices.any():
-                    logger.warning(f"Found {negative_prices.sum()} negative/zero prices in {col}")
-                    data = data[~negative_prices]
+        # All rules are evaluated in one pass; the per-ticker report is kept
+        data, self.quality_report = self.validator.validate(data)
 
         final_rows = len(data)
         removed_rows = initial_rows - final_rows
@@ -149,31 +223,41 @@ class FiinDataFetcher:
 
         return data
 
-    def prepare_dataset(
-        self,
-        config: Dict,
-        save_raw: bool = True
-    ) -> pd.DataFrame:
-        """Prepare complete dataset based on configuration
+    def resolve_tickers(self, config: Dict) -> List[str]:
+        """Resolve the configured ticker list
 
         Args:
             config: Data configuration dictionary
-            save_raw: Whether to save raw data
 
         Returns:
-            Prepared dataset
+            Custom tickers if configured, otherwise the universe constituents
         """
         data_config = config.get('data', {})
-
-        # Get tickers
         universe = data_config.get('universe', 'VN30')
         custom_tickers = data_config.get('custom_tickers')
 
         if custom_tickers:
-            tickers = custom_tickers
-            logger.info(f"Using custom ticker list: {tickers}")
-        else:
-            tickers = self.get_ticker_list(universe)
+            logger.info(f"Using custom ticker list: {custom_tickers}")
+            return list(custom_tickers)
+        return self.get_ticker_list(universe, as_of=data_config.get('universe_as_of'))
+
+    def load_dataset(
+        self,
+        config: Dict,
+        tickers: List[str],
+        ingest: bool = True
+    ) -> pd.DataFrame:
+        """Fetch (or load from the market store) and validate data for tickers
+
+        Args:
+            config: Data configuration dictionary
+            tickers: Ticker symbols
+            ingest: In incremental mode, fetch new bars into the store first
+
+        Returns:
+            Validated trading data
+        """
+        data_config = config.get('data', {})
 
         # Get date range
         start_date = data_config.get('start_date', '2020-01-01')
@@ -185,17 +269,43 @@ class FiinDataFetcher:
         adjusted = data_config.get('adjusted', True)
 
         # Fetch data
-        data = self.fetch_trading_data(
-            tickers=tickers,
-            fields=fields,
-            start_date=start_date,
-            end_date=end_date,
-            timeframe=timeframe,
-            adjusted=adjusted
-        )
+        ingestion = data_config.get('ingestion', {})
+        if ingestion.get('mode', 'full') == 'incremental':
+            store = MarketDataStore(ingestion.get('store_dir', 'data/store/market'))
+            if ingest:
+                self.ingest_incremental(
+                    store, tickers, fields, start_date, end_date, timeframe, adjusted
+                )
+            data = store.load(tickers, start_date, end_date)
+        else:
+            data = self.fetch_trading_data(
+                tickers=tickers,
+                fields=fields,
+                start_date=start_date,
+                end_date=end_date,
+                timeframe=timeframe,
+                adjusted=adjusted
+            )
 
         # Validate data
-        data = self.validate_data(data)
+        return self.validate_data(data)
+
+    def prepare_dataset(
+        self,
+        config: Dict,
+        save_raw: bool = True
+    ) -> pd.DataFrame:
+        """Prepare complete dataset based on configuration
+
+        Args:
+            config: Data configuration dictionary
+            save_raw: Whether to save raw data
+
+        Returns:
+            Prepared dataset
+        """
+        tickers = self.resolve_tickers(config)
+        data = self.load_dataset(config, tickers)
 
         if data.empty:
             logger.error("No valid data after validation")
@@ -209,15 +319,107 @@ class FiinDataFetcher:
 
         return data
 
+    def iter_dataset(
+        self,
+        config: Dict,
+        batch_size: int = 1
+    ) -> Iterator[pd.DataFrame]:
+        """Yield the validated dataset one ticker batch at a time
+
+        Tickers are processed in sorted order, which is the order the
+        per-ticker groupby of labeling and feature engineering produces for
+        the whole dataset. In incremental mode all new bars are ingested into
+        the market store once, then each batch is read back from the store.
 
-def create_data_fetcher(username: str, password: str) -> FiinDataFetcher:
+        Args:
+            config: Data configuration dictionary
+            batch_size: Tickers per yielded batch
+
+        Yields:
+            Validated trading data of one ticker batch
+        """
+        tickers = sorted(self.resolve_tickers(config))
+        data_config = config.get('data', {})
+        ingestion = data_config.get('ingestion', {})
+
+        if ingestion.get('mode', 'full') == 'incremental':
+            store = MarketDataStore(ingestion.get('store_dir', 'data/store/market'))
+            self.ingest_incremental(
+                store,
+                tickers,
+                data_config.get('fields', ['open', 'high', 'low', 'close', 'volume']),
+                data_config.get('start_date', '2020-01-01'),
+                data_config.get('end_date'),
+                data_config.get('timeframe', '1d'),
+                data_config.get('adjusted', True)
+            )
+
+        reports = []
+        for i in range(0, len(tickers), batch_size):
+            batch = tickers[i:i + batch_size]
+            self.quality_report = None
+            data = self.load_dataset(config, batch, ingest=False)
+            if self.quality_report is not None:
+                reports.append(self.quality_report)
+            if data.empty:
+                logger.warning(f"No valid data for {batch}, skipping")
+                continue
+            yield data
+
+        self.quality_report = pd.concat(reports) if reports else None
+
+
+def create_data_fetcher(
+    username: str,
+    password: str,
+    config: Optional[Dict] = None
+) -> FiinDataFetcher:
     """Create and return FiinDataFetcher instance
 
     Args:
         username: FiinQuantX username
         password: FiinQuantX password
+        config: Data configuration (backend, session, cache, fetch, validation and
+            universe store settings)
 
     Returns:
         FiinDataFetcher instance
     """
-    return FiinDataFetcher(username, password)
+    config = config or {}
+    data_config = config.get('data', {})
+
+    session_manager = None
+    if data_config.get('backend', 'fiin') == 'replay':
+        session_manager = SessionManager(
+            session_factory=lambda _username, _password: ReplayClient.from_config(config)
+        )
+        logger.info("Using offline replay backend")
+
+    session_config = data_config.get('session', {})
+    if 'token_ttl' in session_config:
+        (session_manager or get_session_manager()).token_ttl = float(session_config['token_ttl'])
+
+    cache_config = data_config.get('cache', {})
+    cache_dir = cache_config.get('dir', 'data/cache/trading') if cache_config.get('enabled') else None
+
+    fetch_config = dict(data_config.get('fetch', {}))
+    scheduler = FetchScheduler(**fetch_config) if fetch_config.pop('enabled', False) else None
+
+    universe_config = data_config.get('universe_store', {})
+    universe_store = None
+    if universe_config.get('enabled'):
+        universe_store = UniverseStore(
+            root=universe_config.get('dir', 'data/store/universe'),
+            ttl=float(universe_config.get('ttl_hours', 24)) * 3600
+        )
+        if universe_config.get('snapshots_csv'):
+            universe_store.import_csv(universe_config['snapshots_csv'], universe=data_config.get('universe'))
+
+    return FiinDataFetcher(
+        username, password,
+        cache_dir=cache_dir,
+        scheduler=scheduler,
+        session_manager=session_manager,
+        validator=DataQualityValidator.from_config(config),
+        universe_store=universe_store
+    )
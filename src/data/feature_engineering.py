@@ -2,21 +2,68 @@
 
 import pandas as pd
 import numpy as np
-from typing import Dict, List, Any
+from typing import Dict, Iterable, List, Any, Optional
 from loguru import logger
 
+from .feature_planner import (
+    MOMENTUM_PERIODS, RANK_WINDOWS, FeaturePlan, blocks_config, build_feature_plan, feature_blocks,
+    select_blocks
+)
+from .feature_store import FeatureStore, block_key, create_feature_store, data_fingerprint
+from .indicators import LocalIndicator, rolling_rank_pct
+from .panel import Panel
+from .parallel_features import engineer_features_parallel
+from .quantile_sketch import causal_regime, causal_regime_frame, regime_settings
+from .schema import FLOAT_DTYPE, apply_schema, feature_frame
+
+INDICATOR_BACKENDS = ('fiin', 'local')
+FEATURE_ENGINES = ('per_ticker', 'panel')
+
+
+def _with_columns(data: pd.DataFrame, columns: Dict[str, Any]) -> pd.DataFrame:
+    """Copy of data with columns added in one step (existing names are replaced in place)"""
+    existing = [name for name in columns if name in data.columns]
+    if existing:
+        data = data.assign(**{name: columns.pop(name) for name in existing})
+    return pd.concat([data, pd.DataFrame(columns, index=data.index)], axis=1)
+
 
 class FeatureEngineer:
     """Feature engineering class using FiinQuantX indicators"""
 
-    def __init__(self, client):
+    def __init__(
+        self,
+        client,
+        indicator_backend: str = "fiin",
+        engine: str = "per_ticker",
+        feature_store: Optional[FeatureStore] = None,
+        n_workers: int = 1
+    ):
         """Initialize with FiinQuantX client
 
         Args:
-            client: Authenticated FiinQuantX client
+            client: Authenticated FiinQuantX client (unused by the local backend)
+            indicator_backend: "fiin" for the SDK's FiinIndicator, "local" for
+                the in-repo NumPy kernels
+            engine: "per_ticker" computes indicators once per ticker group
+                with the chosen backend and the other stages through the
+                feature plan, "panel" runs each feature once over a ticker x
+                time panel (always with the NumPy kernels)
+            feature_store: Store of previously computed feature blocks, None
+                to always compute every feature
+            n_workers: Default number of worker processes for multi-ticker data
         """
+        if indicator_backend not in INDICATOR_BACKENDS:
+            raise ValueError(f"Unknown indicator backend: {indicator_backend}")
+        if engine not in FEATURE_ENGINES:
+            raise ValueError(f"Unknown feature engine: {engine}")
         self.client = client
-        self.fi = client.FiinIndicator()
+        self.indicator_backend = indicator_backend
+        self.engine = engine
+        self.feature_store = feature_store
+        self.n_workers = n_workers
+        self.plan_timings = []
+        self.fi = LocalIndicator() if indicator_backend == 'local' else client.FiinIndicator()
 
     def add_technical_indicators(
         self,
@@ -32,7 +79,24 @@ class FeatureEngineer:
         Returns:
             DataFrame with technical indicators added
         """
-        df = data.copy()
+        return _with_columns(data, self.technical_indicator_columns(data, config))
+
+    def technical_indicator_columns(
+        self,
+        data: pd.DataFrame,
+        config: Dict[str, Any]
+    ) -> Dict[str, Any]:
+        """Compute technical indicators without touching data
+
+        Args:
+            data: DataFrame with OHLC data
+            config: Feature configuration
+
+        Returns:
+            Indicator name to values mapping, in column order
+        """
+        columns = {}
+        close = data['close']
 
         # Get technical indicators config
         tech_config = config.get('features', {}).get('technical_indicators', {})
@@ -40,11 +104,11 @@ class FeatureEngineer:
         # Trend indicators
         if 'ema_periods' in tech_config:
             for period in tech_config['ema_periods']:
-                df[f'ema_{period}'] = self.fi.ema(df['close'], window=period)
+                columns[f'ema_{period}'] = self.fi.ema(close, window=period)
 
         if 'sma_periods' in tech_config:
             for period in tech_config['sma_periods']:
-                df[f'sma_{period}'] = self.fi.sma(df['close'], window=period)
+                columns[f'sma_{period}'] = self.fi.sma(close, window=period)
 
         # MACD
         if 'macd' in tech_config:
@@ -53,28 +117,28 @@ class FeatureEngineer:
             slow = macd_config.get('slow', 26)
             signal = macd_config.get('signal', 9)
 
-            df['macd'] = self.fi.macd(df['close'], window_fast=fast, window_slow=slow)
-            df['macd_signal'] = self.fi.macd_signal(
-                df['close'], window_fast=fast, window_slow=slow, window_sign=signal
+            columns['macd'] = self.fi.macd(close, window_fast=fast, window_slow=slow)
+            columns['macd_signal'] = self.fi.macd_signal(
+                close, window_fast=fast, window_slow=slow, window_sign=signal
             )
-            df['macd_diff'] = self.fi.macd_diff(
-                df['close'], window_fast=fast, window_slow=slow, window_sign=signal
+            columns['macd_diff'] = self.fi.macd_diff(
+                close, window_fast=fast, window_slow=slow, window_sign=signal
             )
 
         # ADX
         if 'adx_period' in tech_config:
             period = tech_config['adx_period']
-            df['adx'] = self.fi.adx(df['high'], df['low'], df['close'], window=period)
+            columns['adx'] = self.fi.adx(data['high'], data['low'], close, window=period)
 
         # Momentum indicators
         if 'rsi_period' in tech_config:
             period = tech_config['rsi_period']
-            df['rsi'] = self.fi.rsi(df['close'], window=period)
+            columns['rsi'] = self.fi.rsi(close, window=period)
 
         if 'stoch_period' in tech_config:
             period = tech_config['stoch_period']
-            df['stoch'] = self.fi.stoch(df['high'], df['low'], df['close'], window=period)
-            df['stoch_signal'] = self.fi.stoch_signal(df['high'], df['low'], df['close'], window=period)
+            columns['stoch'] = self.fi.stoch(data['high'], data['low'], close, window=period)
+            columns['stoch_signal'] = self.fi.stoch_signal(data['high'], data['low'], close, window=period)
 
         # Volatility indicators
         if 'bollinger' in tech_config:
@@ -82,31 +146,35 @@ class FeatureEngineer:
             period = bb_config.get('period', 20)
             std_dev = bb_config.get('std_dev', 2)
 
-            df['bb_upper'] = self.fi.bollinger_hband(df['close'], window=period, window_dev=std_dev)
-            df['bb_lower'] = self.fi.bollinger_lband(df['close'], window=period, window_dev=std_dev)
-            df['bb_width'] = (df['bb_upper'] - df['bb_lower']) / df['close']
-            df['bb_position'] = (df['close'] - df['bb_lower']) / (df['bb_upper'] - df['bb_lower'])
+            upper = self.fi.bollinger_hband(close, window=period, window_dev=std_dev)
+            lower = self.fi.bollinger_lband(close, window=period, window_dev=std_dev)
+            columns['bb_upper'] = upper
+            columns['bb_lower'] = lower
+            columns['bb_width'] = (upper - lower) / close
+            columns['bb_position'] = (close - lower) / (upper - lower)
 
         if 'atr_period' in tech_config:
             period = tech_config['atr_period']
-            df['atr'] = self.fi.atr(df['high'], df['low'], df['close'], window=period)
-            df['atr_ratio'] = df['atr'] / df['close']
+            atr = self.fi.atr(data['high'], data['low'], close, window=period)
+            columns['atr'] = atr
+            columns['atr_ratio'] = atr / close
 
         # Volume indicators
-        if 'mfi_period' in tech_config and 'volume' in df.columns:
+        if 'mfi_period' in tech_config and 'volume' in data.columns:
             period = tech_config['mfi_period']
-            df['mfi'] = self.fi.mfi(df['high'], df['low'], df['close'], df['volume'], window=period)
+            columns['mfi'] = self.fi.mfi(data['high'], data['low'], close, data['volume'], window=period)
 
-        if 'vwap_period' in tech_config and 'volume' in df.columns:
+        if 'vwap_period' in tech_config and 'volume' in data.columns:
             period = tech_config['vwap_period']
-            df['vwap'] = self.fi.vwap(df['high'], df['low'], df['close'], df['volume'], window=period)
-            df['vwap_ratio'] = df['close'] / df['vwap']
+            vwap = self.fi.vwap(data['high'], data['low'], close, data['volume'], window=period)
+            columns['vwap'] = vwap
+            columns['vwap_ratio'] = close / vwap
 
         # OBV
-        if 'volume' in df.columns:
-            df['obv'] = self.fi.obv(df['close'], df['volume'])
+        if 'volume' in data.columns:
+            columns['obv'] = self.fi.obv(close, data['volume'])
 
-        return df
+        return columns
 
     def add_price_features(
         self, 
@@ -122,7 +190,24 @@ class FeatureEngineer:
         Returns:
             DataFrame with price features added
         """
-        df = data.copy()
+        return _with_columns(data, self.price_feature_columns(data, config))
+
+    def price_feature_columns(
+        self,
+        data: pd.DataFrame,
+        config: Dict[str, Any]
+    ) -> Dict[str, Any]:
+        """Compute price-based features without touching data
+
+        Args:
+            data: DataFrame with price data
+            config: Feature configuration
+
+        Returns:
+            Feature name to values mapping, in column order
+        """
+        columns = {}
+        close = data['close']
 
         # Get price features config
         price_config = config.get('features', {}).get('price_features', {})
@@ -130,36 +215,41 @@ class FeatureEngineer:
         # Returns
         if 'returns_periods' in price_config:
             for period in price_config['returns_periods']:
-                df[f'return_{period}d'] = df['close'].pct_change(periods=period)
+                columns[f'return_{period}d'] = close.pct_change(periods=period)
 
         # Volatility
         if 'volatility_window' in price_config:
             window = price_config['volatility_window']
-            returns = df['close'].pct_change()
-            df['volatility'] = returns.rolling(window=window).std()
-            df['volatility_of_volatility'] = df['volatility'].rolling(window=window).std()
+            returns = close.pct_change()
+            volatility = returns.rolling(window=window).std()
+            columns['volatility'] = volatility
+            columns['volatility_of_volatility'] = volatility.rolling(window=window).std()
 
         # Volume features
-        if 'volume_ratio_window' in price_config and 'volume' in df.columns:
+        if 'volume_ratio_window' in price_config and 'volume' in data.columns:
             window = price_config['volume_ratio_window']
-            df['volume_sma'] = df['volume'].rolling(window=window).mean()
-            df['volume_ratio'] = df['volume'] / df['volume_sma']
-            df['volume_zscore'] = (df['volume'] - df['volume_sma']) / df['volume'].rolling(window=window).std()
+            volume = data['volume']
+            volume_sma = volume.rolling(window=window).mean()
+            columns['volume_sma'] = volume_sma
+            columns['volume_ratio'] = volume / volume_sma
+            columns['volume_zscore'] = (volume - volume_sma) / volume.rolling(window=window).std()
 
         # Active trading features (BU/SD from FiinQuantX)
-        if 'bu' in df.columns and 'sd' in df.columns:
-            df['bu_sd_ratio'] = df['bu'] / (df['sd'] + 1e-8)  # Avoid division by zero
-            df['net_active_volume'] = df['bu'] - df['sd']
-            df['active_volume_ratio'] = (df['bu'] - df['sd']) / (df['bu'] + df['sd'] + 1e-8)
+        if 'bu' in data.columns and 'sd' in data.columns:
+            bu, sd = data['bu'], data['sd']
+            columns['bu_sd_ratio'] = bu / (sd + 1e-8)  # Avoid division by zero
+            columns['net_active_volume'] = bu - sd
+            columns['active_volume_ratio'] = (bu - sd) / (bu + sd + 1e-8)
 
         # Price action features
-        df['high_low_ratio'] = (df['high'] - df['low']) / df['close']
-        df['close_open_ratio'] = (df['close'] - df['open']) / df['open']
+        columns['high_low_ratio'] = (data['high'] - data['low']) / close
+        columns['close_open_ratio'] = (close - data['open']) / data['open']
 
         # Gap features
-        df['gap'] = (df['open'] - df['close'].shift(1)) / df['close'].shift(1)
+        prev_close = close.shift(1)
+        columns['gap'] = (data['open'] - prev_close) / prev_close
 
-        return df
+        return columns
 
     def add_regime_features(
         self,
@@ -175,7 +265,24 @@ class FeatureEngineer:
         Returns:
             DataFrame with regime features added
         """
-        df = data.copy()
+        return _with_columns(data, self.regime_feature_columns(data, config))
+
+    def regime_feature_columns(
+        self,
+        data: pd.DataFrame,
+        config: Dict[str, Any]
+    ) -> Dict[str, Any]:
+        """Compute market regime features without touching data
+
+        Args:
+            data: DataFrame with price data
+            config: Feature configuration
+
+        Returns:
+            Feature name to values mapping, in column order
+        """
+        columns = {}
+        close = data['close']
 
         # Get regime features config
         regime_config = config.get('features', {}).get('regime_features', {})
@@ -183,23 +290,37 @@ class FeatureEngineer:
         # Trend regime
         if 'trend_window' in regime_config:
             window = regime_config['trend_window']
-            df['trend_sma'] = df['close'].rolling(window=window).mean()
-            df['above_trend'] = (df['close'] > df['trend_sma']).astype(int)
+            trend_sma = close.rolling(window=window).mean()
+            columns['trend_sma'] = trend_sma
+            columns['above_trend'] = (close > trend_sma).astype(int)
 
         # Volatility regime
         if 'volatility_regime_window' in regime_config:
             window = regime_config['volatility_regime_window']
-            returns = df['close'].pct_change()
+            returns = close.pct_change()
             rolling_vol = returns.rolling(window=window).std()
-            vol_quantiles = rolling_vol.quantile([0.33, 0.67])
-
-            df['vol_regime'] = pd.cut(
-                rolling_vol, 
-                bins=[-np.inf, vol_quantiles.iloc[0], vol_quantiles.iloc[1], np.inf],
-                labels=[0, 1, 2]  # 0: low vol, 1: medium vol, 2: high vol
-            ).astype(float)
-
-        return df
+            settings = regime_settings(regime_config)
+
+            if settings['mode'] == 'causal' and settings['scope'] == 'ticker':
+                # Terciles of the ticker's earlier bars only
+                columns['vol_regime'] = pd.Series(causal_regime(
+                    rolling_vol.to_numpy(dtype=np.float64, na_value=np.nan),
+                    relative_accuracy=settings['relative_accuracy'],
+                    min_periods=settings['min_periods'],
+                ), index=close.index)
+            elif settings['mode'] == 'causal':
+                # Binned across tickers once all are computed (see engineer_features)
+                columns['vol_regime'] = rolling_vol
+            else:
+                vol_quantiles = rolling_vol.quantile([0.33, 0.67])
+
+                columns['vol_regime'] = pd.cut(
+                    rolling_vol, 
+                    bins=[-np.inf, vol_quantiles.iloc[0], vol_quantiles.iloc[1], np.inf],
+                    labels=[0, 1, 2]  # 0: low vol, 1: medium vol, 2: high vol
+                ).astype(float)
+
+        return columns
 
     def add_momentum_features(self, data: pd.DataFrame) -> pd.DataFrame:
         """Add additional momentum features
@@ -210,72 +331,426 @@ class FeatureEngineer:
         Returns:
             DataFrame with momentum features added
         """
-        df = data.copy()
+        return _with_columns(data, self.momentum_feature_columns(data))
+
+    def momentum_feature_columns(
+        self,
+        data: pd.DataFrame,
+        config: Dict[str, Any] = None
+    ) -> Dict[str, Any]:
+        """Compute additional momentum features without touching data
+
+        Args:
+            data: DataFrame with price data
+            config: Unused, accepted for a uniform stage signature
+
+        Returns:
+            Feature name to values mapping, in column order
+        """
+        columns = {}
+        close = data['close']
 
         # Rate of change
-        for period in [5, 10, 20]:
-            df[f'roc_{period}'] = ((df['close'] - df['close'].shift(period)) / df['close'].shift(period)) * 100
+        for period in MOMENTUM_PERIODS:
+            prev = close.shift(period)
+            columns[f'roc_{period}'] = ((close - prev) / prev) * 100
 
         # Cumulative returns
-        for period in [5, 10, 20]:
-            df[f'cum_return_{period}d'] = (df['close'] / df['close'].shift(period) - 1) * 100
+        for period in MOMENTUM_PERIODS:
+            columns[f'cum_return_{period}d'] = (close / close.shift(period) - 1) * 100
 
-        # Price percentile rank
-        for window in [20, 50]:
-            df[f'price_rank_{window}d'] = df['close'].rolling(window=window).rank(pct=True)
+        # Price percentile rank (same values as close.rolling(window).rank(pct=True))
+        for window in RANK_WINDOWS:
+            columns[f'price_rank_{window}d'] = pd.Series(
+                rolling_rank_pct(close.to_numpy(dtype=np.float64, na_value=np.nan), window), index=close.index
+            )
 
-        return df
+        return columns
 
     def engineer_features(
         self,
         data: pd.DataFrame,
-        config: Dict[str, Any]
+        config: Dict[str, Any],
+        n_workers: Optional[int] = None,
+        features: Optional[Iterable[str]] = None
     ) -> pd.DataFrame:
         """Complete feature engineering pipeline
 
+        With a feature store, feature blocks already computed for the same
+        bars and indicator spec are read back and only the missing ones are
+        computed (see ``engineer_stored_features``). With several workers,
+        tickers are split across a process pool (see
+        ``engineer_features_parallel``); the result is identical.
+
+        Given a feature list (e.g. a model's input columns, see
+        ``model_feature_names`` and ``important_features``), only the
+        indicators those features are built from are computed.
+
         Args:
             data: Raw data with OHLC
             config: Feature configuration
+            n_workers: Worker processes, None for the engineer's default
+            features: Features to return, None for every configured feature;
+                names of input columns are accepted and ignored
 
         Returns:
-            DataFrame with all features
+            DataFrame with all (or the requested) features
         """
+        n_workers = self.n_workers if n_workers is None else n_workers
+        columns = None
+        if features is not None:
+            features = list(features)
+            blocks = select_blocks(feature_blocks(config, data.columns), features)
+            config = blocks_config(blocks)
+            columns = [col for block in blocks for col in block.columns]
+            unknown = [name for name in features if name not in columns and name not in data.columns]
+            if unknown:
+                logger.warning(f"Requested features not produced by the config: {unknown}")
+            logger.info(f"Pruned feature engineering: {len(blocks)} indicator blocks "
+                        f"for {len(features)} requested features")
+
+        if 'ticker' in data.columns and self.feature_store is not None:
+            result = self.engineer_stored_features(data, config, n_workers, columns)
+        else:
+            result = self.compute_features(data, config, columns, n_workers)
+        result = self.universe_vol_regime(result, config)
 
-        def process_ticker_data(df):
-            """Process features for single ticker"""
-            try:
-                # Add technical indicators
-                df = df.reset_index(drop=True)   
-                df = self.add_technical_indicators(df, config)
+        if features is not None:
+            # Dependencies (and features computed alongside) are not returned
+            wanted = set(features)
+            result = result.drop(columns=[col for col in result.columns
+                                          if col not in data.columns and col not in wanted])
 
-                # Add price features
-                df = self.add_price_features(df, config)
+        # Log feature summary
+        original_cols = len(data.columns)
+        new_cols = len(result.columns)
+        logger.info(f"Feature engineering complete: {original_cols} -> {new_cols} columns")
+
+        return apply_schema(result)
+
+    def compute_features(
+        self,
+        data: pd.DataFrame,
+        config: Dict[str, Any],
+        columns: Optional[List[str]] = None,
+        n_workers: int = 1
+    ) -> pd.DataFrame:
+        """Compute features with the configured engine, before the schema cast
 
-                # Add regime features
-                df = self.add_regime_features(df, config)
+        Args:
+            data: Raw data with OHLC
+            config: Feature configuration
+            columns: Features needed by the caller, None for all; the panel
+                engine skips the others, the per-ticker engine skips stages
+                without any of them
+            n_workers: Worker processes used for multi-ticker data
 
-                # Add momentum features
-                df = self.add_momentum_features(df)
+        Returns:
+            DataFrame with features, in groupby order for multi-ticker data
+        """
+        stages = {
+            'technical': self.technical_indicator_columns,
+            'price': self.price_feature_columns,
+            'regime': self.regime_feature_columns,
+            'momentum': self.momentum_feature_columns,
+        }
+        if columns is not None:
+            wanted = set(columns)
+            needed = {block.stage for block in feature_blocks(config, data.columns) if wanted & set(block.columns)}
+            stages = {name: stage for name, stage in stages.items() if name in needed}
 
-                return df
+        def process_ticker_data(df):
+            """Process features for single ticker"""
+            df = df.reset_index(drop=True)
+            columns = {}
+            try:
+                # Technical indicators, price, regime and momentum features;
+                # a failing stage keeps the columns of the stages before it
+                for stage in stages.values():
+                    columns.update(stage(df, config))
             except Exception as e:
                 logger.error(f"Error processing ticker data: {e}")
-                return df
 
-        if 'ticker' in data.columns:
-            # Process by ticker
-            result = data.groupby('ticker', group_keys=False).apply(process_ticker_data)
+            # Build the ticker's frame once, features already in compact dtypes
+            return pd.concat([df, feature_frame(columns, df.index)], axis=1, copy=False)
+
+        if 'ticker' in data.columns and n_workers > 1 and data['ticker'].nunique() > 1:
+            if self.indicator_backend == 'fiin' and self.engine == 'per_ticker':
+                # The SDK client cannot be shared with worker processes
+                logger.warning("Parallel feature engineering needs the local indicator backend, running serially")
+            else:
+                return engineer_features_parallel(data, config, n_workers, self.engine, columns)
+
+        if 'ticker' in data.columns and self.engine == 'panel':
+            # All tickers at once on a ticker x time panel
+            return self.engineer_panel_features(data, config, columns)
+        elif 'ticker' in data.columns:
+            # Indicators by ticker, the other stages through the feature plan
+            return self.engineer_ticker_features(data, config, list(stages))
         else:
             # Single ticker
-            result = process_ticker_data(data)
+            return process_ticker_data(data)
 
-        # Log feature summary
-        original_cols = len(data.columns)
-        new_cols = len(result.columns)
-        logger.info(f"Feature engineering complete: {original_cols} -> {new_cols} columns")
+    def universe_vol_regime(self, result: pd.DataFrame, config: Dict[str, Any]) -> pd.DataFrame:
+        """Bin rolling volatility on thresholds pooled across tickers
+
+        With ``volatility_regime_scope: universe`` (causal mode), the engines
+        leave each ticker's rolling volatility in ``vol_regime``; every bar is
+        then binned against the merged sketch of all tickers' bars on earlier
+        dates. Other settings return result unchanged.
+
+        Args:
+            result: Computed features
+            config: Feature configuration
 
+        Returns:
+            DataFrame with vol_regime binned
+        """
+        settings = regime_settings(config.get('features', {}).get('regime_features', {}))
+        if settings['mode'] != 'causal' or settings['scope'] != 'universe' or 'vol_regime' not in result:
+            return result
+
+        rolling_vol = result['vol_regime'].to_numpy(dtype=np.float64, na_value=np.nan)
+        timestamps = result['timestamp'] if 'timestamp' in result else np.arange(len(result))
+        result['vol_regime'] = causal_regime_frame(rolling_vol, timestamps, settings['relative_accuracy'],
+                                                   settings['min_periods'])
         return result
 
+    def engineer_stored_features(
+        self,
+        data: pd.DataFrame,
+        config: Dict[str, Any],
+        n_workers: int = 1,
+        columns: Optional[List[str]] = None
+    ) -> pd.DataFrame:
+        """Serve feature blocks from the feature store, computing missing ones
+
+        Each ticker's bars are fingerprinted; blocks stored under that
+        fingerprint and the block's key (indicator spec, backend) are read
+        back, and tickers are grouped by their set of missing blocks so each
+        group is computed once with a config reduced to those blocks. Newly
+        computed blocks are written back to the store, except blocks with
+        no value at all for the ticker.
+
+        Args:
+            data: Raw data with ticker, timestamp and OHLC columns
+            config: Feature configuration
+            n_workers: Worker processes used for the missing blocks
+            columns: Features needed by the caller, None for all
+
+        Returns:
+            DataFrame with all features, in groupby order, before the schema cast
+        """
+        store = self.feature_store
+        raw_cols = [col for col in ('timestamp', 'open', 'high', 'low', 'close', 'volume', 'bu', 'sd')
+                    if col in data.columns]
+        panel = Panel(data, columns=[])
+        base = panel.to_long()
+
+        blocks = feature_blocks(config, data.columns)
+        if columns is not None:
+            blocks = select_blocks(blocks, columns)
+        by_name = {block.name: block for block in blocks}
+        backend = 'local' if self.engine == 'panel' else self.indicator_backend
+        keys = {block.name: block_key(block, by_name, backend) for block in blocks}
+
+        # Fingerprint each ticker's bars and look up its stored blocks
+        raw = {col: base[col].to_numpy() for col in raw_cols}
+        bounds = np.concatenate([[0], np.cumsum(panel.lengths)])
+        fingerprints, values = {}, {}
+        missing_groups: Dict[tuple, List[str]] = {}
+        for i, ticker in enumerate(panel.tickers):
+            rows = slice(bounds[i], bounds[i + 1])
+            fingerprints[ticker] = data_fingerprint({col: arr[rows] for col, arr in raw.items()})
+            values[ticker] = store.read(ticker, fingerprints[ticker], keys.values())
+            missing = tuple(block.name for block in blocks if keys[block.name] not in values[ticker])
+            if missing:
+                missing_groups.setdefault(missing, []).append(ticker)
+            store.stats['hits'] += len(values[ticker])
+            store.stats['misses'] += len(missing)
+
+        n_missing = sum(len(names) * len(tickers) for names, tickers in missing_groups.items())
+        logger.info(f"Feature store: {len(blocks) * len(panel.tickers) - n_missing} blocks cached, "
+                    f"{n_missing} to compute in {len(missing_groups)} ticker groups")
+
+        for names, tickers in missing_groups.items():
+            needed = [by_name[name] for name in names]
+            # Dependencies are recomputed alongside, so failures propagate as in a full run
+            depends = [by_name[dep] for dep in dict.fromkeys(dep for block in needed for dep in block.depends)
+                       if dep not in names]
+            columns = [col for block in needed + depends for col in block.columns]
+            result = self.compute_features(data[data['ticker'].isin(tickers)],
+                                           blocks_config(needed + depends), columns, n_workers)
+
+            for ticker, positions in result.groupby('ticker', observed=True, sort=False).indices.items():
+                # Features a failed ticker never produced are missing
+                computed = {
+                    keys[block.name]: {
+                        col: (result[col].to_numpy()[positions] if col in result.columns
+                              else np.full(len(positions), np.nan, dtype=FLOAT_DTYPE))
+                        for col in block.columns
+                    }
+                    for block in needed
+                }
+                # Blocks left all missing (e.g. by a failed stage) are not stored,
+                # so later runs compute them again instead of serving NaNs
+                stored = {key: block for key, block in computed.items()
+                          if not all(pd.isna(col_values).all() for col_values in block.values())}
+                if len(stored) < len(computed):
+                    logger.warning(f"Feature store: not storing {len(computed) - len(stored)} "
+                                   f"all-missing blocks of {ticker}")
+                if stored:
+                    store.write(ticker, fingerprints[ticker], stored)
+                values[ticker].update(computed)
+
+        # Assemble every feature across tickers in groupby order
+        features = {
+            col: np.concatenate([values[ticker][keys[block.name]][col] for ticker in panel.tickers])
+            for block in blocks for col in block.columns
+        }
+        return pd.concat([base, feature_frame(features, base.index)], axis=1, copy=False)
+
+    def engineer_panel_features(
+        self,
+        data: pd.DataFrame,
+        config: Dict[str, Any],
+        columns: Optional[List[str]] = None
+    ) -> pd.DataFrame:
+        """Compute all features on a ticker x time panel
+
+        Produces the same columns, in the same order, as the per-ticker
+        pipeline with the local backend, but each feature is a single
+        vectorized call over every ticker, evaluated through a feature plan
+        that shares intermediates between features. Per-op timings of the
+        last run are kept in ``plan_timings``. Tickers whose full-sample
+        volatility regime bins cannot be built get NaN regime and momentum
+        features (see ``_drop_failed_regimes``).
+
+        Args:
+            data: Raw data with ticker, timestamp and OHLC columns
+            config: Feature configuration
+            columns: Features to compute, None for all
+
+        Returns:
+            DataFrame with all features, in groupby order
+        """
+        packed_cols = [col for col in ('open', 'high', 'low', 'close', 'volume', 'bu', 'sd')
+                       if col in data.columns]
+        panel = Panel(data, columns=packed_cols)
+
+        # Each primitive (returns, shifts, rolling stats, EMAs, ...) is computed
+        # once and shared by every feature derived from it
+        plan = build_feature_plan(config, {col: data[col].dtype for col in packed_cols})
+        if columns is not None:
+            plan.select(columns)
+        features = plan.execute({**panel.values, 'lengths': panel.lengths, 'valid': panel.valid})
+        self.plan_timings = plan.timings
+        logger.info(f"Feature plan: {plan.summary()}")
+        for timing in sorted(plan.timings, key=lambda t: t['seconds'], reverse=True):
+            logger.debug(f"  {timing['seconds'] * 1e3:8.1f} ms  x{timing['consumers']}  {timing['node']}")
+
+        dtypes = {name: spec['dtype'] for name, spec in plan.outputs.items() if spec['dtype']}
+        self._drop_failed_regimes(features, dtypes, plan, panel.tickers, config)
+        return panel.to_long(features, dtypes)
+
+    def engineer_ticker_features(
+        self,
+        data: pd.DataFrame,
+        config: Dict[str, Any],
+        stages: List[str]
+    ) -> pd.DataFrame:
+        """Compute features ticker by ticker, sharing the non-indicator stages
+
+        Technical indicators need the configured backend, so they are still
+        computed one ticker at a time. The price, regime and momentum stages
+        are evaluated once for every ticker through the feature plan, which
+        computes shared intermediates (returns, shifts, rolling stats) once
+        instead of once per stage; their values are those of the stage
+        methods. A ticker whose indicators fail gets no later-stage features,
+        as when all stages ran per ticker.
+
+        Args:
+            data: Raw data with ticker, timestamp and OHLC columns
+            config: Feature configuration
+            stages: Stages to compute, among technical, price, regime and momentum
+
+        Returns:
+            DataFrame with the features of those stages, in groupby order
+        """
+        packed_cols = [col for col in ('open', 'high', 'low', 'close', 'volume', 'bu', 'sd')
+                       if col in data.columns]
+        panel = Panel(data, columns=packed_cols)
+        failed = np.zeros(len(panel.tickers), dtype=bool)
+
+        if 'technical' in stages:
+            def process_ticker_data(df):
+                """Technical indicators of a single ticker"""
+                ticker = df.name
+                df = df.reset_index(drop=True)
+                try:
+                    columns = self.technical_indicator_columns(df, config)
+                except Exception as e:
+                    logger.error(f"Error processing ticker data: {e}")
+                    failed[panel.tickers.get_loc(ticker)] = True
+                    columns = {}
+                return pd.concat([df, feature_frame(columns, df.index)], axis=1, copy=False)
+
+            result = data.groupby('ticker', group_keys=False, observed=True).apply(process_ticker_data)
+        else:
+            result = panel.to_long()
+
+        plan = build_feature_plan(config, {col: data[col].dtype for col in packed_cols})
+        plan.select(name for name, spec in plan.outputs.items()
+                    if spec['stage'] != 'technical' and spec['stage'] in stages)
+        if not plan.outputs or failed.all():
+            return result
+        features = plan.execute({**panel.values, 'lengths': panel.lengths, 'valid': panel.valid})
+
+        dtypes = {name: spec['dtype'] for name, spec in plan.outputs.items() if spec['dtype']}
+        self._drop_failed_regimes(features, dtypes, plan, panel.tickers, config)
+        if failed.any():
+            for name in plan.outputs:
+                features[name] = np.where(failed, np.nan, features[name])
+                dtypes.pop(name, None)
+
+        columns = {name: panel.unpack(values).astype(dtypes.get(name, FLOAT_DTYPE))
+                   for name, values in features.items()}
+        return pd.concat([result, feature_frame(columns, result.index)], axis=1, copy=False)
+
+    @staticmethod
+    def _drop_failed_regimes(
+        features: Dict[str, np.ndarray],
+        dtypes: Dict[str, Any],
+        plan: FeaturePlan,
+        tickers: pd.Index,
+        config: Dict[str, Any]
+    ) -> None:
+        """NaN the regime and momentum features of tickers without volatility bins
+
+        Full-sample volatility regime bins cannot be built for a ticker whose
+        volatility is constant or missing; such tickers lose their regime and
+        momentum features, like a ticker whose per-ticker processing failed at
+        that step. Arrays and dtypes are updated in place.
+
+        Args:
+            features: Executed plan outputs, packed (rows x tickers)
+            dtypes: Output dtypes; dropped for the NaN-filled features
+            plan: Plan that produced the features
+            tickers: Tickers of the packed columns
+            config: Feature configuration
+        """
+        full_sample = regime_settings(config.get('features', {}).get('regime_features', {}))['mode'] == 'full_sample'
+        if 'vol_regime' not in features or not full_sample:
+            return
+        failed = np.all(np.isnan(features['vol_regime']), axis=0)
+        if failed.any():
+            for ticker in tickers[failed]:
+                logger.error(f"Error processing ticker data: volatility regime bins are not unique for {ticker}")
+            for name, spec in plan.outputs.items():
+                if spec['stage'] in ('regime', 'momentum'):
+                    features[name] = np.where(failed, np.nan, features[name])
+                    dtypes.pop(name, None)
+
     def get_feature_list(self, data: pd.DataFrame) -> List[str]:
         """Get list of feature columns (excluding target and metadata)
 
@@ -296,13 +771,59 @@ class FeatureEngineer:
         return feature_cols
 
 
-def create_feature_engineer(client) -> FeatureEngineer:
+def model_feature_names(model: Any) -> Optional[List[str]]:
+    """Input feature names of a fitted model or scaler
+
+    Args:
+        model: Fitted scikit-learn style estimator, XGBoost model or booster
+
+    Returns:
+        Feature names in model input order, None if the model does not record them
+    """
+    names = getattr(model, 'feature_names_in_', None)
+    if names is None and hasattr(model, 'get_booster'):
+        names = model.get_booster().feature_names
+    if names is None:
+        names = getattr(model, 'feature_names', None)
+    return list(names) if names is not None else None
+
+
+def important_features(
+    importance_path: str = "results/feature_importance.csv",
+    min_importance: float = 0.0
+) -> List[str]:
+    """Features whose importance is above a threshold
+
+    Args:
+        importance_path: CSV with feature and importance columns, as saved by
+            the training pipeline
+        min_importance: Features at or below this importance are dropped
+
+    Returns:
+        Feature names, most important first
+    """
+    importance = pd.read_csv(importance_path)
+    kept = importance[importance['importance'] > min_importance]
+    logger.info(f"Keeping {len(kept)} of {len(importance)} features with importance > {min_importance}")
+    return kept.sort_values('importance', ascending=False)['feature'].tolist()
+
+
+def create_feature_engineer(client, config: Dict[str, Any] = None) -> FeatureEngineer:
     """Create FeatureEngineer instance
 
     Args:
         client: Authenticated FiinQuantX client
+        config: Configuration with features.indicator_backend, features.engine,
+            features.store and features.n_workers
 
     Returns:
         FeatureEngineer instance
     """
-    return FeatureEngineer(client)
+    features_config = (config or {}).get('features', {})
+    return FeatureEngineer(
+        client,
+        indicator_backend=features_config.get('indicator_backend', 'fiin'),
+        engine=features_config.get('engine', 'per_ticker'),
+        feature_store=create_feature_store(config),
+        n_workers=features_config.get('n_workers', 1)
+    )
@@ -0,0 +1,498 @@
+"""Feature planner: the features config as a DAG of shared primitive ops
+
+Every feature is described as a chain of primitive ops (shift, pct_change,
+rolling mean/std, EMA, ...) over source columns. Nodes are keyed by op,
+inputs and parameters, so an intermediate requested by several features
+(e.g. ``pct_change(close, 1)`` for return_1d, volatility and vol_regime, or
+``shift(close, p)`` for roc_p and cum_return_pd) is computed once.
+
+Ops keep the exact formula of the feature they came from, so planned
+features are bit-identical to the per-ticker pipeline; pandas rolling
+aggregations are separate ops from the NumPy kernels for that reason.
+Plans run on the packed (rows x tickers) arrays of ``Panel``.
+"""
+
+import time
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from . import indicators
+from .quantile_sketch import causal_regime, regime_settings
+
+# Momentum feature horizons (rate of change / cumulative return, price rank)
+MOMENTUM_PERIODS = [5, 10, 20]
+RANK_WINDOWS = [20, 50]
+
+
+def _pandas_rolling(x: np.ndarray, window: int):
+    """pandas rolling window over every column of a packed array"""
+    return pd.DataFrame(x, copy=False).rolling(window=window)
+
+
+def _mask_short(x: np.ndarray, lengths: np.ndarray, min_length: int) -> np.ndarray:
+    """NaN out the columns of tickers with fewer than min_length bars"""
+    out = x.copy()
+    out[..., lengths < min_length] = np.nan
+    return out
+
+
+def _vol_regime(rolling_vol: np.ndarray, valid: np.ndarray) -> np.ndarray:
+    """Per-ticker tercile of rolling volatility (right-closed bins, like pd.cut)
+
+    Tickers whose 33%/67% quantiles do not give unique bin edges get an
+    all-NaN column, where pd.cut would raise.
+    """
+    rolling_vol = np.where(valid, rolling_vol, np.nan)
+    regime = np.full(rolling_vol.shape, np.nan)
+    has_vol = ~np.all(np.isnan(rolling_vol), axis=0)
+    if has_vol.any():
+        low_q, high_q = np.nanquantile(rolling_vol[:, has_vol], [0.33, 0.67], axis=0)
+        usable = np.isfinite(low_q) & np.isfinite(high_q) & (low_q < high_q)
+        cols = np.flatnonzero(has_vol)[usable]
+        vol = rolling_vol[:, cols]
+        bins = np.where(vol <= low_q[usable], 0.0, np.where(vol <= high_q[usable], 1.0, 2.0))
+        regime[:, cols] = np.where(np.isnan(vol), np.nan, bins)
+    return regime
+
+
+def _causal_vol_regime(rolling_vol: np.ndarray, valid: np.ndarray, relative_accuracy: float,
+                       min_periods: int) -> np.ndarray:
+    """Per-ticker expanding-sketch tercile of rolling volatility (see ``causal_regime``)"""
+    rolling_vol = np.where(valid, rolling_vol, np.nan)
+    regime = np.full(rolling_vol.shape, np.nan)
+    for col in range(rolling_vol.shape[1]):
+        regime[:, col] = causal_regime(rolling_vol[:, col], relative_accuracy=relative_accuracy,
+                                       min_periods=min_periods)
+    return regime
+
+
+# Primitive ops: name -> callable(*input arrays, **params)
+OPS: Dict[str, Callable[..., np.ndarray]] = {
+    'shift': indicators.shift,
+    'ffill': indicators.ffill,
+    'growth': lambda x, prev: x / prev - 1,
+    'ema': indicators.ema,
+    'rolling_mean': indicators.rolling_mean,
+    'rolling_std': indicators.rolling_std,
+    'rolling_rank_pct': indicators.rolling_rank_pct,
+    'pandas_rolling_mean': lambda x, window: _pandas_rolling(x, window).mean().to_numpy(),
+    'pandas_rolling_std': lambda x, window: _pandas_rolling(x, window).std().to_numpy(),
+    'rsi': indicators.rsi,
+    'stoch': indicators.stoch,
+    'atr': indicators.atr,
+    'adx': indicators.adx,
+    'typical_price': indicators.typical_price,
+    'mfi': indicators.money_flow_index,
+    'vwap': indicators.rolling_vwap,
+    'obv': indicators.obv,
+    'vol_regime': _vol_regime,
+    'causal_vol_regime': _causal_vol_regime,
+    'mask_short': _mask_short,
+    'add': lambda a, b: a + b,
+    'sub': lambda a, b: a - b,
+    'div': lambda a, b: a / b,
+    'band': lambda mean, std, width: mean + width * std,
+    'spread_ratio': lambda a, b, c: (a - b) / c,
+    'position': lambda x, lower, upper: (x - lower) / (upper - lower),
+    'safe_div': lambda a, b: a / (b + 1e-8),
+    'greater': lambda a, b: (a > b).astype(np.float64),
+    'roc': lambda x, prev: ((x - prev) / prev) * 100,
+    'cum_return': lambda x, prev: (x / prev - 1) * 100,
+}
+
+Key = Tuple
+
+
+class FeaturePlan:
+    """DAG of primitive ops with named feature outputs"""
+
+    def __init__(self):
+        self.nodes: Dict[Key, Tuple[str, Tuple[Key, ...], Dict[str, Any]]] = {}
+        self.outputs: Dict[str, Dict[str, Any]] = {}
+        self.requests = 0
+        self.timings: List[Dict[str, Any]] = []
+
+    def source(self, column: str) -> Key:
+        """Node of a source array (packed column or panel metadata)"""
+        key = ('source', column)
+        self.nodes.setdefault(key, ('source', (), {}))
+        return key
+
+    def add(self, op: str, *inputs: Key, **params) -> Key:
+        """Node applying op to inputs, shared with any identical request"""
+        if op not in OPS:
+            raise ValueError(f"Unknown feature op: {op}")
+        self.requests += 1
+        key = (op, inputs, tuple(sorted(params.items())))
+        self.nodes.setdefault(key, (op, inputs, params))
+        return key
+
+    def output(self, name: str, key: Key, stage: str, dtype: Optional[str] = None) -> None:
+        """Expose a node as a feature column"""
+        self.outputs[name] = {'key': key, 'stage': stage, 'dtype': dtype}
+
+    def select(self, names: Iterable[str]) -> None:
+        """Keep only the given outputs and the nodes they depend on"""
+        names = set(names)
+        self.outputs = {name: spec for name, spec in self.outputs.items() if name in names}
+        needed = set()
+        stack = [spec['key'] for spec in self.outputs.values()]
+        while stack:
+            key = stack.pop()
+            if key not in needed:
+                needed.add(key)
+                stack.extend(self.nodes[key][1])
+        self.nodes = {key: node for key, node in self.nodes.items() if key in needed}
+
+    def label(self, key: Key) -> str:
+        """Readable expression of a node"""
+        op, inputs, params = self.nodes[key]
+        if op == 'source':
+            return key[1]
+        args = [self.label(k) for k in inputs] + [f"{k}={v}" for k, v in sorted(params.items())]
+        return f"{op}({', '.join(args)})"
+
+    def execute(self, sources: Dict[str, np.ndarray]) -> Dict[str, np.ndarray]:
+        """Compute every node once, in dependency order, and return the outputs
+
+        Intermediates are released after their last consumer. Per-node wall
+        times are kept in ``timings``.
+
+        Args:
+            sources: Arrays of the source nodes
+
+        Returns:
+            Feature name to array mapping, in output order
+        """
+        output_keys = [spec['key'] for spec in self.outputs.values()]
+        last_use, consumers = {}, {}
+        for position, (_, inputs, _) in enumerate(self.nodes.values()):
+            for key in inputs:
+                last_use[key] = position
+                consumers[key] = consumers.get(key, 0) + 1
+        for key in output_keys:
+            consumers[key] = consumers.get(key, 0) + 1
+
+        values: Dict[Key, np.ndarray] = {}
+        self.timings = []
+        with np.errstate(divide='ignore', invalid='ignore'):
+            for position, (key, (op, inputs, params)) in enumerate(self.nodes.items()):
+                if op == 'source':
+                    values[key] = sources[key[1]]
+                    continue
+                started = time.perf_counter()
+                values[key] = OPS[op](*(values[k] for k in inputs), **params)
+                self.timings.append({
+                    'node': self.label(key),
+                    'seconds': time.perf_counter() - started,
+                    'consumers': consumers.get(key, 0),
+                })
+                for k in inputs:
+                    if last_use[k] == position and k not in output_keys and k[0] != 'source':
+                        values.pop(k, None)
+
+        return {name: values[spec['key']] for name, spec in self.outputs.items()}
+
+    def summary(self) -> str:
+        """One-line size and runtime summary of the last execution"""
+        computed = len(self.timings)
+        total = sum(t['seconds'] for t in self.timings)
+        return (f"{len(self.outputs)} features from {computed} ops "
+                f"({self.requests} requested, {self.requests - computed} shared), {total:.2f}s")
+
+
+def build_feature_plan(config: Dict[str, Any], source_dtypes: Dict[str, Any]) -> FeaturePlan:
+    """Translate the features config into a plan
+
+    Produces the same columns, in the same order, as the per-ticker
+    pipeline. Besides the packed columns, plans read two panel sources:
+    ``lengths`` (bars per ticker) and ``valid`` (real-bar mask).
+
+    Args:
+        config: Configuration with a features section
+        source_dtypes: Dtypes of the available source columns (open, high,
+            low, close, volume, bu, sd)
+
+    Returns:
+        FeaturePlan
+    """
+    plan = FeaturePlan()
+    feature_config = config.get('features', {})
+    high, low, close, open_ = (plan.source(col) for col in ('high', 'low', 'close', 'open'))
+    volume = plan.source('volume') if 'volume' in source_dtypes else None
+    prev_close = plan.add('shift', close, periods=1)
+    filled_close = plan.add('ffill', close)
+
+    def returns(periods):
+        return plan.add('growth', filled_close, plan.add('shift', filled_close, periods=periods))
+
+    # Technical indicators
+    stage = 'technical'
+    tech_config = feature_config.get('technical_indicators', {})
+
+    for period in tech_config.get('ema_periods', []):
+        plan.output(f'ema_{period}', plan.add('ema', close, window=period), stage)
+
+    for period in tech_config.get('sma_periods', []):
+        plan.output(f'sma_{period}', plan.add('rolling_mean', close, window=period), stage)
+
+    if 'macd' in tech_config:
+        macd_config = tech_config['macd']
+        macd_line = plan.add('sub',
+                             plan.add('ema', close, window=macd_config.get('fast', 12)),
+                             plan.add('ema', close, window=macd_config.get('slow', 26)))
+        signal = plan.add('ema', macd_line, window=macd_config.get('signal', 9))
+        plan.output('macd', macd_line, stage)
+        plan.output('macd_signal', signal, stage)
+        plan.output('macd_diff', plan.add('sub', macd_line, signal), stage)
+
+    if 'adx_period' in tech_config:
+        period = tech_config['adx_period']
+        # ADX needs 2 * window bars of the ticker itself
+        adx = plan.add('adx', high, low, close, window=period)
+        plan.output('adx', plan.add('mask_short', adx, plan.source('lengths'), min_length=2 * period), stage)
+
+    if 'rsi_period' in tech_config:
+        plan.output('rsi', plan.add('rsi', close, window=tech_config['rsi_period']), stage)
+
+    if 'stoch_period' in tech_config:
+        stoch = plan.add('stoch', high, low, close, window=tech_config['stoch_period'])
+        plan.output('stoch', stoch, stage)
+        plan.output('stoch_signal', plan.add('rolling_mean', stoch, window=3), stage)
+
+    if 'bollinger' in tech_config:
+        bb_config = tech_config['bollinger']
+        period = bb_config.get('period', 20)
+        std_dev = bb_config.get('std_dev', 2)
+        mean = plan.add('rolling_mean', close, window=period)
+        std = plan.add('rolling_std', close, window=period)
+        upper = plan.add('band', mean, std, width=std_dev)
+        lower = plan.add('band', mean, std, width=-std_dev)
+        plan.output('bb_upper', upper, stage)
+        plan.output('bb_lower', lower, stage)
+        plan.output('bb_width', plan.add('spread_ratio', upper, lower, close), stage)
+        plan.output('bb_position', plan.add('position', close, lower, upper), stage)
+
+    if 'atr_period' in tech_config:
+        atr = plan.add('atr', high, low, close, window=tech_config['atr_period'])
+        plan.output('atr', atr, stage)
+        plan.output('atr_ratio', plan.add('div', atr, close), stage)
+
+    if volume is not None and ('mfi_period' in tech_config or 'vwap_period' in tech_config):
+        typical = plan.add('typical_price', high, low, close)
+        if 'mfi_period' in tech_config:
+            plan.output('mfi', plan.add('mfi', typical, volume, window=tech_config['mfi_period']), stage)
+        if 'vwap_period' in tech_config:
+            vwap = plan.add('vwap', typical, volume, window=tech_config['vwap_period'])
+            plan.output('vwap', vwap, stage)
+            plan.output('vwap_ratio', plan.add('div', close, vwap), stage)
+
+    if volume is not None:
+        plan.output('obv', plan.add('obv', close, volume), stage)
+
+    # Price features
+    stage = 'price'
+    price_config = feature_config.get('price_features', {})
+
+    for period in price_config.get('returns_periods', []):
+        plan.output(f'return_{period}d', returns(period), stage)
+
+    if 'volatility_window' in price_config:
+        window = price_config['volatility_window']
+        volatility = plan.add('pandas_rolling_std', returns(1), window=window)
+        plan.output('volatility', volatility, stage)
+        plan.output('volatility_of_volatility', plan.add('pandas_rolling_std', volatility, window=window), stage)
+
+    if 'volume_ratio_window' in price_config and volume is not None:
+        window = price_config['volume_ratio_window']
+        volume_sma = plan.add('pandas_rolling_mean', volume, window=window)
+        volume_std = plan.add('pandas_rolling_std', volume, window=window)
+        plan.output('volume_sma', volume_sma, stage)
+        plan.output('volume_ratio', plan.add('div', volume, volume_sma), stage)
+        plan.output('volume_zscore', plan.add('spread_ratio', volume, volume_sma, volume_std), stage)
+
+    if 'bu' in source_dtypes and 'sd' in source_dtypes:
+        bu, sd = plan.source('bu'), plan.source('sd')
+        net = plan.add('sub', bu, sd)
+        integer = all(pd.api.types.is_integer_dtype(source_dtypes[col]) for col in ('bu', 'sd'))
+        plan.output('bu_sd_ratio', plan.add('safe_div', bu, sd), stage)
+        plan.output('net_active_volume', net, stage, dtype='int64' if integer else None)
+        plan.output('active_volume_ratio', plan.add('safe_div', net, plan.add('add', bu, sd)), stage)
+
+    plan.output('high_low_ratio', plan.add('spread_ratio', high, low, close), stage)
+    plan.output('close_open_ratio', plan.add('spread_ratio', close, open_, open_), stage)
+    plan.output('gap', plan.add('spread_ratio', open_, prev_close, prev_close), stage)
+
+    # Regime features
+    stage = 'regime'
+    regime_config = feature_config.get('regime_features', {})
+
+    if 'trend_window' in regime_config:
+        trend_sma = plan.add('pandas_rolling_mean', close, window=regime_config['trend_window'])
+        plan.output('trend_sma', trend_sma, stage)
+        plan.output('above_trend', plan.add('greater', close, trend_sma), stage, dtype='int64')
+
+    if 'volatility_regime_window' in regime_config:
+        rolling_vol = plan.add('pandas_rolling_std', returns(1), window=regime_config['volatility_regime_window'])
+        settings = regime_settings(regime_config)
+        if settings['mode'] == 'full_sample':
+            plan.output('vol_regime', plan.add('vol_regime', rolling_vol, plan.source('valid')), stage)
+        elif settings['scope'] == 'ticker':
+            plan.output('vol_regime', plan.add('causal_vol_regime', rolling_vol, plan.source('valid'),
+                                               relative_accuracy=settings['relative_accuracy'],
+                                               min_periods=settings['min_periods']), stage)
+        else:
+            # Binned across tickers after the plan (see FeatureEngineer.universe_vol_regime)
+            plan.output('vol_regime', rolling_vol, stage)
+
+    # Momentum features
+    stage = 'momentum'
+    for period in MOMENTUM_PERIODS:
+        prev = plan.add('shift', close, periods=period)
+        plan.output(f'roc_{period}', plan.add('roc', close, prev), stage)
+
+    for period in MOMENTUM_PERIODS:
+        prev = plan.add('shift', close, periods=period)
+        plan.output(f'cum_return_{period}d', plan.add('cum_return', close, prev), stage)
+
+    for window in RANK_WINDOWS:
+        plan.output(f'price_rank_{window}d', plan.add('rolling_rank_pct', close, window=window), stage)
+
+    return plan
+
+
+@dataclass
+class FeatureBlock:
+    """Independently cacheable group of features
+
+    Attributes:
+        name: Block name
+        stage: Pipeline stage (technical, price, regime, momentum)
+        section: Config section of the spec, None for always-on blocks
+        spec: Config fragment that produces the block
+        columns: Feature columns, in pipeline order
+        depends: Names of blocks whose outcome the block's values depend on
+    """
+    name: str
+    stage: str
+    section: Optional[str]
+    spec: Dict[str, Any]
+    columns: List[str]
+    depends: List[str] = field(default_factory=list)
+
+
+def feature_blocks(config: Dict[str, Any], source_columns: Iterable[str]) -> List[FeatureBlock]:
+    """Split the features config into cacheable blocks, in pipeline column order
+
+    Each configured indicator (one EMA period, the MACD triple, one return
+    horizon, ...) is its own block, so changing one indicator's parameters
+    only invalidates that block. With full-sample volatility regimes, regime
+    and momentum blocks depend on the volatility regime block: a ticker
+    whose regime bins fail loses them all.
+
+    Args:
+        config: Configuration with a features section
+        source_columns: Columns of the raw data
+
+    Returns:
+        List of FeatureBlock
+    """
+    feature_config = config.get('features', {})
+    tech = feature_config.get('technical_indicators', {})
+    price = feature_config.get('price_features', {})
+    regime = feature_config.get('regime_features', {})
+    source_columns = set(source_columns)
+    has_volume = 'volume' in source_columns
+    blocks: List[FeatureBlock] = []
+
+    def add(name, stage, section, spec, columns):
+        blocks.append(FeatureBlock(name, stage, section, spec, columns))
+
+    for period in tech.get('ema_periods', []):
+        add(f'ema_{period}', 'technical', 'technical_indicators', {'ema_periods': [period]}, [f'ema_{period}'])
+    for period in tech.get('sma_periods', []):
+        add(f'sma_{period}', 'technical', 'technical_indicators', {'sma_periods': [period]}, [f'sma_{period}'])
+    if 'macd' in tech:
+        add('macd', 'technical', 'technical_indicators', {'macd': tech['macd']},
+            ['macd', 'macd_signal', 'macd_diff'])
+    if 'adx_period' in tech:
+        add('adx', 'technical', 'technical_indicators', {'adx_period': tech['adx_period']}, ['adx'])
+    if 'rsi_period' in tech:
+        add('rsi', 'technical', 'technical_indicators', {'rsi_period': tech['rsi_period']}, ['rsi'])
+    if 'stoch_period' in tech:
+        add('stoch', 'technical', 'technical_indicators', {'stoch_period': tech['stoch_period']},
+            ['stoch', 'stoch_signal'])
+    if 'bollinger' in tech:
+        add('bollinger', 'technical', 'technical_indicators', {'bollinger': tech['bollinger']},
+            ['bb_upper', 'bb_lower', 'bb_width', 'bb_position'])
+    if 'atr_period' in tech:
+        add('atr', 'technical', 'technical_indicators', {'atr_period': tech['atr_period']}, ['atr', 'atr_ratio'])
+    if has_volume:
+        if 'mfi_period' in tech:
+            add('mfi', 'technical', 'technical_indicators', {'mfi_period': tech['mfi_period']}, ['mfi'])
+        if 'vwap_period' in tech:
+            add('vwap', 'technical', 'technical_indicators', {'vwap_period': tech['vwap_period']},
+                ['vwap', 'vwap_ratio'])
+        add('obv', 'technical', None, {}, ['obv'])
+
+    for period in price.get('returns_periods', []):
+        add(f'return_{period}d', 'price', 'price_features', {'returns_periods': [period]}, [f'return_{period}d'])
+    if 'volatility_window' in price:
+        add('volatility', 'price', 'price_features', {'volatility_window': price['volatility_window']},
+            ['volatility', 'volatility_of_volatility'])
+    if has_volume and 'volume_ratio_window' in price:
+        add('volume', 'price', 'price_features', {'volume_ratio_window': price['volume_ratio_window']},
+            ['volume_sma', 'volume_ratio', 'volume_zscore'])
+    if {'bu', 'sd'} <= source_columns:
+        add('active_volume', 'price', None, {}, ['bu_sd_ratio', 'net_active_volume', 'active_volume_ratio'])
+    add('price_action', 'price', None, {}, ['high_low_ratio', 'close_open_ratio', 'gap'])
+
+    if 'trend_window' in regime:
+        add('trend', 'regime', 'regime_features', {'trend_window': regime['trend_window']},
+            ['trend_sma', 'above_trend'])
+    if 'volatility_regime_window' in regime:
+        add('vol_regime', 'regime', 'regime_features',
+            {key: value for key, value in regime.items() if key.startswith('volatility_regime_')}, ['vol_regime'])
+    add('momentum', 'momentum', None, {'periods': MOMENTUM_PERIODS, 'rank_windows': RANK_WINDOWS},
+        [f'roc_{p}' for p in MOMENTUM_PERIODS] + [f'cum_return_{p}d' for p in MOMENTUM_PERIODS]
+        + [f'price_rank_{w}d' for w in RANK_WINDOWS])
+
+    if 'volatility_regime_window' in regime and regime_settings(regime)['mode'] == 'full_sample':
+        for block in blocks:
+            if block.stage in ('regime', 'momentum') and block.name != 'vol_regime':
+                block.depends.append('vol_regime')
+    return blocks
+
+
+def select_blocks(blocks: List[FeatureBlock], features: Iterable[str]) -> List[FeatureBlock]:
+    """Blocks needed to produce the given features, with their dependencies
+
+    Args:
+        blocks: All blocks, as returned by ``feature_blocks``
+        features: Wanted feature names (other names are ignored)
+
+    Returns:
+        Needed blocks, in pipeline order
+    """
+    features = set(features)
+    names = {block.name for block in blocks if features & set(block.columns)}
+    names |= {dep for block in blocks if block.name in names for dep in block.depends}
+    return [block for block in blocks if block.name in names]
+
+
+def blocks_config(blocks: Iterable[FeatureBlock]) -> Dict[str, Any]:
+    """Minimal features config that produces the given blocks"""
+    sections: Dict[str, Dict[str, Any]] = {}
+    for block in blocks:
+        if block.section is None:
+            continue
+        section = sections.setdefault(block.section, {})
+        for key, value in block.spec.items():
+            if isinstance(value, list):
+                section[key] = section.get(key, []) + [v for v in value if v not in section.get(key, [])]
+            else:
+                section[key] = value
+    return {'features': sections}
@@ -0,0 +1,160 @@
+"""Content-addressed on-disk store of engineered feature blocks"""
+
+import hashlib
+import json
+import os
+from functools import lru_cache
+from pathlib import Path
+from typing import Any, Dict, Iterable, Optional
+
+import numpy as np
+import pyarrow as pa
+import pyarrow.feather as feather
+
+from .feature_planner import FeatureBlock
+
+# Modules whose source determines feature values
+_CODE_MODULES = ('indicators.py', 'feature_planner.py', 'feature_engineering.py', 'panel.py', 'schema.py',
+                 'quantile_sketch.py')
+
+
+@lru_cache(maxsize=1)
+def code_version() -> str:
+    """Hash of the feature code, so edited kernels invalidate stored blocks"""
+    digest = hashlib.blake2b(digest_size=8)
+    for name in _CODE_MODULES:
+        digest.update((Path(__file__).parent / name).read_bytes())
+    return digest.hexdigest()
+
+
+def data_fingerprint(arrays: Dict[str, np.ndarray]) -> str:
+    """Checksum of one ticker's raw bars
+
+    Args:
+        arrays: Column name to values (timestamps and raw market columns)
+
+    Returns:
+        Hex digest covering names, dtypes and bytes of every column, plus the
+        feature code version
+    """
+    digest = hashlib.blake2b(digest_size=16)
+    digest.update(code_version().encode())
+    for name in sorted(arrays):
+        values = np.ascontiguousarray(arrays[name])
+        digest.update(f"{name}:{values.dtype.str}:{len(values)};".encode())
+        digest.update(values.view(np.uint8))
+    return digest.hexdigest()
+
+
+def block_key(block: FeatureBlock, blocks: Dict[str, FeatureBlock], backend: Optional[str]) -> str:
+    """Hash of everything a block's values depend on besides the raw data
+
+    Args:
+        block: Feature block
+        blocks: All blocks by name, to resolve dependencies
+        backend: Indicator backend, included for technical indicators only
+
+    Returns:
+        Short hex key
+    """
+    spec = {
+        'name': block.name,
+        'spec': block.spec,
+        'columns': block.columns,
+        'depends': {name: blocks[name].spec for name in block.depends},
+        'backend': backend if block.stage == 'technical' else None,
+    }
+    return hashlib.blake2b(json.dumps(spec, sort_keys=True).encode(), digest_size=6).hexdigest()
+
+
+class FeatureStore:
+    """Per-ticker on-disk store of feature blocks
+
+    A block is a group of feature columns produced by one indicator spec
+    (see ``feature_blocks``). Blocks are addressed by the ticker's raw-data
+    fingerprint and by the block key, so changing one indicator's period
+    only misses that indicator's block, and any change to the bars (or to
+    the feature code) misses them all. Entries are uncompressed Arrow IPC
+    files, rewritten atomically when blocks are added; a ticker keeps only
+    the entry of its latest bars, so the store does not grow as bars are
+    appended.
+
+    Layout::
+
+        <root>/<TICKER>/<fingerprint>.arrow   # columns "<block key>:<feature>"
+    """
+
+    def __init__(self, root: str = "data/store/features"):
+        """Initialize store
+
+        Args:
+            root: Root directory of the store
+        """
+        self.root = Path(root)
+        self.stats = {'hits': 0, 'misses': 0, 'bytes_read': 0}
+
+    def _path(self, ticker: str, fingerprint: str) -> Path:
+        return self.root / str(ticker) / f"{fingerprint}.arrow"
+
+    def read(self, ticker: str, fingerprint: str, keys: Iterable[str]) -> Dict[str, Dict[str, np.ndarray]]:
+        """Read the stored blocks among keys
+
+        Args:
+            ticker: Ticker symbol
+            fingerprint: Raw-data fingerprint
+            keys: Block keys wanted
+
+        Returns:
+            Block key to {feature: values}, for the blocks found
+        """
+        path = self._path(ticker, fingerprint)
+        if not path.exists():
+            return {}
+        keys = set(keys)
+        table = feather.read_table(path, memory_map=False)
+        blocks: Dict[str, Dict[str, np.ndarray]] = {}
+        for name in table.column_names:
+            key, col = name.split(':', 1)
+            if key in keys:
+                blocks.setdefault(key, {})[col] = table.column(name).to_numpy()
+        self.stats['bytes_read'] += table.nbytes
+        return blocks
+
+    def write(self, ticker: str, fingerprint: str, blocks: Dict[str, Dict[str, np.ndarray]]) -> None:
+        """Add blocks to a ticker's entry, removing its entries for other fingerprints
+
+        Args:
+            ticker: Ticker symbol
+            fingerprint: Raw-data fingerprint
+            blocks: Block key to {feature: values}
+        """
+        path = self._path(ticker, fingerprint)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        columns = {f"{key}:{col}": values for key, block in blocks.items() for col, values in block.items()}
+        if path.exists():
+            stored = feather.read_table(path, memory_map=False)
+            for name in stored.column_names:
+                columns.setdefault(name, stored.column(name))
+        tmp_path = path.with_suffix('.arrow.tmp')
+        feather.write_feather(pa.table(columns), tmp_path, compression='uncompressed')
+        os.replace(tmp_path, path)
+
+        # Entries of the ticker's earlier bars are superseded
+        for stale in path.parent.glob('*.arrow'):
+            if stale != path:
+                stale.unlink(missing_ok=True)
+
+
+def create_feature_store(config: Dict[str, Any]) -> Optional[FeatureStore]:
+    """Create the feature store from features.store, None when disabled
+
+    Args:
+        config: Configuration with an optional features.store section
+
+    Returns:
+        FeatureStore instance or None
+    """
+    store_config = (config or {}).get('features', {}).get('store', {})
+    if not store_config.get('enabled', False):
+        return None
+    return FeatureStore(store_config.get('dir', 'data/store/features'))
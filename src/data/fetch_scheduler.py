@@ -0,0 +1,189 @@
+"""Concurrent chunked fetch scheduler for large ticker universes"""
+
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Callable, List, Optional, Union
+
+import pandas as pd
+from loguru import logger
+
+
+class TokenBucket:
+    """Thread-safe token-bucket rate limiter"""
+
+    def __init__(self, rate: float, capacity: int):
+        """Initialize bucket
+
+        Args:
+            rate: Tokens added per second
+            capacity: Maximum burst size
+        """
+        self.rate = rate
+        self.capacity = capacity
+        self._tokens = float(capacity)
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self) -> None:
+        """Block until a token is available, then consume it"""
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                wait = (1 - self._tokens) / self.rate
+            time.sleep(wait)
+
+
+@dataclass
+class FetchChunk:
+    """One (ticker batch x date window) request"""
+    index: int
+    tickers: List[str]
+    from_date: str
+    to_date: str
+
+
+class FetchScheduler:
+    """Split a fetch into chunks and run them on a bounded thread pool
+
+    Each chunk waits for a rate-limit token, is retried with jittered
+    exponential backoff on failure, and results are merged back in the
+    order of the requested tickers.
+    """
+
+    def __init__(
+        self,
+        batch_size: int = 20,
+        window_days: int = 365,
+        max_workers: int = 4,
+        rate_per_sec: float = 5.0,
+        burst: int = 5,
+        max_retries: int = 3,
+        backoff_base: float = 0.5,
+        backoff_max: float = 30.0
+    ):
+        """Initialize scheduler
+
+        Args:
+            batch_size: Maximum tickers per request
+            window_days: Maximum calendar days per request
+            max_workers: Size of the thread pool
+            rate_per_sec: Sustained requests per second
+            burst: Maximum burst of requests
+            max_retries: Retries per chunk before giving up
+            backoff_base: Base delay of the exponential backoff (seconds)
+            backoff_max: Cap of the backoff delay (seconds)
+        """
+        self.batch_size = batch_size
+        self.window_days = window_days
+        self.max_workers = max_workers
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.limiter = TokenBucket(rate_per_sec, burst)
+
+    def plan(
+        self,
+        tickers: List[str],
+        start_date: str,
+        end_date: Optional[str] = None
+    ) -> List[FetchChunk]:
+        """Split a request into (ticker batch x date window) chunks
+
+        Args:
+            tickers: Ticker symbols
+            start_date: Start date (YYYY-MM-DD)
+            end_date: End date (YYYY-MM-DD), None for current date
+
+        Returns:
+            Chunks in merge order
+        """
+        start = pd.Timestamp(start_date).normalize()
+        end = pd.Timestamp(end_date).normalize() if end_date else pd.Timestamp.today().normalize()
+
+        windows = []
+        cursor = start
+        while cursor <= end:
+            window_end = min(cursor + pd.Timedelta(days=self.window_days - 1), end)
+            windows.append((cursor.strftime('%Y-%m-%d'), window_end.strftime('%Y-%m-%d')))
+            cursor = window_end + pd.Timedelta(days=1)
+
+        chunks = []
+        for i in range(0, len(tickers), self.batch_size):
+            for from_date, to_date in windows:
+                chunks.append(FetchChunk(len(chunks), tickers[i:i + self.batch_size], from_date, to_date))
+        return chunks
+
+    def _run_chunk(
+        self,
+        fetch_fn: Callable[[List[str], str, str], pd.DataFrame],
+        chunk: FetchChunk
+    ) -> Optional[pd.DataFrame]:
+        """Run one chunk with rate limiting and retries"""
+        for attempt in range(self.max_retries + 1):
+            self.limiter.acquire()
+            try:
+                return fetch_fn(chunk.tickers, chunk.from_date, chunk.to_date)
+            except Exception as e:
+                if attempt == self.max_retries:
+                    logger.error(
+                        f"Chunk {chunk.index} ({len(chunk.tickers)} tickers, "
+                        f"{chunk.from_date}..{chunk.to_date}) failed after {attempt + 1} attempts: {e}"
+                    )
+                    raise
+                delay = random.uniform(0, min(self.backoff_max, self.backoff_base * 2 ** attempt))
+                logger.warning(f"Chunk {chunk.index} failed ({e}), retrying in {delay:.2f}s")
+                time.sleep(delay)
+
+    def run(
+        self,
+        fetch_fn: Callable[[List[str], str, str], pd.DataFrame],
+        tickers: Union[str, List[str]],
+        start_date: str,
+        end_date: Optional[str] = None
+    ) -> pd.DataFrame:
+        """Fetch all chunks concurrently and merge them in order
+
+        Args:
+            fetch_fn: Callable(tickers, from_date, to_date) hitting the API
+            tickers: Ticker symbol(s)
+            start_date: Start date (YYYY-MM-DD)
+            end_date: End date (YYYY-MM-DD), None for current date
+
+        Returns:
+            DataFrame ordered by requested ticker, then timestamp
+        """
+        if isinstance(tickers, str):
+            tickers = [tickers]
+
+        chunks = self.plan(tickers, start_date, end_date)
+        started = time.perf_counter()
+
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            results = list(executor.map(lambda chunk: self._run_chunk(fetch_fn, chunk), chunks))
+
+        frames = [r for r in results if r is not None and not r.empty]
+        logger.info(
+            f"Fetched {len(chunks)} chunks with {self.max_workers} workers "
+            f"in {time.perf_counter() - started:.2f}s"
+        )
+        if not frames:
+            return pd.DataFrame()
+
+        data = pd.concat(frames, ignore_index=True)
+        data['timestamp'] = pd.to_datetime(data['timestamp'])
+        order = {ticker: i for i, ticker in enumerate(tickers)}
+        data = data.drop_duplicates(subset=['ticker', 'timestamp'], keep='last')
+        data = data.sort_values(
+            ['ticker', 'timestamp'],
+            key=lambda col: col.map(order) if col.name == 'ticker' else col,
+            kind='mergesort'
+        )
+        return data.reset_index(drop=True)
@@ -0,0 +1,600 @@
+"""Technical indicators on contiguous NumPy arrays, mirroring FiinIndicator
+
+The module-level kernels take and return float64 arrays and work along axis
+0, so a 2D (time x ticker) array runs every ticker in one call; LocalIndicator
+wraps them behind the FiinIndicator method names so it can stand in for
+``client.FiinIndicator()``. PandasIndicator is the pandas reference the
+kernels are checked against (``python benchmark.py indicators``).
+
+2D inputs are expected in the packed layout of ``Panel``: each column holds
+one ticker's bars from row 0, followed by NaN padding. Values computed on the
+padding are meaningless and dropped when the panel is unpacked.
+"""
+
+import numpy as np
+import pandas as pd
+from numpy.lib.stride_tricks import sliding_window_view
+
+# Largest power c**-k used inside one block of linear_recurrence
+_MAX_BLOCK_SCALE = np.log(1e150)
+
+# Elements of a window-expanded temporary processed at once by 2D rolling kernels
+_MAX_WINDOW_ELEMENTS = 1 << 24
+
+
+def linear_recurrence(x: np.ndarray, c: float, b: float = 1.0, y0=0.0) -> np.ndarray:
+    """Solve y[i] = c * y[i-1] + b * x[i] with y[-1] = y0 without a Python loop per element
+
+    Uses the closed form y[j] = c**j * (c * y0 + b * sum_{k<=j} x[k] * c**-k),
+    evaluated in blocks short enough that c**-k stays far from overflow; the
+    last value of each block seeds the next. NaN propagates forward like in
+    the sequential recursion.
+
+    Args:
+        x: Input array, recursion along axis 0
+        c: Decay factor in (0, 1]
+        b: Input weight
+        y0: Value before the first element (scalar or one per column)
+
+    Returns:
+        Array of y values
+    """
+    n = len(x)
+    out = np.empty(x.shape, dtype=np.float64)
+    if n == 0:
+        return out
+
+    block = n if c >= 1.0 else max(1, min(n, int(_MAX_BLOCK_SCALE / -np.log(c))))
+    steps = np.arange(block, dtype=np.float64).reshape((-1,) + (1,) * (x.ndim - 1))
+    powers = c ** steps
+    inverse = c ** -steps
+
+    carry = y0
+    for start in range(0, n, block):
+        seg = x[start:start + block]
+        size = len(seg)
+        scaled = np.cumsum(seg * inverse[:size], axis=0)
+        out[start:start + size] = powers[:size] * (c * carry + b * scaled)
+        carry = out[start + size - 1]
+    return out
+
+
+def _ewm_mean_sequential(x: np.ndarray, alpha: float, min_periods: int) -> np.ndarray:
+    """pandas ewm(adjust=False, ignore_na=False).mean() for inputs with gaps"""
+    out = np.full(len(x), np.nan)
+    weighted = np.nan
+    old_wt = 1.0
+    nobs = 0
+    for i, value in enumerate(x):
+        is_obs = value == value
+        nobs += is_obs
+        if weighted == weighted:
+            old_wt *= 1.0 - alpha
+            if is_obs:
+                if weighted != value:
+                    weighted = (old_wt * weighted + alpha * value) / (old_wt + alpha)
+                old_wt = 1.0
+        elif is_obs:
+            weighted = value
+        if nobs >= min_periods:
+            out[i] = weighted
+    return out
+
+
+def _valid_span(valid: np.ndarray):
+    """First valid row, and whether valid rows form one unbroken run, per column"""
+    n = len(valid)
+    first = np.argmax(valid, axis=0)
+    last = n - 1 - np.argmax(valid[::-1], axis=0)
+    unbroken = valid.sum(axis=0) == last - first + 1
+    return first, unbroken
+
+
+def ewm_mean(x: np.ndarray, alpha: float, min_periods: int = 1) -> np.ndarray:
+    """Exponentially weighted mean with pandas ewm(adjust=False) semantics
+
+    Leading NaNs are skipped and the first observation seeds the average.
+    1D inputs with NaNs after the first observation, and 2D columns with
+    gaps before their padding, use the sequential path.
+
+    Args:
+        x: Input array, averaged along axis 0
+        alpha: Smoothing factor
+        min_periods: Observations required before a value is emitted
+
+    Returns:
+        Array of averages
+    """
+    min_periods = max(min_periods, 1)
+    out = np.full(x.shape, np.nan)
+    valid = ~np.isnan(x)
+
+    if x.ndim == 1:
+        if not valid.any():
+            return out
+        first = int(np.argmax(valid))
+        if not valid[first:].all():
+            return _ewm_mean_sequential(x, alpha, min_periods)
+        out[first] = x[first]
+        out[first + 1:] = linear_recurrence(x[first + 1:], 1.0 - alpha, alpha, x[first])
+        out[:first + min_periods - 1] = np.nan
+        return out
+
+    first, unbroken = _valid_span(valid)
+    has_values = valid.any(axis=0)
+    for start in np.unique(first[has_values & unbroken]):
+        cols = np.flatnonzero(has_values & unbroken & (first == start))
+        block = x[start:, cols]
+        out[start, cols] = block[0]
+        out[start + 1:, cols] = linear_recurrence(block[1:], 1.0 - alpha, alpha, block[0])
+        out[:start + min_periods - 1, cols] = np.nan
+    for col in np.flatnonzero(has_values & ~unbroken):
+        out[:, col] = _ewm_mean_sequential(x[:, col], alpha, min_periods)
+    return out
+
+
+def _column_chunks(x: np.ndarray, window: int):
+    """Column slices that keep window-expanded temporaries under _MAX_WINDOW_ELEMENTS"""
+    if x.ndim == 1:
+        yield Ellipsis
+        return
+    n_cols = x.shape[1]
+    step = max(1, _MAX_WINDOW_ELEMENTS // max(len(x) * window, 1))
+    for start in range(0, n_cols, step):
+        yield slice(start, min(start + step, n_cols))
+
+
+def _rolling(x: np.ndarray, window: int, reducer, **kwargs) -> np.ndarray:
+    """Apply reducer over full windows; NaN until window values are available"""
+    out = np.full(x.shape, np.nan)
+    if len(x) >= window:
+        if x.ndim == 1:
+            out[window - 1:] = reducer(sliding_window_view(x, window), axis=-1, **kwargs)
+            return out
+        for cols in _column_chunks(x, window):
+            # Ticker-major copy keeps each window contiguous, so the reduction
+            # sums in the same order as on a single ticker's 1D array
+            chunk = np.ascontiguousarray(x[:, cols].T)
+            out[window - 1:, cols] = reducer(sliding_window_view(chunk, window, axis=1), axis=-1, **kwargs).T
+    return out
+
+
+def rolling_sum(x: np.ndarray, window: int) -> np.ndarray:
+    """Rolling sum; prefix-sum differences where no NaN precedes a valid value"""
+    out = np.full(x.shape, np.nan)
+    if len(x) < window:
+        return out
+
+    nan = np.isnan(x)
+    if x.ndim == 1:
+        gapped = nan.any()
+    else:
+        # NaN padding after a column's last value does not affect its bars
+        first, unbroken = _valid_span(~nan)
+        gapped = ~unbroken | (first > 0)
+    if np.all(gapped):
+        return _rolling(x, window, np.sum)
+
+    prefix = np.concatenate([np.zeros((1,) + x.shape[1:]), np.cumsum(x, axis=0)])
+    out[window - 1:] = prefix[window:] - prefix[:-window]
+    if np.any(gapped):
+        cols = np.flatnonzero(gapped)
+        out[:, cols] = _rolling(x[:, cols], window, np.sum)
+    return out
+
+
+def rolling_mean(x: np.ndarray, window: int) -> np.ndarray:
+    return rolling_sum(x, window) / window
+
+
+def rolling_std(x: np.ndarray, window: int, ddof: int = 0) -> np.ndarray:
+    """Rolling standard deviation (population by default)"""
+    return _rolling(x, window, np.std, ddof=ddof)
+
+
+def _rolling_extreme(x: np.ndarray, window: int, op: np.ufunc) -> np.ndarray:
+    """Rolling min / max in O(n) per column (van Herk / Gil-Werman)
+
+    Rows are cut into blocks of ``window``; every window spans the tail of
+    one block and the head of the next, so its extreme is op(suffix
+    extreme, prefix extreme) of those blocks. NaN propagates through op, so a
+    window holding a NaN is NaN, as with pandas' default min_periods.
+    """
+    n = len(x)
+    out = np.full(x.shape, np.nan)
+    if n < window:
+        return out
+    pad = (-n) % window
+    if pad:
+        x = np.concatenate([x, np.full((pad,) + x.shape[1:], np.nan)])
+    blocks = x.reshape((-1, window) + x.shape[1:])
+    prefix = op.accumulate(blocks, axis=1).reshape(x.shape)
+    suffix = op.accumulate(blocks[:, ::-1], axis=1)[:, ::-1].reshape(x.shape)
+    out[window - 1:] = op(suffix[:n - window + 1], prefix[window - 1:n])
+    return out
+
+
+def rolling_min(x: np.ndarray, window: int) -> np.ndarray:
+    return _rolling_extreme(x, window, np.minimum)
+
+
+def rolling_max(x: np.ndarray, window: int) -> np.ndarray:
+    return _rolling_extreme(x, window, np.maximum)
+
+
+def rolling_rank_pct(x: np.ndarray, window: int) -> np.ndarray:
+    """Percentile rank of each value within its trailing window (average ties)
+
+    Counts, one lag at a time, the earlier window values below and not above
+    the current one; each lag is a single pass over contiguous rows, with no
+    window-expanded temporary. NaN if the window holds a NaN.
+    """
+    n = len(x)
+    out = np.full(x.shape, np.nan)
+    if n < window:
+        return out
+    current = x[window - 1:]
+    # less + less-or-equal over the other window values
+    counts = np.zeros(current.shape, dtype=np.int32)
+    hit = np.empty(current.shape, dtype=bool)
+    for lag in range(1, window):
+        previous = x[window - 1 - lag:n - lag]
+        counts += np.less(previous, current, out=hit)
+        counts += np.less_equal(previous, current, out=hit)
+    # Average rank = less + (equal + 1) / 2, the current value being one of the equal ones
+    out[window - 1:] = (counts + 2) / (2.0 * window)
+    out[rolling_sum(np.isnan(x).astype(np.float64), window) > 0] = np.nan
+    return out
+
+
+def shift(x: np.ndarray, periods: int = 1) -> np.ndarray:
+    """Value periods rows earlier, NaN for the first rows"""
+    out = np.full(x.shape, np.nan)
+    if len(x) > periods:
+        out[periods:] = x[:-periods]
+    return out
+
+
+def ffill(x: np.ndarray) -> np.ndarray:
+    """Forward-fill NaN along axis 0"""
+    rows = np.arange(len(x)).reshape((-1,) + (1,) * (x.ndim - 1))
+    source = np.where(np.isnan(x), 0, rows)
+    np.maximum.accumulate(source, axis=0, out=source)
+    return np.take_along_axis(x, source, axis=0)
+
+
+def pct_change(x: np.ndarray, periods: int = 1) -> np.ndarray:
+    """Percentage change with pandas' default forward fill of missing values"""
+    filled = ffill(x)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        return filled / shift(filled, periods) - 1
+
+
+def _shift(x: np.ndarray) -> np.ndarray:
+    """Previous value, NaN for the first element"""
+    return shift(x, 1)
+
+
+def ema(close: np.ndarray, window: int) -> np.ndarray:
+    return ewm_mean(close, 2.0 / (window + 1), window)
+
+
+def sma(close: np.ndarray, window: int) -> np.ndarray:
+    return rolling_mean(close, window)
+
+
+def macd(close: np.ndarray, window_slow: int = 26, window_fast: int = 12) -> np.ndarray:
+    return ema(close, window_fast) - ema(close, window_slow)
+
+
+def macd_signal(close: np.ndarray, window_slow: int = 26, window_fast: int = 12,
+                window_sign: int = 9) -> np.ndarray:
+    return ema(macd(close, window_slow, window_fast), window_sign)
+
+
+def rsi(close: np.ndarray, window: int = 14) -> np.ndarray:
+    diff = close - _shift(close)
+    up = np.where(diff > 0, diff, 0.0)
+    down = -np.where(diff < 0, diff, 0.0)
+    ema_up = ewm_mean(up, 1.0 / window, window)
+    ema_down = ewm_mean(down, 1.0 / window, window)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        rs = ema_up / ema_down
+        return np.where(ema_down == 0, 100.0, 100 - (100 / (1 + rs)))
+
+
+def stoch(high: np.ndarray, low: np.ndarray, close: np.ndarray, window: int = 14) -> np.ndarray:
+    lowest = rolling_min(low, window)
+    highest = rolling_max(high, window)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        return 100 * (close - lowest) / (highest - lowest)
+
+
+def bollinger_bands(close: np.ndarray, window: int = 20, window_dev: float = 2):
+    """Upper and lower Bollinger bands (population standard deviation)"""
+    mavg = rolling_mean(close, window)
+    mstd = rolling_std(close, window)
+    return mavg + window_dev * mstd, mavg - window_dev * mstd
+
+
+def atr(high: np.ndarray, low: np.ndarray, close: np.ndarray, window: int = 14) -> np.ndarray:
+    """Wilder average true range; zeros during the warm-up like ta"""
+    prev_close = _shift(close)
+    true_range = np.fmax(np.fmax(high - low, np.abs(high - prev_close)), np.abs(low - prev_close))
+
+    out = np.zeros(close.shape)
+    if len(close) >= window:
+        out[window - 1] = true_range[0:window].mean(axis=0)
+        out[window:] = linear_recurrence(
+            true_range[window:], (window - 1) / float(window), 1.0 / window, out[window - 1]
+        )
+    return out
+
+
+def adx(high: np.ndarray, low: np.ndarray, close: np.ndarray, window: int = 14) -> np.ndarray:
+    """Average directional index with the ta library's smoothing and warm-up"""
+    n = len(close)
+    if n < 2 * window:
+        return np.full(close.shape, np.nan)
+
+    prev_close = _shift(close)
+    tr = np.maximum(high, prev_close) - np.minimum(low, prev_close)
+    diff_up = high - _shift(high)
+    diff_down = _shift(low) - low
+    pos = np.abs(((diff_up > diff_down) & (diff_up > 0)) * diff_up)
+    neg = np.abs(((diff_down > diff_up) & (diff_down > 0)) * diff_down)
+
+    m = n - (window - 1)
+
+    def smooth(values):
+        # ta leaves the last smoothed value at zero
+        out = np.zeros((m,) + values.shape[1:])
+        out[0] = np.nansum(values[1:window + 1], axis=0)
+        out[1:m - 1] = linear_recurrence(values[window + 1:window + m - 1], 1 - 1.0 / window, 1.0, out[0])
+        return out
+
+    trs = smooth(tr)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        dip = 100 * smooth(pos) / trs
+        din = 100 * smooth(neg) / trs
+        dx = 100 * np.abs((dip - din) / (dip + din))
+
+    out = np.zeros(close.shape)
+    seed = dx[0:window].mean(axis=0)
+    out[2 * window - 1] = seed
+    out[2 * window:] = linear_recurrence(
+        dx[window:m - 1], (window - 1) / float(window), 1.0 / window, seed
+    )
+    return out
+
+
+def typical_price(high: np.ndarray, low: np.ndarray, close: np.ndarray) -> np.ndarray:
+    return (high + low + close) / 3.0
+
+
+def money_flow_index(typical: np.ndarray, volume: np.ndarray, window: int = 14) -> np.ndarray:
+    """MFI from a precomputed typical price"""
+    prev_tp = _shift(typical)
+    direction = np.where(typical > prev_tp, 1, np.where(typical < prev_tp, -1, 0))
+    money_flow = typical * volume * direction
+    positive = rolling_sum(np.clip(money_flow, 0, None), window)
+    negative = rolling_sum(-np.clip(money_flow, None, 0), window)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        return 100 - (100 / (1 + positive / negative))
+
+
+def rolling_vwap(typical: np.ndarray, volume: np.ndarray, window: int = 14) -> np.ndarray:
+    """VWAP from a precomputed typical price"""
+    with np.errstate(divide='ignore', invalid='ignore'):
+        return rolling_sum(typical * volume, window) / rolling_sum(volume, window)
+
+
+def mfi(high: np.ndarray, low: np.ndarray, close: np.ndarray, volume: np.ndarray,
+        window: int = 14) -> np.ndarray:
+    return money_flow_index(typical_price(high, low, close), volume, window)
+
+
+def vwap(high: np.ndarray, low: np.ndarray, close: np.ndarray, volume: np.ndarray,
+         window: int = 14) -> np.ndarray:
+    return rolling_vwap(typical_price(high, low, close), volume, window)
+
+
+def obv(close: np.ndarray, volume: np.ndarray) -> np.ndarray:
+    signed = np.where(close < _shift(close), -volume, volume)
+    out = np.nancumsum(signed, axis=0)
+    out[np.isnan(signed)] = np.nan
+    return out
+
+
+def _values(column: pd.Series) -> np.ndarray:
+    """Contiguous float64 view/copy of a Series"""
+    return np.ascontiguousarray(column.to_numpy(dtype=np.float64, na_value=np.nan))
+
+
+class LocalIndicator:
+    """FiinIndicator-compatible wrapper around the NumPy kernels
+
+    Each method converts its inputs to contiguous float64 arrays once and
+    returns a Series on the input index.
+    """
+
+    def ema(self, column: pd.Series, window: int) -> pd.Series:
+        return pd.Series(ema(_values(column), window), index=column.index)
+
+    def sma(self, column: pd.Series, window: int) -> pd.Series:
+        return pd.Series(sma(_values(column), window), index=column.index)
+
+    def macd(self, column: pd.Series, window_slow: int = 26, window_fast: int = 12) -> pd.Series:
+        return pd.Series(macd(_values(column), window_slow, window_fast), index=column.index)
+
+    def macd_signal(self, column: pd.Series, window_slow: int = 26, window_fast: int = 12,
+                    window_sign: int = 9) -> pd.Series:
+        return pd.Series(macd_signal(_values(column), window_slow, window_fast, window_sign),
+                         index=column.index)
+
+    def macd_diff(self, column: pd.Series, window_slow: int = 26, window_fast: int = 12,
+                  window_sign: int = 9) -> pd.Series:
+        line = macd(_values(column), window_slow, window_fast)
+        return pd.Series(line - ema(line, window_sign), index=column.index)
+
+    def rsi(self, column: pd.Series, window: int = 14) -> pd.Series:
+        return pd.Series(rsi(_values(column), window), index=column.index)
+
+    def stoch(self, high: pd.Series, low: pd.Series, close: pd.Series, window: int = 14,
+              smooth_window: int = 3) -> pd.Series:
+        return pd.Series(stoch(_values(high), _values(low), _values(close), window), index=close.index)
+
+    def stoch_signal(self, high: pd.Series, low: pd.Series, close: pd.Series, window: int = 14,
+                     smooth_window: int = 3) -> pd.Series:
+        values = stoch(_values(high), _values(low), _values(close), window)
+        return pd.Series(rolling_mean(values, smooth_window), index=close.index)
+
+    def bollinger_hband(self, column: pd.Series, window: int = 20, window_dev: int = 2) -> pd.Series:
+        return pd.Series(bollinger_bands(_values(column), window, window_dev)[0], index=column.index)
+
+    def bollinger_lband(self, column: pd.Series, window: int = 20, window_dev: int = 2) -> pd.Series:
+        return pd.Series(bollinger_bands(_values(column), window, window_dev)[1], index=column.index)
+
+    def atr(self, high: pd.Series, low: pd.Series, close: pd.Series, window: int = 14) -> pd.Series:
+        return pd.Series(atr(_values(high), _values(low), _values(close), window), index=close.index)
+
+    def adx(self, high: pd.Series, low: pd.Series, close: pd.Series, window: int = 14) -> pd.Series:
+        return pd.Series(adx(_values(high), _values(low), _values(close), window), index=close.index)
+
+    def mfi(self, high: pd.Series, low: pd.Series, close: pd.Series, volume: pd.Series,
+            window: int = 14) -> pd.Series:
+        return pd.Series(mfi(_values(high), _values(low), _values(close), _values(volume), window),
+                         index=close.index)
+
+    def vwap(self, high: pd.Series, low: pd.Series, close: pd.Series, volume: pd.Series,
+             window: int = 14) -> pd.Series:
+        return pd.Series(vwap(_values(high), _values(low), _values(close), _values(volume), window),
+                         index=close.index)
+
+    def obv(self, close: pd.Series, volume: pd.Series) -> pd.Series:
+        return pd.Series(obv(_values(close), _values(volume)), index=close.index)
+
+
+class PandasIndicator:
+    """pandas reference implementation of the FiinIndicator methods used here
+
+    Follows the ``ta`` semantics FiinIndicator is built on; used to check the
+    NumPy kernels of LocalIndicator when the SDK is not available.
+    """
+
+    def ema(self, column: pd.Series, window: int) -> pd.Series:
+        return column.ewm(span=window, min_periods=window, adjust=False).mean()
+
+    def sma(self, column: pd.Series, window: int) -> pd.Series:
+        return column.rolling(window=window, min_periods=window).mean()
+
+    def macd(self, column: pd.Series, window_slow: int = 26, window_fast: int = 12) -> pd.Series:
+        return self.ema(column, window_fast) - self.ema(column, window_slow)
+
+    def macd_signal(self, column: pd.Series, window_slow: int = 26, window_fast: int = 12,
+                    window_sign: int = 9) -> pd.Series:
+        return self.ema(self.macd(column, window_slow, window_fast), window_sign)
+
+    def macd_diff(self, column: pd.Series, window_slow: int = 26, window_fast: int = 12,
+                  window_sign: int = 9) -> pd.Series:
+        macd = self.macd(column, window_slow, window_fast)
+        return macd - self.ema(macd, window_sign)
+
+    def rsi(self, column: pd.Series, window: int = 14) -> pd.Series:
+        diff = column.diff(1)
+        up = diff.where(diff > 0, 0.0)
+        down = -diff.where(diff < 0, 0.0)
+        ema_up = up.ewm(alpha=1 / window, min_periods=window, adjust=False).mean()
+        ema_down = down.ewm(alpha=1 / window, min_periods=window, adjust=False).mean()
+        rs = ema_up / ema_down
+        return pd.Series(np.where(ema_down == 0, 100, 100 - (100 / (1 + rs))), index=column.index)
+
+    def stoch(self, high: pd.Series, low: pd.Series, close: pd.Series, window: int = 14,
+              smooth_window: int = 3) -> pd.Series:
+        lowest = low.rolling(window, min_periods=window).min()
+        highest = high.rolling(window, min_periods=window).max()
+        return 100 * (close - lowest) / (highest - lowest)
+
+    def stoch_signal(self, high: pd.Series, low: pd.Series, close: pd.Series, window: int = 14,
+                     smooth_window: int = 3) -> pd.Series:
+        stoch = self.stoch(high, low, close, window, smooth_window)
+        return stoch.rolling(smooth_window, min_periods=smooth_window).mean()
+
+    def bollinger_hband(self, column: pd.Series, window: int = 20, window_dev: int = 2) -> pd.Series:
+        mavg = column.rolling(window, min_periods=window).mean()
+        mstd = column.rolling(window, min_periods=window).std(ddof=0)
+        return mavg + window_dev * mstd
+
+    def bollinger_lband(self, column: pd.Series, window: int = 20, window_dev: int = 2) -> pd.Series:
+        mavg = column.rolling(window, min_periods=window).mean()
+        mstd = column.rolling(window, min_periods=window).std(ddof=0)
+        return mavg - window_dev * mstd
+
+    def atr(self, high: pd.Series, low: pd.Series, close: pd.Series, window: int = 14) -> pd.Series:
+        prev_close = close.shift(1)
+        true_range = pd.concat(
+            [high - low, (high - prev_close).abs(), (low - prev_close).abs()], axis=1
+        ).max(axis=1).values
+
+        atr = np.zeros(len(close))
+        if len(close) >= window:
+            atr[window - 1] = true_range[0:window].mean()
+            for i in range(window, len(atr)):
+                atr[i] = (atr[i - 1] * (window - 1) + true_range[i]) / float(window)
+        return pd.Series(atr, index=close.index)
+
+    def adx(self, high: pd.Series, low: pd.Series, close: pd.Series, window: int = 14) -> pd.Series:
+        n = len(close)
+        if n < 2 * window:
+            return pd.Series(np.nan, index=close.index)
+
+        high_v = high.values.astype(float)
+        low_v = low.values.astype(float)
+        prev_close = np.concatenate([[np.nan], close.values[:-1].astype(float)])
+
+        # Wilder-smoothed true range and directional movements
+        tr = np.maximum(high_v, prev_close) - np.minimum(low_v, prev_close)
+        diff_up = high_v - np.concatenate([[np.nan], high_v[:-1]])
+        diff_down = np.concatenate([[np.nan], low_v[:-1]]) - low_v
+        pos = np.abs(((diff_up > diff_down) & (diff_up > 0)) * diff_up)
+        neg = np.abs(((diff_down > diff_up) & (diff_down > 0)) * diff_down)
+
+        def smooth(values):
+            out = np.zeros(n - (window - 1))
+            out[0] = np.nansum(values[1:window + 1])
+            for i in range(1, len(out) - 1):
+                out[i] = out[i - 1] - out[i - 1] / float(window) + values[window + i]
+            return out
+
+        trs = smooth(tr)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            dip = 100 * smooth(pos) / trs
+            din = 100 * smooth(neg) / trs
+            dx = 100 * np.abs((dip - din) / (dip + din))
+
+        adx = np.zeros(len(trs))
+        adx[window] = dx[0:window].mean()
+        for i in range(window + 1, len(adx)):
+            adx[i] = (adx[i - 1] * (window - 1) + dx[i - 1]) / float(window)
+        return pd.Series(np.concatenate([np.zeros(window - 1), adx]), index=close.index)
+
+    def mfi(self, high: pd.Series, low: pd.Series, close: pd.Series, volume: pd.Series,
+            window: int = 14) -> pd.Series:
+        typical_price = (high + low + close) / 3.0
+        prev_tp = typical_price.shift(1)
+        direction = np.where(typical_price > prev_tp, 1, np.where(typical_price < prev_tp, -1, 0))
+        money_flow = typical_price * volume * direction
+        positive = money_flow.clip(lower=0).rolling(window, min_periods=window).sum()
+        negative = (-money_flow.clip(upper=0)).rolling(window, min_periods=window).sum()
+        return 100 - (100 / (1 + positive / negative))
+
+    def vwap(self, high: pd.Series, low: pd.Series, close: pd.Series, volume: pd.Series,
+             window: int = 14) -> pd.Series:
+        typical_price = (high + low + close) / 3.0
+        total_pv = (typical_price * volume).rolling(window, min_periods=window).sum()
+        total_volume = volume.rolling(window, min_periods=window).sum()
+        return total_pv / total_volume
+
+    def obv(self, close: pd.Series, volume: pd.Series) -> pd.Series:
+        signed = np.where(close < close.shift(1), -volume, volume)
+        return pd.Series(signed, index=close.index).cumsum()
@@ -0,0 +1,233 @@
+"""Batched search over triple-barrier labeling parameters"""
+
+import itertools
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Dict, List, Tuple
+
+import numpy as np
+import pandas as pd
+from loguru import logger
+from numpy.lib.stride_tricks import sliding_window_view
+
+from .labeling import (
+    HIT_TYPES, analyze_labeling_quality, barrier_levels, resolve_barrier_hits, rolling_volatility
+)
+from .panel import Panel
+from .parallel_features import SharedColumns, attach_shared, partition_tickers
+
+# Grid axes of optimization.param_grid
+GRID_KEYS = ('N', 'tp_k', 'sl_k', 'vol_window')
+
+Combo = Tuple[int, float, float, int]
+
+
+def _first_offsets(ahead: np.ndarray, touched: np.ndarray) -> np.ndarray:
+    """Column of the first True of each row of touched, ahead.shape[1] when none"""
+    first = touched.argmax(axis=1)
+    return np.where(touched[np.arange(len(first)), first], first, ahead.shape[1])
+
+
+def _search_tickers(
+    columns: Dict[str, np.ndarray],
+    lengths: np.ndarray,
+    grid: Dict[str, List[Any]],
+    params: Dict[str, Any]
+) -> Dict[Combo, np.ndarray]:
+    """Label counts of every grid combination over consecutive tickers
+
+    Per ticker, the forward high / low windows are built once for the
+    largest N and each vol_window's volatility once. First-touch offsets
+    depend on one barrier only, so they are found once per (vol_window,
+    tp_k) and (vol_window, sl_k); every (tp_k, sl_k, N) then combines them
+    with element-wise ops.
+
+    Args:
+        columns: open / high / low / close of the tickers, in group order
+        lengths: Bars per ticker
+        grid: Values of N, tp_k, sl_k and vol_window
+        params: Fixed labeling parameters (tp_pct, sl_pct, vol_is_pct,
+            use_hl, tie_policy, min_ret)
+
+    Returns:
+        Combination (N, tp_k, sl_k, vol_window) to a (3 labels x
+        ``HIT_TYPES``) count matrix
+    """
+    max_n = max(grid['N'])
+    counts: Dict[Combo, np.ndarray] = {}
+    bounds = np.concatenate([[0], np.cumsum(lengths)])
+
+    for start, stop in zip(bounds[:-1], bounds[1:]):
+        close = columns['close'][start:stop].astype(np.float64)
+        openp = columns['open'][start:stop].astype(np.float64) if 'open' in columns else close
+        high = columns['high'][start:stop].astype(np.float64) if params['use_hl'] else close
+        low = columns['low'][start:stop].astype(np.float64) if params['use_hl'] else close
+        n = len(close)
+        if n < 2 or n < min(grid['N']) + min(grid['vol_window']):
+            continue
+
+        # Forward windows of the largest N, shared by every combination
+        padding = np.full(max_n, np.nan)
+        high_ahead = sliding_window_view(np.concatenate([high[1:], padding]), max_n)[:-1]
+        low_ahead = sliding_window_view(np.concatenate([low[1:], padding]), max_n)[:-1]
+        p0 = close[:-1]
+
+        for vol_window in grid['vol_window']:
+            if n < min(grid['N']) + vol_window:
+                continue
+            vol = rolling_volatility(pd.Series(close), window=vol_window).to_numpy()[:-1]
+            upper, first_up = {}, {}
+            for tp_k in grid['tp_k']:
+                upper[tp_k], _ = barrier_levels(p0, vol, tp_pct=params['tp_pct'], tp_k=tp_k,
+                                                vol_is_pct=params['vol_is_pct'])
+                first_up[tp_k] = _first_offsets(high_ahead, high_ahead >= upper[tp_k][:, None])
+            lower, first_dn = {}, {}
+            for sl_k in grid['sl_k']:
+                _, lower[sl_k] = barrier_levels(p0, vol, sl_pct=params['sl_pct'], sl_k=sl_k,
+                                                vol_is_pct=params['vol_is_pct'])
+                first_dn[sl_k] = _first_offsets(low_ahead, low_ahead <= lower[sl_k][:, None])
+
+            for tp_k, sl_k in itertools.product(grid['tp_k'], grid['sl_k']):
+                ub, lb = upper[tp_k], lower[sl_k]
+                has_barrier = ~((ub == np.inf) & (lb == -np.inf))
+                fu, fd = first_up[tp_k], first_dn[sl_k]
+                first = np.minimum(fu, fd)
+                for N in grid['N']:
+                    # Skipped like apply_triple_barrier_labeling skips short tickers
+                    if n < N + vol_window:
+                        continue
+                    hit = (first < N) & has_barrier
+                    labels, hit_code, _, _ = resolve_barrier_hits(
+                        close, openp, ub, lb, np.where(hit, first, -1), hit & (fu == first), hit & (fd == first),
+                        N, params['tie_policy'], params['min_ret'],
+                    )
+                    cells = (labels.astype(np.int64) + 1) * len(HIT_TYPES) + hit_code
+                    matrix = np.bincount(cells, minlength=3 * len(HIT_TYPES)).reshape(3, len(HIT_TYPES))
+                    combo = (N, tp_k, sl_k, vol_window)
+                    counts[combo] = counts[combo] + matrix if combo in counts else matrix
+
+    return counts
+
+
+def _search_chunk(task: Dict[str, Any]) -> Tuple[Dict[Combo, np.ndarray], float]:
+    """Worker: label counts of a chunk of tickers from shared memory"""
+    started = time.perf_counter()
+    start, stop = task['rows']
+    columns = {name: values[start:stop] for name, values in attach_shared(task['spec']).items()}
+    return _search_tickers(columns, task['lengths'], task['grid'], task['params']), time.perf_counter() - started
+
+
+def search_labeling_params(
+    data: pd.DataFrame,
+    config: Dict[str, Any],
+    n_workers: int = 1
+) -> pd.DataFrame:
+    """Evaluate every labeling parameter combination of optimization.param_grid
+
+    Each combination is scored as if the data had been labeled by
+    ``apply_triple_barrier_labeling`` with those parameters (tickers shorter
+    than N + vol_window are skipped the same way) and passed to
+    ``analyze_labeling_quality``, without labeling the data once per
+    combination. With several workers, tickers are split across a process
+    pool over shared-memory price columns.
+
+    Args:
+        data: Market data with ticker, timestamp and OHLC columns
+        config: Configuration with labeling, labels and optimization sections
+        n_workers: Worker processes
+
+    Returns:
+        One row per combination with the label distribution, hit type
+        counts and balance score, ranked by balance score (best first)
+    """
+    labeling_config = config.get('labeling', {})
+    optimization = config.get('optimization', {})
+    param_grid = optimization.get('param_grid', {})
+    missing = [key for key in GRID_KEYS if not param_grid.get(key)]
+    if missing:
+        raise ValueError(f"optimization.param_grid needs values for {missing}")
+    grid = {
+        'N': [int(v) for v in param_grid['N']],
+        'tp_k': [float(v) for v in param_grid['tp_k']],
+        'sl_k': [float(v) for v in param_grid['sl_k']],
+        'vol_window': [int(v) for v in param_grid['vol_window']],
+    }
+    barriers = labeling_config.get('barriers', {})
+    params = {
+        'tp_pct': barriers.get('tp_pct'),
+        'sl_pct': barriers.get('sl_pct'),
+        'vol_is_pct': labeling_config.get('volatility', {}).get('is_percentage', True),
+        'use_hl': labeling_config.get('use_hl', True),
+        'tie_policy': labeling_config.get('tie_policy', 'ambiguous'),
+        'min_ret': labeling_config.get('min_ret', 0.002),
+    }
+    if params['tp_pct'] is not None or params['sl_pct'] is not None:
+        logger.warning("Fixed tp_pct / sl_pct barriers override the searched tp_k / sl_k")
+    n_combos = int(np.prod([len(values) for values in grid.values()]))
+    if optimization.get('metric'):
+        logger.info(f"Label search ranks by balance score; optimization.metric "
+                    f"'{optimization['metric']}' needs a trained model")
+
+    started = time.perf_counter()
+    if 'ticker' in data.columns:
+        panel = Panel(data, columns=[])
+        base = panel.to_long()
+        lengths = panel.lengths
+    else:
+        base = data
+        lengths = np.array([len(data)])
+    raw = {col: base[col].to_numpy() for col in ('open', 'high', 'low', 'close') if col in base.columns}
+
+    if n_workers > 1 and len(lengths) > 1:
+        bounds = np.concatenate([[0], np.cumsum(lengths)])
+        chunks = partition_tickers(lengths, n_workers)
+        with SharedColumns(raw) as shared:
+            tasks = [{
+                'spec': shared.spec,
+                'rows': (int(bounds[first]), int(bounds[stop])),
+                'lengths': lengths[first:stop],
+                'grid': grid,
+                'params': params,
+            } for first, stop in chunks]
+            with ProcessPoolExecutor(max_workers=min(n_workers, len(tasks))) as executor:
+                outputs = list(executor.map(_search_chunk, tasks))
+        for (first, stop), (_, seconds) in zip(chunks, outputs):
+            logger.info(f"Label search chunk of {stop - first} tickers in {seconds:.2f}s")
+        counts: Dict[Combo, np.ndarray] = {}
+        for chunk_counts, _ in outputs:
+            for combo, matrix in chunk_counts.items():
+                counts[combo] = counts[combo] + matrix if combo in counts else matrix
+    else:
+        counts = _search_tickers(raw, lengths, grid, params)
+
+    rows = []
+    label_values = np.array([-1, 0, 1])
+    for combo in itertools.product(grid['N'], grid['tp_k'], grid['sl_k'], grid['vol_window']):
+        row = dict(zip(GRID_KEYS, combo))
+        matrix = counts.get(combo)
+        if matrix is None:
+            row['total_labels'] = 0
+            rows.append(row)
+            continue
+        # Labeled bars rebuilt from the counts, for analyze_labeling_quality
+        labels, hit_types = np.nonzero(matrix)
+        repeats = matrix[labels, hit_types]
+        labeled = pd.DataFrame({
+            'label': np.repeat(label_values[labels], repeats),
+            'hit_type': pd.Categorical.from_codes(np.repeat(hit_types, repeats), categories=HIT_TYPES),
+        })
+        quality = analyze_labeling_quality(labeled, config)
+        row['total_labels'] = quality['total_labels']
+        for label, name in ((-1, 'sell'), (0, 'hold'), (1, 'buy')):
+            row[f'{name}_pct'] = quality['label_distribution'][label]['percentage']
+        for hit_type in HIT_TYPES:
+            row[f'hit_{hit_type}'] = quality['hit_type_distribution'].get(hit_type, 0)
+        row['balance_score'] = quality.get('balance_score', np.nan)
+        rows.append(row)
+
+    table = pd.DataFrame(rows)
+    table = table.sort_values('balance_score', kind='stable', na_position='last').reset_index(drop=True)
+    table.insert(0, 'rank', np.arange(1, len(table) + 1))
+    logger.info(f"Label search: {n_combos} combinations over {len(lengths)} tickers, {len(base)} bars "
+                f"in {time.perf_counter() - started:.2f}s")
+    return table
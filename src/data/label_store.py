@@ -0,0 +1,193 @@
+"""Incrementally maintained triple-barrier labels"""
+
+from typing import Any, Dict, Optional
+
+import numpy as np
+import pandas as pd
+from loguru import logger
+
+from .labeling import label_ticker, labeling_params
+from .market_store import MarketDataStore
+from .schema import apply_schema
+
+# Columns added by labeling
+LABEL_COLUMNS = ('label', 'hit_time', 'hit_type', 'ub', 'lb', 'vbar_end')
+
+
+def relabel_context(params: Dict[str, Any]) -> int:
+    """Stored bars needed before the first new bar to relabel a ticker's tail
+
+    The label of bar i only depends on bars i..i+N and on its volatility,
+    which looks vol_window returns (vol_window + 1 closes) back; a new bar at
+    position f can only change the labels from f - N on.
+
+    Args:
+        params: ``labeling_params`` output
+
+    Returns:
+        N + vol_window + 1
+    """
+    return params['N'] + params['vol_window'] + 1
+
+
+def label_bars(bars: pd.DataFrame, params: Dict[str, Any]) -> pd.DataFrame:
+    """Label one ticker's bars, indexed by timestamp
+
+    hit_time and vbar_end hold the timestamp of the exit bar, so stored
+    labels stay valid when bars are appended. Tickers shorter than
+    N + vol_window are left unlabeled, as in ``apply_triple_barrier_labeling``.
+
+    Args:
+        bars: Bars of a single ticker in time order, with a timestamp column
+        params: ``labeling_params`` output
+
+    Returns:
+        bars with the label columns added
+    """
+    if len(bars) < params['N'] + params['vol_window']:
+        labels = pd.DataFrame({
+            'label': np.nan, 'hit_time': pd.NaT, 'hit_type': None,
+            'ub': np.nan, 'lb': np.nan, 'vbar_end': pd.NaT,
+        }, index=bars.index)
+    else:
+        labels = label_ticker(bars.set_index('timestamp'), params).set_axis(bars.index)
+    return pd.concat([bars, labels], axis=1)
+
+
+def relabel_incremental(
+    stored: pd.DataFrame,
+    new_bars: pd.DataFrame,
+    config: Dict[str, Any]
+) -> pd.DataFrame:
+    """Labeled rows to write after new bars arrive
+
+    ``stored`` holds, per ticker, either its whole stored history or a
+    trailing part with at least ``relabel_context`` bars before the first
+    new bar (fewer means it is the whole history, which is then relabeled).
+    Only the bars from N before the first new bar on are relabeled, with
+    vol_window + 1 bars of context for the volatility; the result is the
+    same as labeling the ticker's full history with ``label_bars``. New bars
+    replace stored bars with the same timestamp.
+
+    Args:
+        stored: Stored labeled bars with ticker and timestamp columns
+        new_bars: New raw bars with ticker and timestamp columns
+        config: Configuration with the labeling section
+
+    Returns:
+        Relabeled and new rows, with the label columns, to append to the store
+    """
+    params = labeling_params(config)
+    context = relabel_context(params)
+    new_bars = new_bars.assign(timestamp=pd.to_datetime(new_bars['timestamp']))
+
+    patches = []
+    for ticker, new in new_bars.groupby('ticker', sort=False, observed=True):
+        old = stored[stored['ticker'] == ticker] if len(stored) else stored
+        raw_columns = [col for col in old.columns if col not in LABEL_COLUMNS]
+        bars = (pd.concat([old[raw_columns], new], ignore_index=True)
+                .drop_duplicates(subset=['timestamp'], keep='last')
+                .sort_values('timestamp', kind='stable')
+                .reset_index(drop=True))
+
+        first = int(bars['timestamp'].searchsorted(new['timestamp'].min()))
+        if first < context:
+            start, window = 0, bars
+        else:
+            start = first - params['N']
+            window = bars.iloc[first - context:].reset_index(drop=True)
+
+        labeled = label_bars(window, params)
+        patches.append(labeled.iloc[len(window) - (len(bars) - start):])
+        logger.debug(f"Relabeled {ticker}: {len(bars) - start} rows ({len(new)} new bars)")
+
+    if not patches:
+        return pd.DataFrame()
+    return apply_schema(pd.concat(patches, ignore_index=True))
+
+
+class LabelStore(MarketDataStore):
+    """Labeled bars partitioned by ticker and year, updated incrementally
+
+    Same layout and append semantics as ``MarketDataStore``, with the label
+    columns stored next to the bars (see ``label_bars``). ``update`` only
+    reads the partitions holding the trailing context of each ticker and
+    rewrites the ones receiving relabeled or new rows.
+    """
+
+    def __init__(self, root: str = "data/store/labels"):
+        """Initialize store
+
+        Args:
+            root: Root directory of the store
+        """
+        super().__init__(root)
+
+    def tail(self, ticker: str, since: pd.Timestamp, bars: int) -> pd.DataFrame:
+        """Stored rows of ticker from since on, plus the bars rows before it
+
+        Partitions are read newest first, stopping once enough earlier rows
+        are loaded.
+
+        Args:
+            ticker: Ticker to read
+            since: First timestamp of the new bars
+            bars: Rows needed before since
+
+        Returns:
+            Stored rows in time order, empty when the ticker is not stored
+        """
+        ticker_dir = self.root / f"ticker={ticker}"
+        paths = sorted(ticker_dir.glob("year=*.parquet"), key=lambda path: int(path.stem.split('=')[1]))
+        frames, before = [], 0
+        for path in reversed(paths):
+            part = pd.read_parquet(path)
+            frames.append(part)
+            before += int((part['timestamp'] < since).sum())
+            if before >= bars:
+                break
+
+        if not frames:
+            return pd.DataFrame()
+        rows = pd.concat(frames[::-1], ignore_index=True)
+        first = max(int(rows['timestamp'].searchsorted(since)) - bars, 0)
+        return rows.iloc[first:].reset_index(drop=True)
+
+    def update(self, new_bars: pd.DataFrame, config: Dict[str, Any]) -> pd.DataFrame:
+        """Append new bars and patch the labels they change
+
+        Args:
+            new_bars: New raw bars with ticker and timestamp columns
+            config: Configuration with the labeling section
+
+        Returns:
+            Rows written (relabeled and new bars, with labels)
+        """
+        if new_bars.empty:
+            return pd.DataFrame()
+        context = relabel_context(labeling_params(config))
+        new_bars = new_bars.assign(timestamp=pd.to_datetime(new_bars['timestamp']))
+
+        stored = [self.tail(str(ticker), new['timestamp'].min(), context)
+                  for ticker, new in new_bars.groupby('ticker', sort=False, observed=True)]
+        stored = [frame for frame in stored if not frame.empty]
+        patch = relabel_incremental(pd.concat(stored, ignore_index=True) if stored else pd.DataFrame(),
+                                    new_bars, config)
+        self.append(patch)
+        logger.info(f"Label store: {len(new_bars)} new bars, {len(patch)} rows written")
+        return patch
+
+
+def create_label_store(config: Dict[str, Any]) -> Optional[LabelStore]:
+    """Create the label store from labeling.store, None when disabled
+
+    Args:
+        config: Configuration with an optional labeling.store section
+
+    Returns:
+        LabelStore instance or None
+    """
+    store_config = (config or {}).get('labeling', {}).get('store', {})
+    if not store_config.get('enabled', False):
+        return None
+    return LabelStore(store_config.get('dir', 'data/store/labels'))
@@ -1,14 +1,45 @@
 """Triple-barrier labeling implementation"""
 
+import os
+import time
+import traceback
+from concurrent.futures import ProcessPoolExecutor
+
 import numpy as np
 import pandas as pd
-from typing import Optional, Dict, Any
+from numpy.lib.stride_tricks import sliding_window_view
+from typing import Optional, Dict, Any, Iterable, List, Tuple
 from loguru import logger
 
+from .panel import Panel
+from .parallel_features import SharedColumns, attach_shared, partition_tickers
+from .schema import apply_schema
+from ..utils.jit import NUMBA_AVAILABLE, jit
+
+# Bars per block of forward windows; bounds the (rows x N) touch masks
+_CHUNK_ROWS = 1 << 16
+
+# Columns shipped to labeling workers, plus the row index (hit_time and
+# vbar_end hold index values)
+_PRICE_COLUMNS = ('open', 'high', 'low', 'close')
+_INDEX_COLUMN = '__index__'
+
+# Tickers differ in length, so each worker gets several chunks
+_CHUNKS_PER_WORKER = 4
+
+# Values of the hit_type column
+HIT_TYPES = ('tp', 'sl', 'both', 'vbar_neutral', 'vbar_sign', 'none')
+HIT_CODES = {name: code for code, name in enumerate(HIT_TYPES)}
+
 
 def rolling_volatility(close: pd.Series, window: int = 20, method: str = 'std') -> pd.Series:
     """Calculate rolling volatility for barrier scaling
 
+    The standard deviation of each window is computed from that window's
+    returns alone (no running sums carried along the series), so a tail of
+    the series with ``window`` bars of context before it gets exactly the
+    same values as the full history; incremental relabeling relies on this.
+
     Args:
         close: Close price series
         window: Rolling window size
@@ -18,8 +49,17 @@ def rolling_volatility(close: pd.Series, window: int = 20, method: str = 'std')
         Volatility series
     """
     if method == 'std':
-        returns = close.pct_change()
-        vol = returns.rolling(window, min_periods=window//2).std()
+        returns = close.astype(np.float64).pct_change().to_numpy(dtype=np.float64, na_value=np.nan)
+        # Windows of the previous `window` returns, padded at the start
+        padded = np.concatenate([np.full(window - 1, np.nan), returns])
+        windows = sliding_window_view(padded, window) if len(returns) else np.empty((0, window))
+        valid = ~np.isnan(windows)
+        count = valid.sum(axis=1)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            mean = np.where(valid, windows, 0.0).sum(axis=1) / count
+            deviation = np.where(valid, windows - mean[:, None], 0.0)
+            std = np.sqrt((deviation * deviation).sum(axis=1) / (count - 1))
+        vol = pd.Series(np.where(count >= max(window // 2, 2), std, np.nan), index=close.index)
         # Replace inf and extremely large values with NaN
         vol = vol.replace([np.inf, -np.inf], np.nan)
         return vol
@@ -27,6 +67,208 @@ def rolling_volatility(close: pd.Series, window: int = 20, method: str = 'std')
         raise ValueError(f"Method {method} not implemented. Use 'std'.")
 
 
+def _first_touch_numpy(
+    high: np.ndarray,
+    low: np.ndarray,
+    ub: np.ndarray,
+    lb: np.ndarray,
+    has_barrier: np.ndarray,
+    N: int
+):
+    """First barrier touch of every bar within its next N bars, vectorized
+
+    Each bar's next N highs / lows are strided views over the price arrays;
+    the first touching bar is the argmax of the touch mask.
+
+    Args:
+        high: High prices (n bars)
+        low: Low prices (n bars)
+        ub: Upper barrier of the first n - 1 bars
+        lb: Lower barrier of the first n - 1 bars
+        has_barrier: Whether a bar has any finite barrier
+        N: Vertical barrier
+
+    Returns:
+        Offset of the touching bar after i + 1 (-1 when none), and whether
+        it touched the upper and the lower barrier
+    """
+    rows = len(ub)
+    first_hit = np.full(rows, -1, dtype=np.int64)
+    touch_up = np.zeros(rows, dtype=bool)
+    touch_dn = np.zeros(rows, dtype=bool)
+    if N <= 0:
+        return first_hit, touch_up, touch_dn
+
+    # NaN padding past the end never touches
+    padding = np.full(N, np.nan)
+    high_ahead = sliding_window_view(np.concatenate([high[1:], padding]), N)
+    low_ahead = sliding_window_view(np.concatenate([low[1:], padding]), N)
+    for start in range(0, rows, _CHUNK_ROWS):
+        chunk = slice(start, min(start + _CHUNK_ROWS, rows))
+        up = high_ahead[chunk] >= ub[chunk, None]
+        dn = low_ahead[chunk] <= lb[chunk, None]
+        touched = up | dn
+        first = touched.argmax(axis=1)
+        positions = np.arange(len(first))
+        hit = touched[positions, first] & has_barrier[chunk]
+        first_hit[chunk] = np.where(hit, first, -1)
+        touch_up[chunk] = hit & up[positions, first]
+        touch_dn[chunk] = hit & dn[positions, first]
+    return first_hit, touch_up, touch_dn
+
+
+@jit
+def _first_touch_jit(high, low, ub, lb, has_barrier, N):
+    """Loop kernel of ``_first_touch_numpy``; stops at each bar's first touch"""
+    rows = len(ub)
+    n = len(high)
+    first_hit = np.full(rows, -1, dtype=np.int64)
+    touch_up = np.zeros(rows, dtype=np.bool_)
+    touch_dn = np.zeros(rows, dtype=np.bool_)
+    for i in range(rows):
+        if not has_barrier[i]:
+            continue
+        for j in range(i + 1, min(i + N, n - 1) + 1):
+            up = high[j] >= ub[i]
+            dn = low[j] <= lb[i]
+            if up or dn:
+                first_hit[i] = j - i - 1
+                touch_up[i] = up
+                touch_dn[i] = dn
+                break
+    return first_hit, touch_up, touch_dn
+
+
+# Compiled loop when Numba is installed, strided NumPy otherwise
+first_barrier_touch = _first_touch_jit if NUMBA_AVAILABLE else _first_touch_numpy
+
+
+def barrier_levels(
+    p0: np.ndarray,
+    vol: Optional[np.ndarray],
+    tp_pct: Optional[float] = None,
+    sl_pct: Optional[float] = None,
+    tp_k: Optional[float] = None,
+    sl_k: Optional[float] = None,
+    vol_is_pct: bool = True
+):
+    """Upper and lower barrier of every entry bar
+
+    Fixed percentages take precedence over volatility multiples; a missing
+    barrier (or a bar without finite volatility) is +inf / -inf.
+
+    Args:
+        p0: Entry close prices
+        vol: Volatility of each entry bar, None when not available
+        tp_pct: Fixed take profit percentage
+        sl_pct: Fixed stop loss percentage
+        tp_k: Take profit volatility multiplier
+        sl_k: Stop loss volatility multiplier
+        vol_is_pct: Whether volatility is in percentage terms
+
+    Returns:
+        Upper and lower barrier arrays
+    """
+    rows = len(p0)
+    vol_ok = np.isfinite(vol) if vol is not None else None
+    with np.errstate(invalid='ignore', over='ignore'):
+        if tp_pct is not None:
+            ub = p0 * (1 + tp_pct)
+        elif tp_k is not None and vol is not None:
+            ub = p0 * (1 + tp_k * vol) if vol_is_pct else p0 + tp_k * vol
+            ub = np.where(vol_ok, ub, np.inf)
+        else:
+            ub = np.full(rows, np.inf)
+
+        if sl_pct is not None:
+            lb = p0 * (1 - sl_pct)
+        elif sl_k is not None and vol is not None:
+            lb = p0 * (1 - sl_k * vol) if vol_is_pct else p0 - sl_k * vol
+            lb = np.where(vol_ok, lb, -np.inf)
+        else:
+            lb = np.full(rows, -np.inf)
+    return ub, lb
+
+
+def resolve_barrier_hits(
+    close: np.ndarray,
+    openp: np.ndarray,
+    ub: np.ndarray,
+    lb: np.ndarray,
+    first_hit: np.ndarray,
+    touch_up: np.ndarray,
+    touch_dn: np.ndarray,
+    N: int,
+    tie_policy: str = 'ambiguous',
+    min_ret: Optional[float] = None
+):
+    """Labels of every bar from its first barrier touch (or the vertical barrier)
+
+    Args:
+        close: Close prices (n bars)
+        openp: Open prices, used by the 'closest' tie policy
+        ub: Upper barrier of the first n - 1 bars
+        lb: Lower barrier of the first n - 1 bars
+        first_hit: Offset of the first touching bar after i + 1, -1 when none
+        touch_up: Whether that bar touched the upper barrier
+        touch_dn: Whether that bar touched the lower barrier
+        N: Vertical barrier
+        tie_policy: Policy when both barriers hit ('ambiguous', 'tp', 'sl', 'closest')
+        min_ret: Minimum return for neutral zone
+
+    Returns:
+        Labels (n, int8) and hit type codes (n, int8, positions in
+        ``HIT_TYPES``), plus for the first n - 1 bars the exit bar position
+        and whether it is the vertical barrier; the last bar keeps label 0
+        and hit type 'none'
+    """
+    n = len(close)
+    rows = len(ub)
+    labels = np.zeros(n, dtype=np.int8)
+    hit_code = np.full(n, HIT_CODES['none'], dtype=np.int8)
+    exit_bar = np.empty(rows, dtype=np.int64)
+
+    decided = first_hit >= 0
+    hit_rows = np.flatnonzero(decided)
+    j = hit_rows + 1 + first_hit[hit_rows]
+    up, dn = touch_up[hit_rows], touch_dn[hit_rows]
+    hit_labels = np.where(up & ~dn, 1, np.where(dn & ~up, -1, 0))
+    hit_codes = np.where(up & ~dn, HIT_CODES['tp'], np.where(dn & ~up, HIT_CODES['sl'], HIT_CODES['none']))
+
+    # Both barriers touched in the same bar
+    tie = up & dn
+    if tie_policy == 'ambiguous':
+        hit_codes[tie] = HIT_CODES['both']
+    elif tie_policy == 'tp':
+        hit_labels[tie], hit_codes[tie] = 1, HIT_CODES['tp']
+    elif tie_policy == 'sl':
+        hit_labels[tie], hit_codes[tie] = -1, HIT_CODES['sl']
+    elif tie_policy == 'closest':
+        # Use open price to determine closest barrier
+        du = np.abs(ub[hit_rows] - openp[j])
+        dl = np.abs(openp[j] - lb[hit_rows])
+        closest = np.where(du < dl, 1, np.where(dl < du, -1, 0))
+        hit_labels[tie] = closest[tie]
+        # Indexed by label: 0 -> both, 1 -> tp, -1 -> sl
+        hit_codes[tie] = np.array([HIT_CODES['both'], HIT_CODES['tp'], HIT_CODES['sl']])[closest[tie]]
+
+    labels[hit_rows] = hit_labels
+    hit_code[hit_rows] = hit_codes
+    exit_bar[hit_rows] = j
+
+    # Vertical barrier (time-based exit)
+    vbar_rows = np.flatnonzero(~decided)
+    j_end = np.minimum(vbar_rows + N, n - 1)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        ret = close[j_end] / close[vbar_rows] - 1.0
+        neutral = np.abs(ret) < min_ret if min_ret is not None else np.zeros(len(ret), dtype=bool)
+        labels[vbar_rows] = np.where(neutral, 0, np.sign(ret)).astype(np.int8)
+    hit_code[vbar_rows] = np.where(neutral, HIT_CODES['vbar_neutral'], HIT_CODES['vbar_sign'])
+    exit_bar[vbar_rows] = j_end
+
+    return labels, hit_code, exit_bar, ~decided
+
+
 def event_driven_labels(
     df: pd.DataFrame,
     N: int = 20,
@@ -43,6 +285,11 @@ def event_driven_labels(
     """
     Create event-driven labels using triple-barrier method
 
+    The first bar touching either barrier is found by
+    ``first_barrier_touch`` (a Numba kernel when available, strided NumPy
+    windows otherwise); barriers, ties and the vertical barrier are
+    resolved with array ops.
+
     Args:
         df: DataFrame with OHLC data
         N: Vertical barrier (maximum holding days)
@@ -67,10 +314,89 @@ def event_driven_labels(
         if col not in df.columns:
             raise ValueError(f"Required column '{col}' not found in DataFrame")
 
-    close = df['close'].values
-    high = df['high'].values if use_hl and 'high' in df else close
-    low = df['low'].values if use_hl and 'low' in df else close
-    openp = df['open'].values if 'open' in df else close
+    # Barrier arithmetic runs in float64 whatever the storage dtype
+    close = df['close'].to_numpy(dtype=np.float64)
+    high = df['high'].to_numpy(dtype=np.float64) if use_hl and 'high' in df else close
+    low = df['low'].to_numpy(dtype=np.float64) if use_hl and 'low' in df else close
+    openp = df['open'].to_numpy(dtype=np.float64) if 'open' in df else close
+
+    n = int(len(df))
+    if n <= 0:
+        raise ValueError(f"Invalid dataframe length: {n}")
+
+    labels = np.zeros(n, dtype=np.int8)
+    nat_value = np.datetime64('NaT')
+    hit_time = np.full(n, nat_value, dtype='datetime64[ns]')
+    hit_type = np.full(n, 'none', dtype=object)
+    ub_arr = np.full(n, np.nan)
+    lb_arr = np.full(n, np.nan)
+    end_time = np.full(n, nat_value, dtype='datetime64[ns]')
+    if n < 2:
+        return pd.DataFrame({'label': labels, 'hit_time': hit_time, 'hit_type': hit_type,
+                             'ub': ub_arr, 'lb': lb_arr, 'vbar_end': end_time}, index=df.index)
+
+    # Barriers of every bar but the last
+    rows = n - 1
+    vol_values = vol.to_numpy(dtype=np.float64, na_value=np.nan)[:rows] if vol is not None else None
+    ub, lb = barrier_levels(close[:rows], vol_values, tp_pct, sl_pct, tp_k, sl_k, vol_is_pct)
+    ub_arr[:rows], lb_arr[:rows] = ub, lb
+    has_barrier = ~((ub == np.inf) & (lb == -np.inf))
+
+    first_hit, touch_up, touch_dn = first_barrier_touch(high, low, ub, lb, has_barrier, int(N))
+    labels, hit_code, exit_bar, vertical = resolve_barrier_hits(
+        close, openp, ub, lb, first_hit, touch_up, touch_dn, N, tie_policy, min_ret
+    )
+    hit_type = np.array(HIT_TYPES, dtype=object)[hit_code]
+
+    idx = np.asarray(df.index)
+    hit_time[:rows] = idx[exit_bar]
+    vbar_rows = np.flatnonzero(vertical)
+    end_time[vbar_rows] = idx[exit_bar[vbar_rows]]
+
+    # Create output DataFrame
+    result = pd.DataFrame({
+        'label': labels,
+        'hit_time': hit_time,
+        'hit_type': hit_type,
+        'ub': ub_arr,
+        'lb': lb_arr,
+        'vbar_end': end_time
+    }, index=df.index)
+
+    return result
+
+
+def _event_driven_labels_loop(
+    df: pd.DataFrame,
+    N: int = 20,
+    tp_pct: Optional[float] = None,
+    sl_pct: Optional[float] = None,
+    tp_k: Optional[float] = None,
+    sl_k: Optional[float] = None,
+    vol: Optional[pd.Series] = None,
+    vol_is_pct: bool = True,
+    use_hl: bool = True,
+    tie_policy: str = 'ambiguous',
+    min_ret: Optional[float] = None
+) -> pd.DataFrame:
+    """Reference triple-barrier labeling: a Python loop over every bar and its next N bars
+
+    Same arguments and output as ``event_driven_labels``, which must match
+    it exactly (``python benchmark.py labeling`` checks this).
+    """
+    required_cols = ['close']
+    if use_hl:
+        required_cols.extend(['high', 'low'])
+
+    for col in required_cols:
+        if col not in df.columns:
+            raise ValueError(f"Required column '{col}' not found in DataFrame")
+
+    # Barrier arithmetic runs in float64 whatever the storage dtype
+    close = df['close'].to_numpy(dtype=np.float64)
+    high = df['high'].to_numpy(dtype=np.float64) if use_hl and 'high' in df else close
+    low = df['low'].to_numpy(dtype=np.float64) if use_hl and 'low' in df else close
+    openp = df['open'].to_numpy(dtype=np.float64) if 'open' in df else close
 
     n = int(len(df))  # Ensure n is integer
 
@@ -214,93 +540,221 @@ def event_driven_labels(
     return result
 
 
-def apply_triple_barrier_labeling(
-    data: pd.DataFrame,
-    config: Dict[str, Any]
-) -> pd.DataFrame:
-    """Apply triple-barrier labeling to grouped data
-
-    Args:
-        data: DataFrame with OHLC data and ticker column
-        config: Labeling configuration
+def labeling_params(config: Dict[str, Any]) -> Dict[str, Any]:
+    """Triple-barrier parameters of the labeling config
 
     Returns:
-        DataFrame with labels added
+        Keyword arguments of ``event_driven_labels`` plus vol_window
     """
     labeling_config = config.get('labeling', {})
-
-    # Extract parameters (ensure integer types)
-    N = int(labeling_config.get('vertical_barrier', {}).get('days', 10))
     barriers = labeling_config.get('barriers', {})
-    tp_pct = barriers.get('tp_pct')
-    sl_pct = barriers.get('sl_pct')
-    tp_k = float(barriers.get('tp_k', 2.0)) if barriers.get('tp_k') is not None else None
-    sl_k = float(barriers.get('sl_k', 1.0)) if barriers.get('sl_k') is not None else None
-
     vol_config = labeling_config.get('volatility', {})
-    vol_window = int(vol_config.get('window', 20))
-    vol_is_pct = vol_config.get('is_percentage', True)
+    return {
+        'N': int(labeling_config.get('vertical_barrier', {}).get('days', 10)),
+        'tp_pct': barriers.get('tp_pct'),
+        'sl_pct': barriers.get('sl_pct'),
+        'tp_k': float(barriers.get('tp_k', 2.0)) if barriers.get('tp_k') is not None else None,
+        'sl_k': float(barriers.get('sl_k', 1.0)) if barriers.get('sl_k') is not None else None,
+        'vol_window': int(vol_config.get('window', 20)),
+        'vol_is_pct': vol_config.get('is_percentage', True),
+        'tie_policy': labeling_config.get('tie_policy', 'ambiguous'),
+        'min_ret': labeling_config.get('min_ret', 0.002),
+        'use_hl': labeling_config.get('use_hl', True),
+    }
 
-    tie_policy = labeling_config.get('tie_policy', 'ambiguous')
-    min_ret = labeling_config.get('min_ret', 0.002)
-    use_hl = labeling_config.get('use_hl', True)
 
-    def apply_labeling_to_ticker(df):
-        """Apply labeling to single ticker data"""
-        ticker = df['ticker'].iloc[0] if 'ticker' in df.columns else 'unknown'
+def label_ticker(df: pd.DataFrame, params: Dict[str, Any]) -> pd.DataFrame:
+    """Label columns of one ticker's bars
 
-        if len(df) < N + vol_window:
-            logger.warning(f"⏭️ Skipping {ticker}, insufficient data")
-            return df
+    Args:
+        df: Bars of a single ticker, in time order
+        params: ``labeling_params`` output
 
-        # Try-catch toàn bộ để bắt lỗi rõ ràng
+    Returns:
+        Output of ``event_driven_labels`` on df's index
+    """
+    kwargs = {key: value for key, value in params.items() if key != 'vol_window'}
+    vol = rolling_volatility(df['close'], window=params['vol_window'])
+    return event_driven_labels(df=df, vol=vol, **kwargs)
+
+
+def _label_groups(
+    groups: Iterable[Tuple[Any, pd.DataFrame]],
+    params: Dict[str, Any]
+) -> Tuple[List[Tuple[int, pd.DataFrame]], List[Dict[str, Any]]]:
+    """Label tickers one at a time, recording the ones left unlabeled
+
+    Args:
+        groups: (ticker, bars) pairs
+        params: ``labeling_params`` output
+
+    Returns:
+        (position in groups, label columns) of each labeled ticker, and one
+        record (ticker, rows, reason, error, message, traceback) per skipped
+        or failed ticker
+    """
+    labeled, problems = [], []
+    for position, (ticker, df) in enumerate(groups):
+        record = {'ticker': str(ticker), 'rows': len(df)}
+        if len(df) < params['N'] + params['vol_window']:
+            problems.append({**record, 'reason': 'insufficient_data', 'error': None,
+                             'message': f"{len(df)} bars < N + vol_window "
+                                        f"({params['N'] + params['vol_window']})",
+                             'traceback': None})
+            continue
         try:
-            vol = rolling_volatility(df['close'], window=vol_window)
-
-            labels = event_driven_labels(
-                df=df,
-                N=int(N),
-                tp_pct=tp_pct,
-                sl_pct=sl_pct,
-                tp_k=tp_k,
-                sl_k=sl_k,
-                vol=vol,
-                vol_is_pct=vol_is_pct,
-                use_hl=use_hl,
-                tie_policy=tie_policy,
-                min_ret=min_ret
-            )
-            return df.join(labels)
+            labeled.append((position, label_ticker(df, params)))
         except Exception as e:
-            logger.error(f"❌ Failed to label ticker {ticker}: {e}")
-            logger.error(f"Debug info - df shape: {df.shape}, N: {N}, vol_window: {vol_window}")
-            logger.error(f"Parameters - tp_k: {tp_k}, sl_k: {sl_k}")
-            import traceback
-            logger.error(f"Full traceback: {traceback.format_exc()}")
-            return df
+            problems.append({**record, 'reason': 'error', 'error': type(e).__name__,
+                             'message': str(e), 'traceback': traceback.format_exc()})
+    return labeled, problems
+
+
+def _label_chunk(task: Dict[str, Any]) -> Tuple[List[Tuple[int, pd.DataFrame]], List[Dict[str, Any]], Dict[str, Any]]:
+    """Worker: label a chunk of tickers from shared memory
+
+    Returns:
+        ``_label_groups`` output, positions relative to the chunk, and
+        timing stats
+    """
+    started = time.perf_counter()
+    start, stop = task['rows']
+    columns = {name: values[start:stop] for name, values in attach_shared(task['spec']).items()}
+    index = columns.pop(_INDEX_COLUMN)
+    bounds = np.concatenate([[0], np.cumsum(task['lengths'])])
+    groups = (
+        (ticker, pd.DataFrame({name: values[first:last] for name, values in columns.items()},
+                              index=index[first:last], copy=False))
+        for ticker, first, last in zip(task['tickers'], bounds[:-1], bounds[1:])
+    )
+    labeled, problems = _label_groups(groups, task['params'])
+    return labeled, problems, {
+        'pid': os.getpid(),
+        'tickers': len(task['lengths']),
+        'rows': stop - start,
+        'seconds': time.perf_counter() - started,
+    }
+
+
+def _label_parallel(
+    data: pd.DataFrame,
+    params: Dict[str, Any],
+    n_workers: int
+) -> Tuple[List[np.ndarray], List[Tuple[int, pd.DataFrame]], List[Dict[str, Any]]]:
+    """Label tickers with a process pool, one chunk of tickers per task
+
+    Tickers are split into contiguous chunks of similar row counts (several
+    per worker, so uneven tickers still even out) and the price columns are
+    copied once into shared memory. Chunks are gathered in submission
+    order, so tickers come back in group order.
+
+    Returns:
+        Row positions of each ticker in data, ``_label_groups`` output
+        (positions in group order) for all tickers
+    """
+    panel = Panel(data, columns=[])
+    bounds = np.concatenate([[0], np.cumsum(panel.lengths)])
+    chunks = partition_tickers(panel.lengths, n_workers * _CHUNKS_PER_WORKER)
+
+    raw = {col: data[col].to_numpy()[panel.order] for col in _PRICE_COLUMNS if col in data.columns}
+    raw[_INDEX_COLUMN] = np.asarray(data.index)[panel.order]
+    with SharedColumns(raw) as shared:
+        tasks = [{
+            'spec': shared.spec,
+            'rows': (int(bounds[first]), int(bounds[stop])),
+            'lengths': panel.lengths[first:stop],
+            'tickers': [str(ticker) for ticker in panel.tickers[first:stop]],
+            'params': params,
+        } for first, stop in chunks]
+        with ProcessPoolExecutor(max_workers=min(n_workers, len(tasks))) as executor:
+            outputs = list(executor.map(_label_chunk, tasks))
+
+    labeled, problems = [], []
+    for (first, _), (chunk_labeled, chunk_problems, stats) in zip(chunks, outputs):
+        labeled.extend((first + position, labels) for position, labels in chunk_labeled)
+        problems.extend(chunk_problems)
+        logger.debug(f"Labeling worker {stats['pid']}: {stats['tickers']} tickers, "
+                     f"{stats['rows']} rows in {stats['seconds']:.2f}s")
+    positions = np.split(panel.order, bounds[1:-1])
+    return positions, labeled, problems
+
+
+def apply_triple_barrier_labeling(
+    data: pd.DataFrame,
+    config: Dict[str, Any],
+    n_workers: Optional[int] = None
+) -> pd.DataFrame:
+    """Apply triple-barrier labeling to grouped data
+
+    Tickers are labeled one at a time, or by a process pool when
+    labeling.n_workers (or n_workers) is above 1; both give the same frame,
+    rows in the original order. Tickers too short to label or whose
+    labeling raised keep their rows without labels and are listed in
+    ``result.attrs['labeling_summary']``:
+    ``{'tickers', 'labeled', 'skipped', 'failed'}``, the last two being
+    lists of {ticker, rows, reason, error, message, traceback} records.
+
+    Args:
+        data: DataFrame with OHLC data and ticker column
+        config: Labeling configuration
+        n_workers: Worker processes, None for labeling.n_workers
+
+    Returns:
+        DataFrame with labels added
+    """
+    params = labeling_params(config)
+    if n_workers is None:
+        n_workers = int(config.get('labeling', {}).get('n_workers', 1))
+    summary = None
 
     if 'ticker' in data.columns:
-        # Group by ticker and apply labeling
-        logger.info("Applying triple-barrier labeling by ticker...")
-        result = data.groupby('ticker', group_keys=False).apply(apply_labeling_to_ticker)
+        started = time.perf_counter()
+        n_tickers = data['ticker'].nunique()
+        parallel = n_workers > 1 and n_tickers > 1
+        if parallel and ('timestamp' not in data.columns or data.index.dtype.kind not in 'iuM'):
+            logger.warning("Parallel labeling needs a timestamp column and a numeric index, running serially")
+            parallel = False
+
+        if parallel:
+            logger.info(f"Applying triple-barrier labeling by ticker on {n_workers} workers...")
+            positions, labeled, problems = _label_parallel(data, params, n_workers)
+        else:
+            logger.info("Applying triple-barrier labeling by ticker...")
+            grouped = data.groupby('ticker', observed=True)
+            positions = list(grouped.indices.values())
+            labeled, problems = _label_groups(grouped, params)
+
+        for problem in problems:
+            if problem['reason'] == 'insufficient_data':
+                logger.warning(f"⏭️ Skipping {problem['ticker']}, insufficient data ({problem['message']})")
+            else:
+                logger.error(f"❌ Failed to label ticker {problem['ticker']} ({problem['rows']} rows): "
+                             f"{problem['error']}: {problem['message']}")
+                logger.debug(f"Full traceback: {problem['traceback']}")
+        summary = {
+            'tickers': n_tickers,
+            'labeled': len(labeled),
+            'skipped': [p for p in problems if p['reason'] == 'insufficient_data'],
+            'failed': [p for p in problems if p['reason'] == 'error'],
+        }
+        if summary['failed']:
+            logger.warning(f"Labeling failed for {len(summary['failed'])} of {n_tickers} tickers: "
+                           f"{[p['ticker'] for p in summary['failed']]}")
+        logger.info(f"Labeled {len(labeled)} of {n_tickers} tickers in {time.perf_counter() - started:.2f}s")
+
+        if labeled:
+            # Label rows back at their tickers' row positions, in the original order
+            labels = pd.concat([frame for _, frame in labeled], ignore_index=True)
+            labels.index = np.concatenate([positions[position] for position, _ in labeled])
+            labels = labels.reindex(np.arange(len(data)))
+            labels.index = data.index
+            result = pd.concat([data, labels], axis=1)
+        else:
+            result = data
     else:
         # Single ticker data
         logger.info("Applying triple-barrier labeling to single ticker...")
-        vol = rolling_volatility(data['close'], window=int(vol_window))
-        labels = event_driven_labels(
-            df=data,
-            N=int(N),
-            tp_pct=tp_pct,
-            sl_pct=sl_pct,
-            tp_k=tp_k, 
-            sl_k=sl_k,
-            vol=vol,
-            vol_is_pct=vol_is_pct,
-            use_hl=use_hl,
-            tie_policy=tie_policy,
-            min_ret=min_ret
-        )
-        result = data.join(labels)
+        result = data.join(label_ticker(data, params))
 
     # Log label distribution
     if 'label' in result.columns:
@@ -313,6 +767,9 @@ def apply_triple_barrier_labeling(
             label_name = {-1: 'Sell', 0: 'Hold', 1: 'Buy'}.get(label, str(label))
             logger.info(f"  {label_name} ({label}): {count} ({pct:.1f}%)")
 
+    result = apply_schema(result)
+    if summary is not None:
+        result.attrs['labeling_summary'] = summary
     return result
 
 
@@ -335,12 +792,37 @@ def analyze_labeling_quality(
     # Remove NaN labels
     labeled_data = data.dropna(subset=['label'])
 
-    if len(labeled_data) == 0:
+    return labeling_quality_from_counts(
+        labeled_data['label'].value_counts(),
+        labeled_data['hit_type'].value_counts(),
+        config
+    )
+
+
+def labeling_quality_from_counts(
+    label_counts: pd.Series,
+    hit_type_counts: pd.Series,
+    config: Dict[str, Any]
+) -> Dict[str, Any]:
+    """Quality metrics of ``analyze_labeling_quality`` from label counts
+
+    Lets callers labeling the data in batches add up the counts instead of
+    keeping the label columns.
+
+    Args:
+        label_counts: Row counts per label value, over the labeled rows
+        hit_type_counts: Row counts per hit type, over the same rows
+        config: Configuration
+
+    Returns:
+        Dictionary with quality metrics
+    """
+    total_labels = int(label_counts.sum())
+    if total_labels == 0:
         return {'error': 'No valid labels found'}
 
     # Label distribution
-    label_counts = labeled_data['label'].value_counts().sort_index()
-    total_labels = len(labeled_data)
+    label_counts = label_counts.sort_index()
 
     distribution = {}
     for label in [-1, 0, 1]:
@@ -351,14 +833,13 @@ def analyze_labeling_quality(
         }
 
     # Hit type distribution
-    hit_type_counts = labeled_data['hit_type'].value_counts()
-    hit_type_dist = {str(k): int(v) for k, v in hit_type_counts.items()}
+    hit_type_dist = {str(k): int(v) for k, v in hit_type_counts.items() if v > 0}
 
     # Expected vs actual distribution
     expected_dist = config.get('labels', {}).get('expected_distribution', {})
 
     quality_metrics = {
-        'total_labels': int(total_labels),
+        'total_labels': total_labels,
         'label_distribution': distribution,
         'hit_type_distribution': hit_type_dist,
         'expected_distribution': expected_dist
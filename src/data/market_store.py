@@ -0,0 +1,231 @@
+"""Partitioned local market-data store"""
+
+import json
+import os
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+import pandas as pd
+from loguru import logger
+
+
+class MarketDataStore:
+    """Local OHLCV store partitioned by ticker and year
+
+    Layout::
+
+        <root>/ticker=<TICKER>/year=<YYYY>.parquet
+        <root>/manifest.json    # last stored bar per ticker
+        <root>/coverage.json    # earliest date requested per ticker
+
+    Appends only rewrite the (ticker, year) partitions that receive new rows,
+    so a daily refresh touches one small file per ticker. The coverage
+    sidecar records how far back each ticker's history was requested, so an
+    earlier start date is backfilled once (and a ticker listed after the
+    start date is not re-requested on every run).
+    """
+
+    def __init__(self, root: str = "data/store/market"):
+        """Initialize store
+
+        Args:
+            root: Root directory of the store
+        """
+        self.root = Path(root)
+        self.manifest_path = self.root / "manifest.json"
+        self.coverage_path = self.root / "coverage.json"
+        self._manifest = self._load_json(self.manifest_path)
+        self._coverage = self._load_json(self.coverage_path)
+
+    @staticmethod
+    def _load_json(path: Path) -> Dict[str, str]:
+        """Load a ticker -> date sidecar, empty when missing"""
+        if not path.exists():
+            return {}
+        with open(path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+
+    def _save_json(self, path: Path, values: Dict[str, str]) -> None:
+        """Atomically persist a ticker -> date sidecar"""
+        self.root.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_suffix('.json.tmp')
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(values, f, indent=2, sort_keys=True)
+        os.replace(tmp_path, path)
+
+    def _save_manifest(self) -> None:
+        """Atomically persist last-bar manifest"""
+        self._save_json(self.manifest_path, self._manifest)
+
+    def _partition_path(self, ticker: str, year: int) -> Path:
+        return self.root / f"ticker={ticker}" / f"year={year}.parquet"
+
+    @property
+    def tickers(self) -> List[str]:
+        """Tickers with at least one stored bar"""
+        return sorted(self._manifest)
+
+    def last_bar(self, ticker: str) -> Optional[pd.Timestamp]:
+        """Timestamp of the last stored bar for ticker, None if not stored"""
+        last = self._manifest.get(ticker)
+        return pd.Timestamp(last) if last is not None else None
+
+    def first_bar(self, ticker: str) -> Optional[pd.Timestamp]:
+        """Timestamp of the first stored bar for ticker, None if not stored"""
+        paths = sorted((self.root / f"ticker={ticker}").glob("year=*.parquet"),
+                       key=lambda path: int(path.stem.split('=')[1]))
+        for path in paths:
+            timestamps = pd.read_parquet(path, columns=['timestamp'])['timestamp']
+            if not timestamps.empty:
+                return pd.Timestamp(timestamps.min())
+        return None
+
+    def covered_from(self, ticker: str) -> Optional[pd.Timestamp]:
+        """Earliest date requested for ticker, None if never ingested
+
+        Stores written before the coverage sidecar fall back to the first
+        stored bar.
+        """
+        covered = self._coverage.get(ticker)
+        if covered is not None:
+            return pd.Timestamp(covered)
+        return self.first_bar(ticker) if ticker in self._manifest else None
+
+    def mark_covered(self, tickers: List[str], start_date: str) -> None:
+        """Record that tickers' history was requested from start_date on"""
+        start = pd.Timestamp(start_date)
+        for ticker in tickers:
+            covered = self.covered_from(ticker)
+            if covered is None or start < covered:
+                self._coverage[ticker] = start.strftime('%Y-%m-%d')
+        self._save_json(self.coverage_path, self._coverage)
+
+    def append(self, data: pd.DataFrame) -> int:
+        """Append rows to the store, replacing rows with the same timestamp
+
+        Args:
+            data: Trading data with ticker and timestamp columns
+
+        Returns:
+            Number of rows written
+        """
+        if data.empty:
+            return 0
+
+        data = data.copy()
+        data['timestamp'] = pd.to_datetime(data['timestamp'])
+        written = 0
+
+        for ticker, ticker_data in data.groupby('ticker', sort=False, observed=True):
+            for year, part in ticker_data.groupby(ticker_data['timestamp'].dt.year, sort=False):
+                path = self._partition_path(ticker, year)
+                if path.exists():
+                    part = pd.concat([pd.read_parquet(path), part], ignore_index=True)
+                part = (part.drop_duplicates(subset=['timestamp'], keep='last')
+                        .sort_values('timestamp')
+                        .reset_index(drop=True))
+
+                path.parent.mkdir(parents=True, exist_ok=True)
+                tmp_path = path.with_suffix('.parquet.tmp')
+                part.to_parquet(tmp_path, index=False)
+                os.replace(tmp_path, path)
+
+            written += len(ticker_data)
+            last = ticker_data['timestamp'].max()
+            previous = self.last_bar(ticker)
+            if previous is None or last > previous:
+                self._manifest[ticker] = last.isoformat()
+
+        self._save_manifest()
+        return written
+
+    def load(
+        self,
+        tickers: Optional[List[str]] = None,
+        start_date: Optional[str] = None,
+        end_date: Optional[str] = None
+    ) -> pd.DataFrame:
+        """Load stored bars
+
+        Args:
+            tickers: Tickers to load, None for all stored tickers
+            start_date: First date to include (YYYY-MM-DD), None for no bound
+            end_date: Last date to include (YYYY-MM-DD), None for no bound
+
+        Returns:
+            DataFrame sorted by ticker and timestamp
+        """
+        start = pd.Timestamp(start_date) if start_date else None
+        end = pd.Timestamp(end_date) + pd.Timedelta(days=1) if end_date else None
+
+        frames = []
+        for ticker in (tickers if tickers is not None else self.tickers):
+            ticker_dir = self.root / f"ticker={ticker}"
+            if not ticker_dir.exists():
+                continue
+            for path in sorted(ticker_dir.glob("year=*.parquet")):
+                year = int(path.stem.split('=')[1])
+                if (start is not None and year < start.year) or (end is not None and year > end.year):
+                    continue
+                part = pd.read_parquet(path)
+                if start is not None:
+                    part = part[part['timestamp'] >= start]
+                if end is not None:
+                    part = part[part['timestamp'] < end]
+                if not part.empty:
+                    frames.append(part)
+
+        if not frames:
+            return pd.DataFrame()
+        return pd.concat(frames, ignore_index=True)
+
+    def pending_ranges(
+        self,
+        tickers: List[str],
+        start_date: str,
+        end_date: Optional[str] = None
+    ) -> Dict[Tuple[str, Optional[str]], List[str]]:
+        """Group tickers by the date range of bars they need
+
+        New bars are requested from the last stored bar on (requested again
+        so that a bar stored before the session closed gets refreshed). When
+        start_date is earlier than the ticker's covered history,
+        start_date..(covered start - 1 day) is requested too.
+
+        Args:
+            tickers: Tickers to refresh
+            start_date: Start of the history the store should hold
+            end_date: End date of the refresh, None for current date
+
+        Returns:
+            Dictionary mapping (from-date, to-date) (YYYY-MM-DD, to-date None
+            for end_date) to tickers
+        """
+        start = pd.Timestamp(start_date)
+        end = pd.Timestamp(end_date) if end_date else pd.Timestamp.today().normalize()
+        pending: Dict[Tuple[str, Optional[str]], List[str]] = {}
+        backfills = 0
+        for ticker in tickers:
+            last = self.last_bar(ticker)
+            if last is None:
+                if start <= end:
+                    pending.setdefault((start.strftime('%Y-%m-%d'), None), []).append(ticker)
+                continue
+
+            covered = self.covered_from(ticker)
+            if covered is not None and start < covered.normalize():
+                backfill_end = min(covered.normalize() - pd.Timedelta(days=1), end)
+                if start <= backfill_end:
+                    key = (start.strftime('%Y-%m-%d'), backfill_end.strftime('%Y-%m-%d'))
+                    pending.setdefault(key, []).append(ticker)
+                    backfills += 1
+
+            from_date = last.normalize()
+            if from_date <= end:
+                pending.setdefault((from_date.strftime('%Y-%m-%d'), None), []).append(ticker)
+
+        logger.info(
+            f"Market store: {len({t for group in pending.values() for t in group})}/{len(tickers)} "
+            f"tickers need bars ({backfills} backfills), {len(pending)} distinct ranges"
+        )
+        return pending
@@ -0,0 +1,128 @@
+"""Ticker x time panel representation of long-format market data"""
+
+from typing import Dict, Iterable, Optional
+
+import numpy as np
+import pandas as pd
+
+from .schema import FLOAT_DTYPE, feature_frame
+
+
+class Panel:
+    """Dense 2D arrays (time x ticker) built from a long frame
+
+    Two layouts share the ticker axis:
+
+    - calendar: ``calendar(col)`` returns a (dates x tickers) array on the
+      shared trading calendar ``dates``; ``mask`` marks the bars that exist.
+    - packed: ``values[col]`` is (rows x tickers) with each ticker's bars
+      stacked from row 0 in their original order and NaN padding after the
+      last bar. Rolling and exponential kernels run along axis 0 of the
+      packed arrays, so every ticker sees exactly its own bar sequence, as in
+      a per-ticker groupby, and warm-up periods line up across tickers.
+
+    ``to_long`` converts packed arrays back to a long frame in groupby order
+    (tickers in group order, bars in original order).
+    """
+
+    def __init__(
+        self,
+        data: pd.DataFrame,
+        columns: Optional[Iterable[str]] = None,
+        ticker_col: str = 'ticker',
+        time_col: str = 'timestamp'
+    ):
+        """Build a panel
+
+        Args:
+            data: Long-format data with ticker and timestamp columns
+            columns: Numeric columns to pack, None for all numeric columns
+            ticker_col: Ticker column name
+            time_col: Timestamp column name
+        """
+        self.data = data
+        self.ticker_col = ticker_col
+        self.time_col = time_col
+
+        codes, self.tickers = pd.factorize(data[ticker_col], sort=True)
+        if isinstance(data[ticker_col].dtype, pd.CategoricalDtype):
+            # Group order of a categorical groupby is the category order
+            used = data[ticker_col].cat.categories.isin(self.tickers)
+            self.tickers = data[ticker_col].cat.categories[used]
+            codes = pd.Categorical(data[ticker_col], categories=self.tickers).codes
+        codes = codes.astype(np.int64)
+
+        # Row order of the long frame in groupby order, and each row's packed slot
+        self.order = np.argsort(codes, kind='stable')
+        self.lengths = np.bincount(codes, minlength=len(self.tickers))
+        starts = np.concatenate([[0], np.cumsum(self.lengths)[:-1]])
+        self.codes = codes[self.order]
+        self.rows = np.arange(len(codes)) - starts[self.codes]
+        self.n_rows = int(self.lengths.max()) if len(self.lengths) else 0
+
+        timestamps = pd.to_datetime(data[time_col]).to_numpy()[self.order]
+        self.dates = pd.DatetimeIndex(np.unique(timestamps), name=time_col)
+        self.date_index = self.dates.get_indexer(timestamps)
+        self.mask = np.zeros((len(self.dates), len(self.tickers)), dtype=bool)
+        self.mask[self.date_index, self.codes] = True
+
+        if columns is None:
+            columns = [col for col in data.columns
+                       if col not in (ticker_col, time_col) and pd.api.types.is_numeric_dtype(data[col])]
+        self.values: Dict[str, np.ndarray] = {col: self.pack(data[col].to_numpy()) for col in columns}
+
+    @property
+    def shape(self):
+        """(packed rows, tickers)"""
+        return self.n_rows, len(self.tickers)
+
+    @property
+    def valid(self) -> np.ndarray:
+        """Packed-layout mask of real bars (False on the padding)"""
+        return np.arange(self.n_rows)[:, None] < self.lengths[None, :]
+
+    def pack(self, values: np.ndarray) -> np.ndarray:
+        """Pack a long-format column (in the frame's row order) into rows x tickers"""
+        packed = np.full(self.shape, np.nan)
+        packed[self.rows, self.codes] = np.asarray(values, dtype=np.float64)[self.order]
+        return packed
+
+    def unpack(self, packed: np.ndarray) -> np.ndarray:
+        """Long-format values (in groupby order) of a packed array"""
+        return packed[self.rows, self.codes]
+
+    def calendar(self, column: str) -> np.ndarray:
+        """Column on the shared trading calendar (dates x tickers), NaN where no bar"""
+        dense = np.full((len(self.dates), len(self.tickers)), np.nan)
+        dense[self.date_index, self.codes] = self.unpack(self.values[column])
+        return dense
+
+    def to_long(
+        self,
+        features: Optional[Dict[str, np.ndarray]] = None,
+        dtypes: Optional[Dict[str, str]] = None
+    ) -> pd.DataFrame:
+        """Convert back to a long frame in groupby order
+
+        Float features are unpacked straight into one FLOAT_DTYPE block
+        (see ``feature_frame``).
+
+        Args:
+            features: Packed arrays to append as columns
+            dtypes: Casts applied to non-float features after unpacking
+
+        Returns:
+            Original columns plus features; the index is the bar position
+            within each ticker, as after a per-ticker reset_index
+        """
+        result = self.data.iloc[self.order]
+        result.index = pd.Index(self.rows)
+        if not features:
+            return result
+
+        dtypes = dtypes or {}
+        columns = {}
+        for name, values in features.items():
+            values = self.unpack(values)
+            columns[name] = values.astype(dtypes.get(name, FLOAT_DTYPE))
+        return pd.concat([result, feature_frame(columns, result.index)], axis=1, copy=False)
@@ -0,0 +1,168 @@
+"""Vectorized data-quality rules for trading data"""
+
+from typing import Any, Dict, Iterable, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+from loguru import logger
+
+QUALITY_RULES = (
+    'nan_ohlc',           # all of open/high/low/close missing
+    'high_lt_low',        # high below low
+    'nonpositive_price',  # any price <= 0
+    'ohlc_envelope',      # open/close outside the [low, high] range
+    'stale_bar',          # zero volume with a flat (O=H=L=C) bar
+    'duplicate',          # repeated (ticker, timestamp) pair
+    'date_gap',           # more than max_gap_days since the ticker's previous bar
+)
+
+DEFAULT_DROP_RULES = ('nan_ohlc', 'high_lt_low', 'nonpositive_price', 'stale_bar', 'duplicate')
+
+
+class DataQualityValidator:
+    """Evaluate every quality rule as a boolean mask in one pass
+
+    Rules listed in ``drop_rules`` remove rows; the others are only reported.
+    """
+
+    def __init__(
+        self,
+        drop_rules: Iterable[str] = DEFAULT_DROP_RULES,
+        max_gap_days: int = 10,
+        envelope_tolerance: float = 1e-6
+    ):
+        """Initialize validator
+
+        Args:
+            drop_rules: Rules whose violations are removed
+            max_gap_days: Calendar days between bars above which a gap is flagged
+            envelope_tolerance: Relative slack of the OHLC envelope check, which
+                absorbs float noise of adjusted prices
+        """
+        unknown = set(drop_rules) - set(QUALITY_RULES)
+        if unknown:
+            raise ValueError(f"Unknown quality rules: {sorted(unknown)}")
+        self.drop_rules = tuple(drop_rules)
+        self.max_gap_days = max_gap_days
+        self.envelope_tolerance = envelope_tolerance
+
+    @classmethod
+    def from_config(cls, config: Optional[Dict[str, Any]]) -> "DataQualityValidator":
+        """Build validator from the data.validation configuration section"""
+        validation_config = (config or {}).get('data', {}).get('validation', {})
+        return cls(
+            drop_rules=validation_config.get('drop_rules', DEFAULT_DROP_RULES),
+            max_gap_days=validation_config.get('max_gap_days', 10),
+            envelope_tolerance=validation_config.get('envelope_tolerance', 1e-6)
+        )
+
+    def evaluate(self, data: pd.DataFrame) -> Dict[str, np.ndarray]:
+        """Compute the violation mask of every applicable rule
+
+        Args:
+            data: Trading data
+
+        Returns:
+            Dictionary mapping rule name to boolean mask
+        """
+        n = len(data)
+        masks: Dict[str, np.ndarray] = {}
+
+        prices = {col: data[col].to_numpy(dtype=np.float64)
+                  for col in ('open', 'high', 'low', 'close') if col in data.columns}
+
+        if prices:
+            nan_count = np.zeros(n, dtype=np.int8)
+            nonpositive = np.zeros(n, dtype=bool)
+            for values in prices.values():
+                nan_count += np.isnan(values)
+                nonpositive |= values <= 0
+            masks['nan_ohlc'] = nan_count == len(prices)
+            masks['nonpositive_price'] = nonpositive
+
+        if 'high' in prices and 'low' in prices:
+            high, low = prices['high'], prices['low']
+            masks['high_lt_low'] = high < low
+
+            if 'open' in prices and 'close' in prices:
+                open_, close = prices['open'], prices['close']
+                slack = 1 + self.envelope_tolerance
+                masks['ohlc_envelope'] = ((np.fmax(open_, close) > high * slack) |
+                                          (np.fmin(open_, close) * slack < low))
+
+                if 'volume' in data.columns:
+                    volume = data['volume'].to_numpy(dtype=np.float64)
+                    masks['stale_bar'] = ((volume == 0) & (high == low) &
+                                          (open_ == high) & (close == high))
+
+        if 'timestamp' in data.columns:
+            ts = pd.to_datetime(data['timestamp']).to_numpy(dtype='datetime64[ns]').view(np.int64)
+            if 'ticker' in data.columns:
+                codes = pd.factorize(data['ticker'])[0]
+            else:
+                codes = np.zeros(n, dtype=np.int64)
+
+            order = np.lexsort((ts, codes))
+            same_ticker = np.zeros(n, dtype=bool)
+            same_ticker[1:] = codes[order][1:] == codes[order][:-1]
+            step = np.zeros(n, dtype=np.int64)
+            step[1:] = np.diff(ts[order])
+
+            duplicate = np.zeros(n, dtype=bool)
+            duplicate[order] = same_ticker & (step == 0)
+            masks['duplicate'] = duplicate
+
+            gap = np.zeros(n, dtype=bool)
+            max_gap_ns = np.int64(self.max_gap_days) * 86_400 * 1_000_000_000
+            gap[order] = same_ticker & (step > max_gap_ns)
+            masks['date_gap'] = gap
+
+        return masks
+
+    def report(self, data: pd.DataFrame, masks: Dict[str, np.ndarray]) -> pd.DataFrame:
+        """Count violations per ticker and rule
+
+        Args:
+            data: Trading data the masks were computed on
+            masks: Output of evaluate
+
+        Returns:
+            DataFrame indexed by ticker with one column per rule
+        """
+        if 'ticker' in data.columns:
+            codes, tickers = pd.factorize(data['ticker'])
+        else:
+            codes, tickers = np.zeros(len(data), dtype=np.int64), pd.Index(['unknown'])
+
+        counts = {rule: np.bincount(codes[mask], minlength=len(tickers))
+                  for rule, mask in masks.items()}
+        report = pd.DataFrame(counts, index=pd.Index(tickers, name='ticker'))
+        return report.reindex(columns=[r for r in QUALITY_RULES if r in masks])
+
+    def combined_mask(self, masks: Dict[str, np.ndarray]) -> np.ndarray:
+        """OR of the masks of all drop rules (True marks a row to remove)"""
+        invalid = np.zeros(len(next(iter(masks.values()))) if masks else 0, dtype=bool)
+        for rule in self.drop_rules:
+            if rule in masks:
+                invalid |= masks[rule]
+        return invalid
+
+    def validate(self, data: pd.DataFrame) -> Tuple[pd.DataFrame, pd.DataFrame]:
+        """Drop rows violating drop rules and report all violations
+
+        Args:
+            data: Trading data
+
+        Returns:
+            Tuple of (cleaned data, per-ticker per-rule violation counts)
+        """
+        masks = self.evaluate(data)
+        report = self.report(data, masks)
+        invalid = self.combined_mask(masks)
+
+        for rule, total in report.sum().items():
+            if total > 0:
+                action = "removing" if rule in self.drop_rules else "reporting only"
+                logger.warning(f"Data quality: {int(total)} rows violate {rule} ({action})")
+
+        return data[~invalid], report
@@ -0,0 +1,220 @@
+"""Mergeable quantile sketch and causal volatility-regime binning
+
+``QuantileSketch`` keeps counts of values in logarithmic buckets (the
+DDSketch layout): bucket ``k`` holds values in (gamma^(k-1), gamma^k], so a
+quantile read back from the sketch is within ``relative_accuracy`` of the
+exact one. Adding a value is a dict increment, two sketches merge by adding
+their counts, and the number of buckets depends on the range of the values,
+not on how many were added.
+
+``causal_regime`` bins each bar against the 33% / 67% quantiles of the
+sketch of the bars strictly before it, so no bar sees its own or later
+values. Bins are decided in bucket space from integer counts, which makes
+the vectorized batch computation and a bar-by-bar ``QuantileSketch`` give
+the same regimes for the same volatility series.
+"""
+
+import math
+from typing import Any, Dict, Optional, Sequence
+
+import numpy as np
+
+# Tercile edges of the volatility regime (same as the full-sample bins)
+REGIME_QUANTILES = (0.33, 0.67)
+
+# Bucket of zero (and negative) values, below every positive bucket
+ZERO_KEY = -2 ** 31
+
+
+class QuantileSketch:
+    """Log-bucket quantile sketch with relative accuracy guarantees"""
+
+    def __init__(self, relative_accuracy: float = 0.01):
+        """Initialize an empty sketch
+
+        Args:
+            relative_accuracy: Maximum relative error of quantile values
+        """
+        if not 0 < relative_accuracy < 1:
+            raise ValueError(f"relative_accuracy must be in (0, 1), got {relative_accuracy}")
+        self.relative_accuracy = relative_accuracy
+        self.gamma = (1 + relative_accuracy) / (1 - relative_accuracy)
+        self.counts: Dict[int, int] = {}
+        self.count = 0
+
+    def key(self, value: float) -> int:
+        """Bucket of a finite value"""
+        return int(bucket_keys(np.array([value]), self.relative_accuracy)[0])
+
+    def add(self, value: float) -> None:
+        """Add one value; NaN and infinite values are ignored"""
+        if not math.isfinite(value):
+            return
+        key = self.key(value)
+        self.counts[key] = self.counts.get(key, 0) + 1
+        self.count += 1
+
+    def merge(self, other: "QuantileSketch") -> None:
+        """Add the counts of another sketch with the same accuracy"""
+        if other.relative_accuracy != self.relative_accuracy:
+            raise ValueError("Cannot merge sketches with different relative accuracy")
+        for key, count in other.counts.items():
+            self.counts[key] = self.counts.get(key, 0) + count
+        self.count += other.count
+
+    def count_below(self, key: int) -> int:
+        """Number of values in buckets lower than key"""
+        return sum(count for k, count in self.counts.items() if k < key)
+
+    def quantile_key(self, q: float) -> Optional[int]:
+        """Bucket holding the q-quantile (rank q * (count - 1)), None when empty"""
+        if not self.count:
+            return None
+        rank = q * (self.count - 1)
+        cumulative = 0
+        for key in sorted(self.counts):
+            cumulative += self.counts[key]
+            if cumulative > rank:
+                return key
+        return key
+
+    def quantile(self, q: float) -> float:
+        """Approximate q-quantile, NaN when empty"""
+        key = self.quantile_key(q)
+        if key is None:
+            return math.nan
+        if key == ZERO_KEY:
+            return 0.0
+        return 2 * self.gamma ** key / (self.gamma + 1)
+
+    def regime(self, value: float, min_periods: int = 1) -> float:
+        """Tercile bin (0, 1, 2) of value against the sketch, before adding it
+
+        Returns:
+            0.0 when value's bucket is at or below the 33% quantile bucket,
+            1.0 at or below the 67% one, 2.0 above; NaN when value is not
+            finite or the sketch holds fewer than min_periods values
+        """
+        if not math.isfinite(value) or self.count < max(min_periods, 1):
+            return math.nan
+        return float(_bin(self.count_below(self.key(value)), self.count))
+
+    def state_dict(self) -> Dict[str, Any]:
+        """JSON-compatible state"""
+        return {
+            'relative_accuracy': self.relative_accuracy,
+            'counts': {str(key): count for key, count in self.counts.items()},
+            'count': self.count,
+        }
+
+    def load_state_dict(self, state: Dict[str, Any]) -> None:
+        """Restore ``state_dict`` output"""
+        self.__init__(state['relative_accuracy'])
+        self.counts = {int(key): int(count) for key, count in state['counts'].items()}
+        self.count = int(state['count'])
+
+
+def _bin(below, count):
+    """Regime from the number of earlier values in lower buckets
+
+    A bucket is at or below the q-quantile bucket exactly when fewer than
+    q * (count - 1) + 1 earlier values fall in lower buckets.
+    """
+    low, high = (q * (count - 1) for q in REGIME_QUANTILES)
+    return np.where(below <= low, 0.0, np.where(below <= high, 1.0, 2.0))[()]
+
+
+def bucket_keys(values: np.ndarray, relative_accuracy: float) -> np.ndarray:
+    """Sketch buckets of finite values (ZERO_KEY for values <= 0)"""
+    gamma = (1 + relative_accuracy) / (1 - relative_accuracy)
+    values = np.asarray(values, dtype=np.float64)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        keys = np.ceil(np.log(values) / np.log(gamma))
+    return np.where(values > 0, keys, ZERO_KEY).astype(np.int64)
+
+
+def causal_regime(
+    values: np.ndarray,
+    times: Optional[np.ndarray] = None,
+    relative_accuracy: float = 0.01,
+    min_periods: int = 1
+) -> np.ndarray:
+    """Expanding-sketch volatility regime of every value, without look-ahead
+
+    With ``times``, values are pooled across series (e.g. tickers): a value
+    is binned against the sketch of every value at an earlier time, so all
+    tickers of a date share the same thresholds. Without, each value is
+    binned against the values before it.
+
+    Args:
+        values: Rolling volatility (NaN where undefined)
+        times: Integer time index of each value (e.g. trading date index),
+            None for a single series in time order
+        relative_accuracy: Sketch accuracy
+        min_periods: Earlier values needed before a bar is binned
+
+    Returns:
+        Regime (0.0, 1.0, 2.0 or NaN) of each value
+    """
+    values = np.asarray(values, dtype=np.float64)
+    regime = np.full(len(values), np.nan)
+    finite = np.isfinite(values)
+    if not finite.any():
+        return regime
+    if times is None:
+        times = np.arange(len(values))
+
+    keys, key_index = np.unique(bucket_keys(values[finite], relative_accuracy), return_inverse=True)
+    time_ids, time_index = np.unique(np.asarray(times)[finite], return_inverse=True)
+
+    # Counts per (time, bucket), then counts of earlier times in lower buckets
+    histogram = np.zeros((len(time_ids), len(keys) + 1), dtype=np.int64)
+    np.add.at(histogram, (time_index, key_index + 1), 1)
+    earlier = np.cumsum(histogram, axis=0) - histogram
+    below = np.cumsum(earlier, axis=1)[time_index, key_index]
+    prior = earlier.sum(axis=1)[time_index]
+
+    bins = _bin(below, prior)
+    regime[finite] = np.where(prior >= max(min_periods, 1), bins, np.nan)
+    return regime
+
+
+def regime_settings(regime_config: Dict[str, Any]) -> Dict[str, Any]:
+    """Causal regime parameters from the regime_features config
+
+    Returns:
+        Dict with mode, scope, relative_accuracy and min_periods
+    """
+    settings = {
+        'mode': regime_config.get('volatility_regime_mode', 'full_sample'),
+        'scope': regime_config.get('volatility_regime_scope', 'ticker'),
+        'relative_accuracy': regime_config.get('volatility_regime_accuracy', 0.01),
+        'min_periods': regime_config.get('volatility_regime_min_periods',
+                                         regime_config.get('volatility_regime_window', 1)),
+    }
+    if settings['mode'] not in ('full_sample', 'causal'):
+        raise ValueError(f"Unknown volatility_regime_mode: {settings['mode']}")
+    if settings['scope'] not in ('ticker', 'universe'):
+        raise ValueError(f"Unknown volatility_regime_scope: {settings['scope']}")
+    return settings
+
+
+def causal_regime_frame(
+    rolling_vol: np.ndarray,
+    timestamps: Sequence,
+    relative_accuracy: float = 0.01,
+    min_periods: int = 1
+) -> np.ndarray:
+    """Universe-scope regime of a long frame's rolling volatility
+
+    Args:
+        rolling_vol: Each bar's rolling volatility
+        timestamps: Each bar's timestamp
+        relative_accuracy: Sketch accuracy
+        min_periods: Earlier values needed before a bar is binned
+
+    Returns:
+        Regime of each bar, thresholds pooled over all bars of earlier dates
+    """
+    times = np.unique(np.asarray(timestamps), return_inverse=True)[1]
+    return causal_regime(rolling_vol, times, relative_accuracy, min_periods)
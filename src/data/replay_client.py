@@ -0,0 +1,232 @@
+"""Offline replay backend implementing the FiinSession client surface"""
+
+import random
+import threading
+from functools import lru_cache
+import time
+import zlib
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Union
+
+import numpy as np
+import pandas as pd
+from loguru import logger
+
+from .indicators import LocalIndicator
+
+
+@dataclass
+class LatencyModel:
+    """Simulated network cost of one API call
+
+    delay = base + payload / bandwidth + uniform(0, jitter)
+    """
+    latency_ms: float = 0.0
+    jitter_ms: float = 0.0
+    bytes_per_row: int = 64
+    bandwidth_mbps: Optional[float] = None
+    login_ms: float = 0.0
+
+    def delay(self, n_rows: int) -> float:
+        """Seconds a response of n_rows should take"""
+        seconds = self.latency_ms / 1000.0
+        if self.jitter_ms:
+            seconds += random.uniform(0, self.jitter_ms / 1000.0)
+        if self.bandwidth_mbps:
+            seconds += n_rows * self.bytes_per_row * 8 / (self.bandwidth_mbps * 1e6)
+        return seconds
+
+
+@lru_cache(maxsize=8)
+def _business_days(end_date: pd.Timestamp) -> pd.DatetimeIndex:
+    """Business-day calendar from the synthetic origin to end_date"""
+    return pd.bdate_range(pd.Timestamp("2000-01-03"), end_date)
+
+
+def synthetic_ohlcv(
+    tickers: List[str],
+    start_date: str,
+    end_date: str,
+    seed: int = 0
+) -> pd.DataFrame:
+    """Generate deterministic daily OHLCV bars (geometric random walk)
+
+    Each ticker's path depends only on its symbol and the seed, so any date
+    window of the same ticker is consistent across calls.
+
+    Args:
+        tickers: Ticker symbols
+        start_date: First date (YYYY-MM-DD)
+        end_date: Last date (YYYY-MM-DD)
+        seed: Global random seed
+
+    Returns:
+        DataFrame with ticker, timestamp, open, high, low, close, volume, bu, sd
+    """
+    calendar = _business_days(pd.Timestamp(end_date))
+    in_range = calendar >= pd.Timestamp(start_date)
+
+    frames = []
+    for ticker in tickers:
+        rng = np.random.default_rng([seed, zlib.crc32(ticker.encode())])
+        n = len(calendar)
+        close = 10000 * np.exp(np.cumsum(rng.normal(0.0002, 0.02, n)))
+        open_ = close * np.exp(rng.normal(0, 0.005, n))
+        high = np.maximum(open_, close) * (1 + np.abs(rng.normal(0, 0.01, n)))
+        low = np.minimum(open_, close) * (1 - np.abs(rng.normal(0, 0.01, n)))
+        volume = rng.lognormal(12, 1, n).round()
+        bu = (volume * rng.uniform(0.3, 0.7, n)).round()
+
+        frames.append(pd.DataFrame({
+            'ticker': ticker,
+            'timestamp': calendar[in_range],
+            'open': open_[in_range],
+            'high': high[in_range],
+            'low': low[in_range],
+            'close': close[in_range],
+            'volume': volume[in_range],
+            'bu': bu[in_range],
+            'sd': (volume - bu)[in_range],
+        }))
+
+    if not frames:
+        return pd.DataFrame()
+    return pd.concat(frames, ignore_index=True)
+
+
+class _ReplayEvent:
+    """Return value of ReplayClient.Fetch_Trading_Data"""
+
+    def __init__(self, client: "ReplayClient", request: Dict[str, Any]):
+        self._client = client
+        self._request = request
+
+    def get_data(self) -> pd.DataFrame:
+        return self._client._serve(**self._request)
+
+
+class ReplayClient:
+    """Local stand-in for the FiinQuantX client
+
+    Serves ``Fetch_Trading_Data(...).get_data()``, ``TickerList`` and
+    ``FiinIndicator`` from a CSV file or a synthetic generator, sleeping
+    according to a latency model so fetch concurrency and caching can be
+    benchmarked without network access.
+    """
+
+    def __init__(
+        self,
+        source: str = "data/raw/trading_data.csv",
+        latency: Optional[LatencyModel] = None,
+        universes: Optional[Dict[str, List[str]]] = None,
+        seed: int = 0
+    ):
+        """Initialize replay client
+
+        Args:
+            source: Path to a trading data CSV, or "synthetic"
+            latency: Latency model, None for no simulated latency
+            universes: Universe name to ticker list mapping for TickerList
+            seed: Seed of the synthetic generator
+        """
+        self.source = source
+        self.latency = latency or LatencyModel()
+        self.universes = universes or {}
+        self.seed = seed
+        self.stats = {'calls': 0, 'rows': 0, 'simulated_seconds': 0.0}
+        self._stats_lock = threading.Lock()
+
+        if source == "synthetic":
+            self._data = None
+        else:
+            self._data = pd.read_csv(source, parse_dates=['timestamp'])
+            logger.info(f"Replay client loaded {len(self._data)} rows from {source}")
+
+        if self.latency.login_ms:
+            time.sleep(self.latency.login_ms / 1000.0)
+
+    @classmethod
+    def from_config(cls, config: Dict[str, Any]) -> "ReplayClient":
+        """Build a replay client from the data.replay configuration section
+
+        Args:
+            config: Configuration dictionary
+
+        Returns:
+            ReplayClient instance
+        """
+        replay_config = dict(config.get('data', {}).get('replay', {}))
+        source = replay_config.pop('source', 'data/raw/trading_data.csv')
+        universes = replay_config.pop('universes', None)
+        seed = replay_config.pop('seed', 0)
+        return cls(source=source, latency=LatencyModel(**replay_config), universes=universes, seed=seed)
+
+    def Fetch_Trading_Data(
+        self,
+        realtime: bool,
+        tickers: Union[str, List[str]],
+        fields: List[str],
+        adjusted: bool = True,
+        by: str = "1d",
+        from_date: Optional[str] = None,
+        to_date: Optional[str] = None,
+        period: Optional[int] = None
+    ) -> _ReplayEvent:
+        if realtime:
+            raise NotImplementedError("Replay client only serves historical data")
+        if by != "1d":
+            raise NotImplementedError(f"Replay client only serves daily bars, got by={by}")
+        return _ReplayEvent(self, {
+            'tickers': [tickers] if isinstance(tickers, str) else list(tickers),
+            'fields': fields,
+            'from_date': from_date,
+            'to_date': to_date,
+            'period': period,
+        })
+
+    def _serve(
+        self,
+        tickers: List[str],
+        fields: List[str],
+        from_date: Optional[str],
+        to_date: Optional[str],
+        period: Optional[int]
+    ) -> pd.DataFrame:
+        """Answer one historical request"""
+        end = pd.Timestamp(to_date) if to_date else pd.Timestamp.today().normalize()
+        start = pd.Timestamp(from_date) if from_date else pd.Timestamp("2000-01-03")
+
+        if self._data is None:
+            data = synthetic_ohlcv(tickers, start.strftime('%Y-%m-%d'), end.strftime('%Y-%m-%d'), self.seed)
+        else:
+            mask = (self._data['ticker'].isin(tickers) &
+                    (self._data['timestamp'] >= start) &
+                    (self._data['timestamp'] < end + pd.Timedelta(days=1)))
+            data = self._data[mask]
+
+        if period is not None and not data.empty:
+            data = data.groupby('ticker', group_keys=False).tail(period)
+
+        columns = ['ticker', 'timestamp'] + [f for f in fields if f in data.columns]
+        data = data[columns].reset_index(drop=True)
+        data['timestamp'] = data['timestamp'].dt.strftime('%Y-%m-%d')
+
+        delay = self.latency.delay(len(data))
+        if delay > 0:
+            time.sleep(delay)
+        with self._stats_lock:
+            self.stats['calls'] += 1
+            self.stats['rows'] += len(data)
+            self.stats['simulated_seconds'] += delay
+
+        return data
+
+    def TickerList(self, ticker: str) -> List[str]:
+        if ticker in self.universes:
+            return list(self.universes[ticker])
+        if self._data is not None:
+            return sorted(self._data['ticker'].unique().tolist())
+        raise ValueError(f"Unknown universe for replay client: {ticker}")
+
+    def FiinIndicator(self) -> LocalIndicator:
+        return LocalIndicator()
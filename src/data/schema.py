@@ -0,0 +1,158 @@
+"""Compact dtype schema for market, labeled and featured frames"""
+
+from typing import Any, Dict, Iterable, Iterator, Optional
+
+import numpy as np
+import pandas as pd
+
+FLOAT_DTYPE = 'float32'
+
+# OHLC stays float64: prices move in exchange ticks, so returns often land
+# exactly on a barrier / min_ret threshold and float32 rounding flips labels
+PRICE_DTYPE = 'float64'
+
+# Columns with a fixed dtype; every other numeric column is a feature
+MARKET_SCHEMA = {
+    'ticker': 'category',
+    'timestamp': 'datetime64[ns]',
+    'open': PRICE_DTYPE,
+    'high': PRICE_DTYPE,
+    'low': PRICE_DTYPE,
+    'close': PRICE_DTYPE,
+    'volume': 'int64',
+    'bu': 'int64',
+    'sd': 'int64',
+    'label': 'int8',
+    'hit_type': 'category',
+    'hit_time': 'datetime64[ns]',
+    'vbar_end': 'datetime64[ns]',
+    'ub': FLOAT_DTYPE,
+    'lb': FLOAT_DTYPE,
+}
+
+DATETIME_COLUMNS = [col for col, dtype in MARKET_SCHEMA.items() if dtype.startswith('datetime')]
+
+
+def apply_schema(data: pd.DataFrame, volume_fill: int = 0) -> pd.DataFrame:
+    """Cast a frame to the compact market schema
+
+    Integer columns that still hold missing values (e.g. labels of skipped
+    tickers) are kept as floats instead of being filled.
+
+    Args:
+        data: Raw, labeled or featured data
+        volume_fill: Value used for missing volumes before the integer cast
+
+    Returns:
+        DataFrame with compact dtypes
+    """
+    casts = {}
+    for col in data.columns:
+        dtype = MARKET_SCHEMA.get(col)
+        current = data[col].dtype
+
+        if dtype is None:
+            # Feature columns
+            if pd.api.types.is_float_dtype(current) and current != FLOAT_DTYPE:
+                casts[col] = FLOAT_DTYPE
+            continue
+
+        if dtype == 'category':
+            if not isinstance(current, pd.CategoricalDtype):
+                casts[col] = 'category'
+        elif dtype.startswith('datetime'):
+            if not pd.api.types.is_datetime64_dtype(current):
+                data = data.assign(**{col: pd.to_datetime(data[col])})
+        elif dtype.startswith('int'):
+            if col in ('volume', 'bu', 'sd'):
+                data = data.assign(**{col: data[col].fillna(volume_fill)})
+            if data[col].isna().any():
+                if current != FLOAT_DTYPE:
+                    casts[col] = FLOAT_DTYPE
+            elif current != dtype:
+                casts[col] = dtype
+        elif current != dtype:
+            casts[col] = dtype
+
+    return data.astype(casts) if casts else data
+
+
+def feature_frame(columns: Dict[str, Any], index: pd.Index) -> pd.DataFrame:
+    """Build a frame of feature columns with a single allocation for the floats
+
+    Float columns are written straight into one preallocated FLOAT_DTYPE
+    block instead of being inserted (and consolidated) one at a time; other
+    columns (e.g. integer flags) keep their dtype.
+
+    Args:
+        columns: Feature name to array or Series mapping, in column order
+        index: Index of the frame; values are taken positionally
+
+    Returns:
+        DataFrame of the features in the compact schema
+    """
+    values = {name: np.asarray(column) for name, column in columns.items()}
+    float_names = [name for name, column in values.items() if column.dtype.kind == 'f']
+
+    # Column-major, so each feature is contiguous inside the block
+    block = np.empty((len(index), len(float_names)), dtype=FLOAT_DTYPE, order='F')
+    for j, name in enumerate(float_names):
+        block[:, j] = values[name]
+    frame = pd.DataFrame(block, index=index, columns=float_names, copy=False)
+
+    for position, name in enumerate(values):
+        if values[name].dtype.kind != 'f':
+            frame.insert(position, name, values[name])
+    return frame
+
+
+def _csv_options(path: str, usecols: Optional[Iterable[str]] = None) -> Dict[str, Any]:
+    """read_csv options parsing the market columns of a CSV"""
+    header = pd.read_csv(path, nrows=0).columns
+    parse_dates = [col for col in DATETIME_COLUMNS if col in header
+                   and (usecols is None or col in usecols)]
+    dtypes = {col: 'category' for col in ('ticker', 'hit_type') if col in header}
+    return {'usecols': usecols, 'parse_dates': parse_dates, 'dtype': dtypes}
+
+
+def read_market_csv(path: str, usecols: Optional[Iterable[str]] = None) -> pd.DataFrame:
+    """Read a market CSV with dates parsed once and the schema applied
+
+    Args:
+        path: CSV path
+        usecols: Optional subset of columns to read
+
+    Returns:
+        DataFrame with compact dtypes
+    """
+    data = pd.read_csv(path, **_csv_options(path, usecols))
+    return apply_schema(data)
+
+
+def iter_market_csv(
+    path: str,
+    chunksize: int,
+    usecols: Optional[Iterable[str]] = None
+) -> Iterator[pd.DataFrame]:
+    """Read a market CSV in chunks of rows, parsed like ``read_market_csv``
+
+    Floats are parsed round-trip exact, so chunks written back to CSV
+    reproduce the values of the frame that wrote the file.
+
+    Args:
+        path: CSV path
+        chunksize: Rows per chunk
+        usecols: Optional subset of columns to read
+
+    Yields:
+        Consecutive chunks with compact dtypes (row index continues across chunks)
+    """
+    with pd.read_csv(path, chunksize=chunksize, float_precision='round_trip',
+                     **_csv_options(path, usecols)) as reader:
+        for chunk in reader:
+            yield apply_schema(chunk)
+
+
+def memory_usage_mb(data: pd.DataFrame) -> float:
+    """Deep memory usage of a frame in megabytes"""
+    return float(np.sum(data.memory_usage(deep=True).values)) / 1024 ** 2
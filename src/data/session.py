@@ -0,0 +1,106 @@
+"""Process-wide FiinQuantX session manager"""
+
+import os
+import threading
+import time
+from typing import Any, Callable, Dict, Optional, Tuple
+
+from loguru import logger
+
+
+def _fiin_login(username: str, password: str) -> Any:
+    """Log in to FiinQuantX and return the client"""
+    from FiinQuantX import FiinSession
+
+    return FiinSession(username=username, password=password).login()
+
+
+class SessionManager:
+    """Log in once per credentials and share the client across the process
+
+    Clients are re-created lazily once ``token_ttl`` seconds have passed since
+    login, or after ``invalidate`` is called (e.g. on an authentication
+    error). All access is guarded by a lock so concurrent fetch threads never
+    trigger more than one login.
+    """
+
+    def __init__(
+        self,
+        session_factory: Callable[[str, str], Any] = _fiin_login,
+        token_ttl: float = 3600.0
+    ):
+        """Initialize session manager
+
+        Args:
+            session_factory: Callable(username, password) returning a logged-in client
+            token_ttl: Seconds after which a client is re-created on next use
+        """
+        self.session_factory = session_factory
+        self.token_ttl = token_ttl
+        self._sessions: Dict[str, Tuple[Any, float]] = {}
+        self._lock = threading.RLock()
+
+    def get_client(self, username: Optional[str] = None, password: Optional[str] = None) -> Any:
+        """Return the shared client, logging in if needed
+
+        Args:
+            username: FiinQuantX username, defaults to FIIN_USERNAME
+            password: FiinQuantX password, defaults to FIIN_PASSWORD
+
+        Returns:
+            Authenticated FiinQuantX client
+        """
+        username = username or os.getenv("FIIN_USERNAME")
+        password = password or os.getenv("FIIN_PASSWORD")
+
+        with self._lock:
+            session = self._sessions.get(username)
+            if session is not None and time.monotonic() - session[1] < self.token_ttl:
+                return session[0]
+
+            started = time.perf_counter()
+            try:
+                client = self.session_factory(username, password)
+            except Exception as e:
+                logger.error(f"Failed to login to FiinQuantX: {e}")
+                raise
+            self._sessions[username] = (client, time.monotonic())
+            action = "Refreshed" if session is not None else "Successfully logged in to"
+            logger.info(f"{action} FiinQuantX session in {time.perf_counter() - started:.2f}s")
+            return client
+
+    def invalidate(self, username: Optional[str] = None) -> None:
+        """Drop cached client(s) so the next access logs in again
+
+        Args:
+            username: Username to invalidate, None for all sessions
+        """
+        with self._lock:
+            if username is None:
+                self._sessions.clear()
+            else:
+                self._sessions.pop(username, None)
+
+
+_session_manager: Optional[SessionManager] = None
+_session_manager_lock = threading.Lock()
+
+
+def get_session_manager() -> SessionManager:
+    """Return the process-wide session manager"""
+    global _session_manager
+    with _session_manager_lock:
+        if _session_manager is None:
+            _session_manager = SessionManager()
+        return _session_manager
+
+
+def set_session_manager(manager: SessionManager) -> None:
+    """Replace the process-wide session manager (e.g. with another backend)
+
+    Args:
+        manager: Session manager to install
+    """
+    global _session_manager
+    with _session_manager_lock:
+        _session_manager = manager
@@ -0,0 +1,816 @@
+"""Incremental feature computation for bar-by-bar scoring
+
+Each indicator keeps the minimal state needed to emit its value for a new
+bar in O(1) (amortized), instead of rerunning ``FeatureEngineer`` over the
+full history of the ticker. States serialize to plain JSON so a scorer can
+checkpoint and resume.
+
+Streaming values follow the batch pipeline's definitions (pandas rolling
+statistics, ta-style warm-ups, Wilder smoothing) and match it within
+floating-point tolerance; ``python benchmark.py streaming`` checks this.
+``vol_regime`` is only produced in causal mode (``volatility_regime_mode:
+causal``), where each bar is binned on a quantile sketch of earlier bars;
+the default full-sample terciles include future bars and have no causal
+equivalent.
+"""
+
+import bisect
+import json
+import math
+import os
+from collections import deque
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+from loguru import logger
+
+from .feature_planner import MOMENTUM_PERIODS, RANK_WINDOWS
+from .quantile_sketch import QuantileSketch, regime_settings
+
+NAN = float('nan')
+
+# Features the batch pipeline produces but streaming cannot in full-sample mode (look-ahead)
+UNSUPPORTED_FEATURES = ('vol_regime',)
+
+
+def _div(a: float, b: float) -> float:
+    """a / b with NumPy semantics for a zero divisor (inf or NaN, no exception)"""
+    try:
+        return a / b
+    except ZeroDivisionError:
+        if a != a or a == 0:
+            return NAN
+        return math.copysign(math.inf, a) * math.copysign(1.0, b)
+
+
+def _isnan(x: float) -> bool:
+    return x != x
+
+
+class StreamingState:
+    """Base class for serializable streaming state
+
+    ``state_dict`` captures every attribute (nested states and deques
+    included) as JSON-compatible values; ``load_state_dict`` restores them
+    into an instance built with the same parameters.
+    """
+
+    def state_dict(self) -> Dict[str, Any]:
+        return {name: _encode(value) for name, value in vars(self).items()}
+
+    def load_state_dict(self, state: Dict[str, Any]) -> None:
+        for name, value in state.items():
+            current = getattr(self, name, None)
+            if isinstance(current, StreamingState):
+                current.load_state_dict(value)
+            elif isinstance(current, dict) and current and isinstance(next(iter(current.values())), StreamingState):
+                for key, child in current.items():
+                    child.load_state_dict(value[str(key)])
+            else:
+                setattr(self, name, _decode(value))
+
+
+def _encode(value: Any) -> Any:
+    if isinstance(value, StreamingState):
+        return value.state_dict()
+    if isinstance(value, deque):
+        return {'deque': list(value), 'maxlen': value.maxlen}
+    if isinstance(value, dict):
+        return {str(key): _encode(child) for key, child in value.items()}
+    return value
+
+
+def _decode(value: Any) -> Any:
+    if isinstance(value, dict) and set(value) == {'deque', 'maxlen'}:
+        return deque(value['deque'], maxlen=value['maxlen'])
+    return value
+
+
+class EMA(StreamingState):
+    """pandas ewm(adjust=False).mean() with min_periods, one value at a time"""
+
+    def __init__(self, alpha: float, min_periods: int = 1):
+        self.alpha = alpha
+        self.min_periods = max(min_periods, 1)
+        self.weighted = NAN
+        self.old_wt = 1.0
+        self.nobs = 0
+
+    @classmethod
+    def span(cls, window: int) -> "EMA":
+        """EMA with alpha = 2 / (window + 1) and window warm-up, like ta's ema"""
+        return cls(2.0 / (window + 1), window)
+
+    def update(self, x: float) -> float:
+        is_obs = not _isnan(x)
+        self.nobs += is_obs
+        if not _isnan(self.weighted):
+            self.old_wt *= 1.0 - self.alpha
+            if is_obs:
+                if self.weighted != x:
+                    self.weighted = (self.old_wt * self.weighted + self.alpha * x) / (self.old_wt + self.alpha)
+                self.old_wt = 1.0
+        elif is_obs:
+            self.weighted = x
+        return self.weighted if self.nobs >= self.min_periods else NAN
+
+
+class RollingWindow(StreamingState):
+    """Full-window rolling sum / mean / std in O(1) per value
+
+    Mean and sum of squared deviations are updated Welford-style as values
+    enter and leave the window and recomputed exactly once per window
+    length to bound drift. Like pandas, a window of identical values has
+    exactly zero deviation, and a window of zeros sums to exactly zero.
+    Results are NaN until the window is full or while it holds a NaN.
+    """
+
+    def __init__(self, window: int):
+        self.window = window
+        self.values = deque(maxlen=window)
+        self.n_nan = 0
+        self.n_nonzero = 0
+        self.same_run = 0
+        self.mean_ = 0.0
+        self.m2 = 0.0
+        self.since_exact = 0
+
+    def push(self, x: float) -> None:
+        values = self.values
+        if len(values) == self.window:
+            old = values[0]
+            if _isnan(old):
+                self.n_nan -= 1
+            else:
+                self.n_nonzero -= old != 0
+                self._remove(old)
+        if values and (x == values[-1]):
+            self.same_run = min(self.same_run + 1, self.window)
+        else:
+            self.same_run = 1
+        values.append(x)
+        if _isnan(x):
+            self.n_nan += 1
+        else:
+            self.n_nonzero += x != 0
+            self._add(x)
+
+        self.since_exact += 1
+        if self.since_exact >= self.window:
+            self._recompute()
+
+    def _count(self) -> int:
+        return len(self.values) - self.n_nan
+
+    def _add(self, x: float) -> None:
+        n = self._count()
+        delta = x - self.mean_
+        self.mean_ += delta / n
+        self.m2 += delta * (x - self.mean_)
+
+    def _remove(self, x: float) -> None:
+        # Called before the value leaves the deque
+        n = self._count() - 1
+        if n <= 0:
+            self.mean_, self.m2 = 0.0, 0.0
+            return
+        delta = x - self.mean_
+        self.mean_ -= delta / n
+        self.m2 -= delta * (x - self.mean_)
+
+    def _recompute(self) -> None:
+        observed = [v for v in self.values if not _isnan(v)]
+        if observed:
+            self.mean_ = math.fsum(observed) / len(observed)
+            self.m2 = math.fsum((v - self.mean_) ** 2 for v in observed)
+        else:
+            self.mean_, self.m2 = 0.0, 0.0
+        self.since_exact = 0
+
+    @property
+    def ready(self) -> bool:
+        return len(self.values) == self.window and self.n_nan == 0
+
+    def sum(self) -> float:
+        if not self.ready:
+            return NAN
+        if self.n_nonzero == 0:
+            return 0.0
+        if self.same_run >= self.window:
+            return self.values[-1] * self.window
+        return self.mean_ * self.window
+
+    def mean(self) -> float:
+        if not self.ready:
+            return NAN
+        if self.same_run >= self.window:
+            return self.values[-1]
+        return self.mean_
+
+    def std(self, ddof: int = 1) -> float:
+        if not self.ready or self.window - ddof <= 0:
+            return NAN
+        if self.same_run >= self.window:
+            return 0.0
+        return math.sqrt(max(self.m2, 0.0) / (self.window - ddof))
+
+
+class RollingExtreme(StreamingState):
+    """Rolling min or max over a full window with a monotonic deque (amortized O(1))"""
+
+    def __init__(self, window: int, mode: str = 'min'):
+        self.window = window
+        self.is_min = mode == 'min'
+        self.candidates = deque()
+        self.position = -1
+        self.last_nan = -window
+
+    def update(self, x: float) -> float:
+        self.position += 1
+        if _isnan(x):
+            self.last_nan = self.position
+        else:
+            candidates = self.candidates
+            while candidates and (candidates[-1][1] >= x if self.is_min else candidates[-1][1] <= x):
+                candidates.pop()
+            candidates.append([self.position, x])
+        while self.candidates and self.candidates[0][0] <= self.position - self.window:
+            self.candidates.popleft()
+        if self.position < self.window - 1 or self.position - self.last_nan < self.window:
+            return NAN
+        return self.candidates[0][1]
+
+
+class RollingRank(StreamingState):
+    """Percentile rank of the newest value in its window (average ties)
+
+    Keeps the window sorted, so a rank costs one binary search plus an
+    insertion into a list of window length.
+    """
+
+    def __init__(self, window: int):
+        self.window = window
+        self.values = deque(maxlen=window)
+        self.ordered: List[float] = []
+        self.n_nan = 0
+
+    def update(self, x: float) -> float:
+        if len(self.values) == self.window:
+            old = self.values[0]
+            if _isnan(old):
+                self.n_nan -= 1
+            else:
+                del self.ordered[bisect.bisect_left(self.ordered, old)]
+        self.values.append(x)
+        if _isnan(x):
+            self.n_nan += 1
+            return NAN
+        bisect.insort(self.ordered, x)
+        if len(self.values) < self.window or self.n_nan:
+            return NAN
+        less = bisect.bisect_left(self.ordered, x)
+        equal = bisect.bisect_right(self.ordered, x) - less
+        return (less + (equal + 1) / 2.0) / self.window
+
+
+class RSI(StreamingState):
+    """Wilder RSI (ta semantics)"""
+
+    def __init__(self, window: int = 14):
+        self.prev = NAN
+        self.up = EMA(1.0 / window, window)
+        self.down = EMA(1.0 / window, window)
+
+    def update(self, close: float) -> float:
+        diff = close - self.prev
+        self.prev = close
+        ema_up = self.up.update(diff if diff > 0 else 0.0)
+        ema_down = self.down.update(-diff if diff < 0 else 0.0)
+        if ema_down == 0:
+            return 100.0
+        return 100 - _div(100, 1 + _div(ema_up, ema_down))
+
+
+class ATR(StreamingState):
+    """Wilder average true range; zeros during the warm-up like ta"""
+
+    def __init__(self, window: int = 14):
+        self.window = window
+        self.prev_close = NAN
+        self.count = 0
+        self.warmup_sum = 0.0
+        self.value = 0.0
+
+    def update(self, high: float, low: float, close: float) -> float:
+        prev = self.prev_close
+        self.prev_close = close
+        true_range = high - low
+        if not _isnan(prev):
+            true_range = max(true_range, abs(high - prev), abs(low - prev))
+        self.count += 1
+        if self.count < self.window:
+            self.warmup_sum += true_range
+            return 0.0
+        if self.count == self.window:
+            self.value = (self.warmup_sum + true_range) / self.window
+        else:
+            self.value = (self.window - 1) / self.window * self.value + true_range / self.window
+        return self.value
+
+
+class ADX(StreamingState):
+    """Average directional index with the ta library's smoothing
+
+    Emits 0 during the 2 * window - 1 bar warm-up, as ta does for any
+    ticker with at least 2 * window bars.
+    """
+
+    def __init__(self, window: int = 14):
+        self.window = window
+        self.prev_high = NAN
+        self.prev_low = NAN
+        self.prev_close = NAN
+        self.count = 0
+        self.smoothed = [0.0, 0.0, 0.0]
+        self.dx_sum = 0.0
+        self.value = 0.0
+
+    def update(self, high: float, low: float, close: float) -> float:
+        w = self.window
+        true_range = max(high, self.prev_close) - min(low, self.prev_close)
+        if _isnan(self.prev_close):
+            true_range = NAN
+        diff_up = high - self.prev_high
+        diff_down = self.prev_low - low
+        pos = abs(diff_up) if (diff_up > diff_down and diff_up > 0) else (0.0 if not _isnan(diff_up) else NAN)
+        neg = abs(diff_down) if (diff_down > diff_up and diff_down > 0) else (0.0 if not _isnan(diff_down) else NAN)
+        self.prev_high, self.prev_low, self.prev_close = high, low, close
+
+        row = self.count
+        self.count += 1
+        if row == 0:
+            return 0.0
+        values = (true_range, pos, neg)
+        if row <= w:
+            # Smoothing starts with a plain (NaN-skipping) sum of bars 1..window
+            self.smoothed = [s + v if not _isnan(v) else s for s, v in zip(self.smoothed, values)]
+            if row < w:
+                return 0.0
+        else:
+            self.smoothed = [s * (1 - 1.0 / w) + v for s, v in zip(self.smoothed, values)]
+
+        trs, spos, sneg = self.smoothed
+        dip = _div(100 * spos, trs)
+        din = _div(100 * sneg, trs)
+        dx = 100 * abs(_div(dip - din, dip + din))
+
+        if row < 2 * w - 1:
+            self.dx_sum += dx
+            return 0.0
+        if row == 2 * w - 1:
+            self.value = (self.dx_sum + dx) / w
+        else:
+            self.value = (w - 1) / w * self.value + dx / w
+        return self.value
+
+
+class MoneyFlow(StreamingState):
+    """Money flow index and rolling VWAP over the typical price"""
+
+    def __init__(self, mfi_window: Optional[int], vwap_window: Optional[int]):
+        self.prev_tp = NAN
+        self.positive = RollingWindow(mfi_window) if mfi_window else None
+        self.negative = RollingWindow(mfi_window) if mfi_window else None
+        self.tp_volume = RollingWindow(vwap_window) if vwap_window else None
+        self.volume = RollingWindow(vwap_window) if vwap_window else None
+
+    def update(self, high: float, low: float, close: float, volume: float):
+        typical = (high + low + close) / 3.0
+        mfi = vwap = NAN
+        if self.positive is not None:
+            direction = 1 if typical > self.prev_tp else (-1 if typical < self.prev_tp else 0)
+            flow = typical * volume * direction
+            self.positive.push(max(flow, 0.0) if not _isnan(flow) else NAN)
+            self.negative.push(-min(flow, 0.0) if not _isnan(flow) else NAN)
+            mfi = 100 - _div(100, 1 + _div(self.positive.sum(), self.negative.sum()))
+        if self.tp_volume is not None:
+            self.tp_volume.push(typical * volume)
+            self.volume.push(volume)
+            vwap = _div(self.tp_volume.sum(), self.volume.sum())
+        self.prev_tp = typical
+        return mfi, vwap
+
+
+class VolatilityRegime(StreamingState):
+    """Causal volatility regime on an expanding quantile sketch
+
+    Without timestamps every value is binned against the values before it
+    (one ticker). With timestamps, values of the same date are binned
+    against the sketch of all earlier dates and merged into it once a later
+    date arrives, so every ticker of a date shares its thresholds; values
+    must then come in time order.
+    """
+
+    def __init__(self, relative_accuracy: float = 0.01, min_periods: int = 1):
+        self.min_periods = min_periods
+        self.closed = QuantileSketch(relative_accuracy)
+        self.pending = QuantileSketch(relative_accuracy)
+        self.time = None
+
+    def update(self, value: float, time: Optional[int] = None) -> float:
+        """Regime of value, then add it to the sketch
+
+        Args:
+            value: Rolling volatility
+            time: Bar time (e.g. timestamp in ns), None for a single series
+        """
+        if time is None:
+            regime = self.closed.regime(value, self.min_periods)
+            self.closed.add(value)
+            return regime
+        if self.time is None or time > self.time:
+            self.closed.merge(self.pending)
+            self.pending = QuantileSketch(self.closed.relative_accuracy)
+            self.time = time
+        elif time < self.time:
+            raise ValueError(f"Bar at {pd.Timestamp(time)} arrived after bars at {pd.Timestamp(self.time)}; "
+                             f"universe volatility regimes need bars in time order")
+        self.pending.add(value)
+        return self.closed.regime(value, self.min_periods)
+
+    def state_dict(self) -> Dict[str, Any]:
+        return {
+            'min_periods': self.min_periods,
+            'closed': self.closed.state_dict(),
+            'pending': self.pending.state_dict(),
+            'time': self.time,
+        }
+
+    def load_state_dict(self, state: Dict[str, Any]) -> None:
+        self.min_periods = state['min_periods']
+        self.closed.load_state_dict(state['closed'])
+        self.pending.load_state_dict(state['pending'])
+        self.time = state['time']
+
+
+class TickerFeatureState(StreamingState):
+    """All configured features of one ticker, updated one bar at a time"""
+
+    def __init__(self, config: Dict[str, Any], has_volume: bool = True, has_bu_sd: bool = True):
+        """Build the indicator states
+
+        Args:
+            config: Configuration with a features section
+            has_volume: Whether bars carry volume
+            has_bu_sd: Whether bars carry bu / sd (active buy / sell volume)
+        """
+        feature_config = config.get('features', {})
+        tech = feature_config.get('technical_indicators', {})
+        price = feature_config.get('price_features', {})
+        regime = feature_config.get('regime_features', {})
+
+        self.has_volume = has_volume
+        self.has_bu_sd = has_bu_sd
+
+        self.ema = {period: EMA.span(period) for period in tech.get('ema_periods', [])}
+        self.sma = {period: RollingWindow(period) for period in tech.get('sma_periods', [])}
+
+        self.macd = None
+        if 'macd' in tech:
+            macd_config = tech['macd']
+            self.macd = {
+                'fast': EMA.span(macd_config.get('fast', 12)),
+                'slow': EMA.span(macd_config.get('slow', 26)),
+                'signal': EMA.span(macd_config.get('signal', 9)),
+            }
+
+        self.adx = ADX(tech['adx_period']) if 'adx_period' in tech else None
+        self.rsi = RSI(tech['rsi_period']) if 'rsi_period' in tech else None
+
+        self.stoch = None
+        if 'stoch_period' in tech:
+            self.stoch = {
+                'lowest': RollingExtreme(tech['stoch_period'], 'min'),
+                'highest': RollingExtreme(tech['stoch_period'], 'max'),
+                'signal': RollingWindow(3),
+            }
+
+        self.bollinger = None
+        if 'bollinger' in tech:
+            self.bb_dev = tech['bollinger'].get('std_dev', 2)
+            self.bollinger = RollingWindow(tech['bollinger'].get('period', 20))
+
+        self.atr = ATR(tech['atr_period']) if 'atr_period' in tech else None
+
+        self.money_flow = None
+        if has_volume and ('mfi_period' in tech or 'vwap_period' in tech):
+            self.money_flow = MoneyFlow(tech.get('mfi_period'), tech.get('vwap_period'))
+        self.obv = 0.0
+
+        self.returns_periods = list(price.get('returns_periods', []))
+        self.volatility = None
+        if 'volatility_window' in price:
+            self.volatility = RollingWindow(price['volatility_window'])
+            self.volatility_of_volatility = RollingWindow(price['volatility_window'])
+
+        self.volume_window = None
+        if has_volume and 'volume_ratio_window' in price:
+            self.volume_window = RollingWindow(price['volume_ratio_window'])
+
+        self.trend = RollingWindow(regime['trend_window']) if 'trend_window' in regime else None
+        self.regime_volatility = None
+        self.vol_regime = None
+        settings = regime_settings(regime)
+        if 'volatility_regime_window' in regime and settings['mode'] == 'causal':
+            self.regime_volatility = RollingWindow(regime['volatility_regime_window'])
+            if settings['scope'] == 'ticker':
+                self.vol_regime = VolatilityRegime(settings['relative_accuracy'], settings['min_periods'])
+        self.rank = {window: RollingRank(window) for window in RANK_WINDOWS}
+
+        max_lag = max([1] + self.returns_periods + MOMENTUM_PERIODS)
+        self.closes = deque(maxlen=max_lag + 1)
+        self.filled = deque(maxlen=max_lag + 1)
+        self.bars = 0
+
+    def _lag(self, history: deque, periods: int) -> float:
+        return history[-1 - periods] if len(history) > periods else NAN
+
+    def update(self, bar: Dict[str, float]) -> Dict[str, float]:
+        """Advance by one bar
+
+        Args:
+            bar: Mapping with open, high, low, close and, when configured,
+                volume, bu and sd
+
+        Returns:
+            Feature name to value mapping, in the batch pipeline's column order
+        """
+        open_, high, low, close = (float(bar[col]) for col in ('open', 'high', 'low', 'close'))
+        volume = float(bar['volume']) if self.has_volume else NAN
+
+        self.bars += 1
+        self.closes.append(close)
+        last_filled = self.filled[-1] if self.filled else NAN
+        self.filled.append(last_filled if _isnan(close) else close)
+        prev_close = self._lag(self.closes, 1)
+
+        out: Dict[str, float] = {}
+
+        # Technical indicators
+        for period, ema in self.ema.items():
+            out[f'ema_{period}'] = ema.update(close)
+        for period, window in self.sma.items():
+            window.push(close)
+            out[f'sma_{period}'] = window.mean()
+
+        if self.macd is not None:
+            line = self.macd['fast'].update(close) - self.macd['slow'].update(close)
+            signal = self.macd['signal'].update(line)
+            out['macd'] = line
+            out['macd_signal'] = signal
+            out['macd_diff'] = line - signal
+
+        if self.adx is not None:
+            out['adx'] = self.adx.update(high, low, close)
+
+        if self.rsi is not None:
+            out['rsi'] = self.rsi.update(close)
+
+        if self.stoch is not None:
+            lowest = self.stoch['lowest'].update(low)
+            highest = self.stoch['highest'].update(high)
+            stoch = _div(100 * (close - lowest), highest - lowest)
+            self.stoch['signal'].push(stoch)
+            out['stoch'] = stoch
+            out['stoch_signal'] = self.stoch['signal'].mean()
+
+        if self.bollinger is not None:
+            self.bollinger.push(close)
+            mean, std = self.bollinger.mean(), self.bollinger.std(ddof=0)
+            upper = mean + self.bb_dev * std
+            lower = mean - self.bb_dev * std
+            out['bb_upper'] = upper
+            out['bb_lower'] = lower
+            out['bb_width'] = _div(upper - lower, close)
+            out['bb_position'] = _div(close - lower, upper - lower)
+
+        if self.atr is not None:
+            atr = self.atr.update(high, low, close)
+            out['atr'] = atr
+            out['atr_ratio'] = _div(atr, close)
+
+        if self.money_flow is not None:
+            mfi, vwap = self.money_flow.update(high, low, close, volume)
+            if self.money_flow.positive is not None:
+                out['mfi'] = mfi
+            if self.money_flow.tp_volume is not None:
+                out['vwap'] = vwap
+                out['vwap_ratio'] = _div(close, vwap)
+
+        if self.has_volume:
+            signed = -volume if close < prev_close else volume
+            if _isnan(signed):
+                out['obv'] = NAN
+            else:
+                self.obv += signed
+                out['obv'] = self.obv
+
+        # Price features
+        for period in self.returns_periods:
+            out[f'return_{period}d'] = _div(self.filled[-1], self._lag(self.filled, period)) - 1
+
+        if self.volatility is not None:
+            self.volatility.push(_div(self.filled[-1], self._lag(self.filled, 1)) - 1)
+            volatility = self.volatility.std(ddof=1)
+            self.volatility_of_volatility.push(volatility)
+            out['volatility'] = volatility
+            out['volatility_of_volatility'] = self.volatility_of_volatility.std(ddof=1)
+
+        if self.volume_window is not None:
+            self.volume_window.push(volume)
+            volume_sma = self.volume_window.mean()
+            out['volume_sma'] = volume_sma
+            out['volume_ratio'] = _div(volume, volume_sma)
+            out['volume_zscore'] = _div(volume - volume_sma, self.volume_window.std(ddof=1))
+
+        if self.has_bu_sd:
+            bu, sd = float(bar['bu']), float(bar['sd'])
+            out['bu_sd_ratio'] = _div(bu, sd + 1e-8)
+            out['net_active_volume'] = bu - sd
+            out['active_volume_ratio'] = _div(bu - sd, bu + sd + 1e-8)
+
+        out['high_low_ratio'] = _div(high - low, close)
+        out['close_open_ratio'] = _div(close - open_, open_)
+        out['gap'] = _div(open_ - prev_close, prev_close)
+
+        # Regime features
+        if self.trend is not None:
+            self.trend.push(close)
+            trend_sma = self.trend.mean()
+            out['trend_sma'] = trend_sma
+            out['above_trend'] = 1.0 if close > trend_sma else 0.0
+
+        if self.regime_volatility is not None:
+            self.regime_volatility.push(_div(self.filled[-1], self._lag(self.filled, 1)) - 1)
+            rolling_vol = self.regime_volatility.std(ddof=1)
+            # Universe-scope regimes are binned by the engineer, which sees every ticker
+            out['vol_regime'] = rolling_vol if self.vol_regime is None else self.vol_regime.update(rolling_vol)
+
+        # Momentum features
+        for period in MOMENTUM_PERIODS:
+            prev = self._lag(self.closes, period)
+            out[f'roc_{period}'] = _div(close - prev, prev) * 100
+        for period in MOMENTUM_PERIODS:
+            prev = self._lag(self.closes, period)
+            out[f'cum_return_{period}d'] = (_div(close, prev) - 1) * 100
+        for window, rank in self.rank.items():
+            out[f'price_rank_{window}d'] = rank.update(close)
+
+        return out
+
+
+class StreamingFeatureEngineer:
+    """Per-ticker streaming feature states with JSON checkpoints"""
+
+    def __init__(self, config: Dict[str, Any]):
+        """Initialize with the features configuration
+
+        Args:
+            config: Configuration with a features section
+        """
+        self.config = {'features': config.get('features', {})}
+        self.tickers: Dict[str, TickerFeatureState] = {}
+
+        regime = self.config['features'].get('regime_features', {})
+        settings = regime_settings(regime)
+        self.regime = None
+        if regime.get('volatility_regime_window') and settings['mode'] == 'full_sample':
+            logger.info(f"Streaming features skip {', '.join(UNSUPPORTED_FEATURES)} "
+                        f"(full-history terciles are not causal)")
+        elif regime.get('volatility_regime_window') and settings['scope'] == 'universe':
+            # One sketch shared by every ticker
+            self.regime = VolatilityRegime(settings['relative_accuracy'], settings['min_periods'])
+
+    def _state(self, ticker: str, bar: Dict[str, float]) -> TickerFeatureState:
+        if ticker not in self.tickers:
+            self.tickers[ticker] = TickerFeatureState(
+                self.config,
+                has_volume='volume' in bar,
+                has_bu_sd='bu' in bar and 'sd' in bar,
+            )
+        return self.tickers[ticker]
+
+    def update(self, ticker: str, bar: Dict[str, float]) -> Dict[str, float]:
+        """Features of a ticker's next bar
+
+        Args:
+            ticker: Ticker symbol
+            bar: Mapping with open, high, low, close (volume, bu, sd optional);
+                universe volatility regimes also need its timestamp
+
+        Returns:
+            Feature name to value mapping
+        """
+        out = self._state(ticker, bar).update(bar)
+        if self.regime is not None:
+            if 'timestamp' not in bar:
+                raise ValueError("Universe volatility regimes need bar timestamps")
+            out['vol_regime'] = self.regime.update(out['vol_regime'], pd.Timestamp(bar['timestamp']).value)
+        return out
+
+    def update_frame(self, data: pd.DataFrame) -> pd.DataFrame:
+        """Feed a long frame bar by bar (in row order) and collect the features
+
+        With universe volatility regimes, bars are fed in time order instead
+        (each ticker's bars keep their row order).
+
+        Args:
+            data: Bars with ticker and OHLC columns
+
+        Returns:
+            DataFrame of features aligned with data's index
+        """
+        bar_columns = [col for col in ('timestamp', 'open', 'high', 'low', 'close', 'volume', 'bu', 'sd')
+                       if col in data.columns]
+        order = np.arange(len(data))
+        if self.regime is not None:
+            order = np.argsort(pd.to_datetime(data['timestamp']).to_numpy(), kind='stable')
+        tickers = data['ticker'].astype(str).to_numpy()[order]
+        rows = []
+        for ticker, *values in zip(tickers, *(data[col].to_numpy()[order] for col in bar_columns)):
+            rows.append(self.update(ticker, dict(zip(bar_columns, values))))
+        rows = [rows[i] for i in np.argsort(order)]
+        return pd.DataFrame(rows, index=data.index)
+
+    def warm_up(self, data: pd.DataFrame) -> None:
+        """Replay history so the states are ready for live bars
+
+        Args:
+            data: Historical bars with ticker and OHLC columns, sorted by time
+        """
+        self.update_frame(data)
+        logger.info(f"Warmed up streaming features for {len(self.tickers)} tickers over {len(data)} bars")
+
+    def state_dict(self) -> Dict[str, Any]:
+        """JSON-compatible state of all tickers"""
+        return {
+            'config': self.config,
+            'regime': self.regime.state_dict() if self.regime is not None else None,
+            'tickers': {
+                ticker: {'has_volume': state.has_volume, 'has_bu_sd': state.has_bu_sd,
+                         'state': state.state_dict()}
+                for ticker, state in self.tickers.items()
+            },
+        }
+
+    @classmethod
+    def from_state_dict(cls, state: Dict[str, Any]) -> "StreamingFeatureEngineer":
+        """Rebuild an engineer from ``state_dict`` output"""
+        engineer = cls(state['config'])
+        if state.get('regime') is not None:
+            engineer.regime.load_state_dict(state['regime'])
+        for ticker, entry in state['tickers'].items():
+            ticker_state = TickerFeatureState(engineer.config, entry['has_volume'], entry['has_bu_sd'])
+            ticker_state.load_state_dict(entry['state'])
+            engineer.tickers[ticker] = ticker_state
+        return engineer
+
+    def save(self, path: str) -> None:
+        """Atomically write a JSON checkpoint
+
+        Args:
+            path: Checkpoint file path
+        """
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_suffix(path.suffix + '.tmp')
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(self.state_dict(), f)
+        os.replace(tmp_path, path)
+
+    @classmethod
+    def load(cls, path: str) -> "StreamingFeatureEngineer":
+        """Resume from a JSON checkpoint
+
+        Args:
+            path: Checkpoint file path
+
+        Returns:
+            StreamingFeatureEngineer
+        """
+        with open(path, 'r', encoding='utf-8') as f:
+            return cls.from_state_dict(json.load(f))
+
+
+def create_streaming_feature_engineer(config: Dict[str, Any]) -> StreamingFeatureEngineer:
+    """Create StreamingFeatureEngineer instance
+
+    Args:
+        config: Configuration with a features section
+
+    Returns:
+        StreamingFeatureEngineer instance
+    """
+    return StreamingFeatureEngineer(config)
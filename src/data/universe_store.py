@@ -0,0 +1,198 @@
+"""Point-in-time index constituent store"""
+
+import bisect
+import json
+import os
+import threading
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional
+
+import pandas as pd
+from loguru import logger
+
+
+class UniverseStore:
+    """Local store of universe constituents (VN30, VN100, HOSE, ...)
+
+    Each universe keeps a date-sorted list of snapshots; a snapshot dated D
+    is in effect from D until the next snapshot. Constituents as of any date
+    are resolved with a binary search. The latest snapshot is refreshed from
+    the API at most once per ``ttl`` seconds, and a new snapshot is only
+    recorded when the constituents actually changed. History from before
+    the store was used can be imported from a dated CSV (``import_csv``).
+
+    Layout::
+
+        <root>/<UNIVERSE>.json   # {"fetched_at": ..., "dates": [...], "tickers": [[...], ...]}
+    """
+
+    def __init__(self, root: str = "data/store/universe", ttl: float = 86400.0):
+        """Initialize store
+
+        Args:
+            root: Root directory of the store
+            ttl: Seconds after which the latest snapshot is refreshed on next use
+        """
+        self.root = Path(root)
+        self.ttl = ttl
+        self._universes: Dict[str, Dict[str, Any]] = {}
+        self._lock = threading.RLock()
+
+    def _path(self, universe: str) -> Path:
+        return self.root / f"{universe}.json"
+
+    def _load(self, universe: str) -> Dict[str, Any]:
+        """Load a universe's snapshots (cached in memory)"""
+        if universe not in self._universes:
+            path = self._path(universe)
+            if path.exists():
+                with open(path, 'r', encoding='utf-8') as f:
+                    self._universes[universe] = json.load(f)
+            else:
+                self._universes[universe] = {'fetched_at': None, 'dates': [], 'tickers': []}
+        return self._universes[universe]
+
+    def _save(self, universe: str) -> None:
+        """Atomically persist a universe's snapshots"""
+        self.root.mkdir(parents=True, exist_ok=True)
+        path = self._path(universe)
+        tmp_path = path.with_suffix('.json.tmp')
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(self._universes[universe], f, indent=2)
+        os.replace(tmp_path, path)
+
+    def _insert(self, universe: str, date: str, tickers: List[str]) -> bool:
+        """Insert a snapshot in memory unless the constituents are unchanged"""
+        entry = self._load(universe)
+        dates = entry['dates']
+        i = bisect.bisect_right(dates, date)
+
+        # Same constituents as the snapshot in effect on that date
+        if i > 0 and entry['tickers'][i - 1] == tickers:
+            return False
+
+        if i > 0 and dates[i - 1] == date:
+            entry['tickers'][i - 1] = tickers
+        else:
+            dates.insert(i, date)
+            entry['tickers'].insert(i, tickers)
+        return True
+
+    def record(self, universe: str, tickers: List[str], as_of: Optional[str] = None) -> bool:
+        """Record the constituents of a universe effective from a date
+
+        Args:
+            universe: Universe name
+            tickers: Constituent tickers
+            as_of: Effective date (YYYY-MM-DD), None for today
+
+        Returns:
+            True if a new snapshot was stored, False if unchanged
+        """
+        date = pd.Timestamp(as_of or pd.Timestamp.today()).strftime('%Y-%m-%d')
+        tickers = sorted(tickers)
+
+        with self._lock:
+            if not self._insert(universe, date, tickers):
+                return False
+            self._save(universe)
+
+        logger.info(f"Recorded {len(tickers)} {universe} constituents effective {date}")
+        return True
+
+    def import_csv(self, path: str, universe: Optional[str] = None) -> int:
+        """Record historical snapshots from a CSV of dated constituents
+
+        One row per constituent and effective date, with ``date`` and
+        ``ticker`` columns and an optional ``universe`` column; the rows of
+        a date form that date's snapshot. Importing the same file again
+        records nothing.
+
+        Args:
+            path: CSV path
+            universe: Universe of every row when the CSV has no universe column
+
+        Returns:
+            Number of snapshots recorded
+        """
+        rows = pd.read_csv(path, dtype=str)
+        if 'universe' not in rows.columns:
+            if universe is None:
+                raise ValueError(f"{path} has no universe column; pass the universe to import it into")
+            rows['universe'] = universe
+        rows['date'] = pd.to_datetime(rows['date']).dt.strftime('%Y-%m-%d')
+
+        recorded = 0
+        with self._lock:
+            for name, snapshots in rows.groupby('universe', sort=True):
+                added = sum(self._insert(name, date, sorted(snapshot['ticker'].str.strip()))
+                            for date, snapshot in snapshots.groupby('date', sort=True))
+                if added:
+                    self._save(name)
+                    logger.info(f"Imported {added} {name} snapshots from {path}")
+                recorded += added
+        return recorded
+
+    def is_stale(self, universe: str) -> bool:
+        """Whether the latest snapshot is older than the TTL"""
+        with self._lock:
+            fetched_at = self._load(universe)['fetched_at']
+        return fetched_at is None or time.time() - fetched_at >= self.ttl
+
+    def refresh(self, universe: str, fetch_fn: Callable[[str], List[str]]) -> None:
+        """Fetch current constituents and record them if they changed
+
+        Args:
+            universe: Universe name
+            fetch_fn: Callable(universe) returning the current constituents
+        """
+        tickers = fetch_fn(universe)
+        with self._lock:
+            self.record(universe, tickers)
+            self._load(universe)['fetched_at'] = time.time()
+            self._save(universe)
+
+    def constituents(
+        self,
+        universe: str,
+        as_of: Optional[str] = None,
+        fetch_fn: Optional[Callable[[str], List[str]]] = None
+    ) -> List[str]:
+        """Constituents of a universe as of a date
+
+        Args:
+            universe: Universe name
+            as_of: Date (YYYY-MM-DD), None for the latest constituents
+            fetch_fn: Callable(universe) used to refresh a stale latest
+                snapshot, or to record one when none is stored
+
+        Returns:
+            Sorted constituent tickers; the earliest snapshot's, with a
+            warning, when as_of predates every snapshot
+        """
+        if fetch_fn is not None and (as_of is None and self.is_stale(universe)
+                                     or not self._load(universe)['dates']):
+            try:
+                self.refresh(universe, fetch_fn)
+            except Exception as e:
+                if not self._load(universe)['dates']:
+                    raise
+                logger.warning(f"Failed to refresh {universe} constituents, using stored snapshot: {e}")
+
+        date = pd.Timestamp(as_of or pd.Timestamp.today()).strftime('%Y-%m-%d')
+        with self._lock:
+            entry = self._load(universe)
+            if not entry['dates']:
+                raise ValueError(f"No {universe} snapshot stored; import constituents with "
+                                 f"UniverseStore.import_csv or UniverseStore.record")
+            i = bisect.bisect_right(entry['dates'], date)
+            if i == 0:
+                # Later constituents stand in for the earlier ones: survivorship bias
+                logger.warning(
+                    f"No {universe} snapshot on or before {date}, using the earliest one "
+                    f"({entry['dates'][0]}); import historical constituents with "
+                    f"UniverseStore.import_csv (data.universe_store.snapshots_csv)"
+                )
+                i = 1
+            return list(entry['tickers'][i - 1])
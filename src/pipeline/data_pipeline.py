@@ -1,14 +1,165 @@
 """End-to-end data processing pipeline"""
 
+import pickle
+import shutil
+import tempfile
+import numpy as np
 import pandas as pd
+import pyarrow.parquet as pq
 from pathlib import Path
-from typing import Dict, Any, Tuple
+from typing import Dict, Any, List, Optional, Tuple
 from loguru import logger
 
 from ..data.data_fetcher import create_data_fetcher
 from ..data.feature_engineering import create_feature_engineer
-from ..data.labeling import apply_triple_barrier_labeling, analyze_labeling_quality
+from ..data.labeling import (
+    analyze_labeling_quality, apply_triple_barrier_labeling, labeling_quality_from_counts
+)
+from ..data.schema import iter_market_csv
 from ..utils.config_loader import config_loader
+from ..utils.profiling import Stopwatch, peak_rss_mb
+
+# Feature columns read together per pass when computing streaming fill values
+FILL_COLUMNS_PER_PASS = 8
+
+# Values of a column gathered in memory once an order statistic is narrowed
+# down to that many candidates (8 bytes each)
+SELECT_COLLECT_KEYS = 1 << 16
+
+# Rows per read chunk and per sorted block when splitting the final CSV out of core
+SPLIT_CHUNK_ROWS = 5_000
+SPLIT_BLOCK_ROWS = 20_000
+
+SPLIT_NAMES = ('train', 'val', 'test')
+
+_SIGN_BIT = np.uint64(1 << 63)
+_DIGIT_BITS = 16
+
+
+def _sortable_keys(values: np.ndarray) -> np.ndarray:
+    """uint64 keys sorting like the (non-NaN) values as float64"""
+    bits = np.ascontiguousarray(values, dtype=np.float64).view(np.uint64)
+    return np.where((bits & _SIGN_BIT) != 0, ~bits, bits | _SIGN_BIT)
+
+
+def _key_value(key: int) -> float:
+    """float64 value of a _sortable_keys key"""
+    key = np.uint64(key)
+    bits = key & ~_SIGN_BIT if key & _SIGN_BIT else ~key
+    return float(np.array([bits], dtype=np.uint64).view(np.float64)[0])
+
+
+def _median_ranks(n: int) -> List[int]:
+    """Ranks (0-based, ascending) of the values a median of n values averages"""
+    if n == 0:
+        return []
+    return [n // 2] if n % 2 else [n // 2 - 1, n // 2]
+
+
+def _median_value(selection: "_RadixSelect", dtype: Any) -> Any:
+    """pandas median of the values a resolved median selection found"""
+    values = [_key_value(key) for key in selection.keys()]
+    return pd.Series(np.array(values, dtype=np.float64).astype(dtype, copy=False)).median()
+
+
+class _RadixSelect:
+    """Exact order statistics of values streamed over several passes
+
+    Values are given as _sortable_keys. Each pass histograms the next 16-bit
+    digit of the keys sharing the prefix found so far, until few enough keys
+    share it (SELECT_COLLECT_KEYS); those are collected in one more pass and
+    the rank is picked directly. Memory stays bounded by the collect size
+    whatever the number of values, at the cost of up to five passes.
+    """
+
+    def __init__(self, ranks: List[int], size: int, extra: Optional[Tuple[int, int]] = None):
+        """Initialize selection
+
+        Args:
+            ranks: 0-based ranks to select, in ascending order of value
+            size: Number of values, extra copies included
+            extra: Optional (key, count), count more copies of key counted
+                as if they were streamed
+        """
+        self.extra_key, self.extra_count = extra if extra is not None else (0, 0)
+        self.targets = [{'rank': rank, 'bits': 0, 'prefix': 0, 'size': size, 'key': None}
+                        for rank in ranks]
+        self.collected: Dict[Tuple[int, int], List[np.ndarray]] = {}
+        self.histograms: Dict[Tuple[int, int], np.ndarray] = {}
+
+    @property
+    def done(self) -> bool:
+        return all(target['key'] is not None for target in self.targets)
+
+    def keys(self) -> List[int]:
+        """Selected keys, one per rank"""
+        return [target['key'] for target in self.targets]
+
+    @staticmethod
+    def _matching(keys: np.ndarray, bits: int, prefix: int) -> np.ndarray:
+        """Keys whose top bits equal prefix"""
+        if bits == 0:
+            return keys
+        return keys[(keys >> np.uint64(64 - bits)) == np.uint64(prefix)]
+
+    def _extra_matches(self, bits: int, prefix: int) -> int:
+        """Copies of the extra key sharing prefix"""
+        if not self.extra_count or (bits and int(self.extra_key) >> (64 - bits) != prefix):
+            return 0
+        return self.extra_count
+
+    def start_pass(self) -> None:
+        """Choose, per unresolved rank, between histogramming and collecting"""
+        self.collected, self.histograms = {}, {}
+        for target in self.targets:
+            if target['key'] is not None:
+                continue
+            slot = (target['bits'], target['prefix'])
+            if target['size'] <= SELECT_COLLECT_KEYS:
+                self.collected.setdefault(slot, [])
+            else:
+                self.histograms.setdefault(slot, np.zeros(1 << _DIGIT_BITS, dtype=np.int64))
+
+    def update(self, keys: np.ndarray) -> None:
+        """Account for one chunk of keys"""
+        for (bits, prefix), found in self.collected.items():
+            found.append(self._matching(keys, bits, prefix))
+        for (bits, prefix), histogram in self.histograms.items():
+            shift = np.uint64(64 - bits - _DIGIT_BITS)
+            digits = (self._matching(keys, bits, prefix) >> shift) & np.uint64((1 << _DIGIT_BITS) - 1)
+            histogram += np.bincount(digits.astype(np.intp), minlength=1 << _DIGIT_BITS)
+
+    def finish_pass(self) -> None:
+        """Narrow down or resolve each rank from the pass"""
+        for target in self.targets:
+            if target['key'] is not None:
+                continue
+            bits, prefix = target['bits'], target['prefix']
+            extra = self._extra_matches(bits, prefix)
+            if (bits, prefix) in self.collected:
+                keys = np.sort(np.concatenate(self.collected[(bits, prefix)] or [np.empty(0, np.uint64)]))
+                rank, before = target['rank'], int(np.searchsorted(keys, np.uint64(self.extra_key)))
+                if not extra or rank < before:
+                    target['key'] = int(keys[rank])
+                elif rank < before + extra:
+                    target['key'] = int(self.extra_key)
+                else:
+                    target['key'] = int(keys[rank - extra])
+                continue
+
+            histogram = self.histograms[(bits, prefix)].copy()
+            if extra:
+                histogram[(int(self.extra_key) >> (64 - bits - _DIGIT_BITS)) & ((1 << _DIGIT_BITS) - 1)] += extra
+            counts = np.cumsum(histogram)
+            digit = int(np.searchsorted(counts, target['rank'], side='right'))
+            target['rank'] -= int(counts[digit - 1]) if digit else 0
+            target['prefix'] = (prefix << _DIGIT_BITS) | digit
+            target['bits'] = bits + _DIGIT_BITS
+            target['size'] = int(histogram[digit])
+            if target['bits'] == 64:
+                target['key'] = target['prefix']
+        self.collected, self.histograms = {}, {}
+
 
 
 class DataPipeline:
@@ -25,16 +176,21 @@ class DataPipeline:
         self.password = password
         self.data_fetcher = None
         self.feature_engineer = None
+        self.run_stats = None
 
-    def setup(self) -> None:
-        """Setup pipeline components"""
+    def setup(self, config: Optional[Dict[str, Any]] = None) -> None:
+        """Setup pipeline components
+
+        Args:
+            config: Configuration dictionary
+        """
         logger.info("Setting up data pipeline...")
 
         # Create data fetcher
-        self.data_fetcher = create_data_fetcher(self.username, self.password)
+        self.data_fetcher = create_data_fetcher(self.username, self.password, config)
 
         # Create feature engineer
-        self.feature_engineer = create_feature_engineer(self.data_fetcher.client)
+        self.feature_engineer = create_feature_engineer(self.data_fetcher.client, config)
 
         logger.info("Data pipeline setup completed")
 
@@ -45,6 +201,9 @@ class DataPipeline:
     ) -> pd.DataFrame:
         """Run complete data processing pipeline
 
+        Every stage processes the whole universe at once; see
+        run_streaming_pipeline for the bounded-memory alternative.
+
         Args:
             config: Configuration dictionary
             save_intermediate: Whether to save intermediate results
@@ -54,54 +213,328 @@ class DataPipeline:
         """
         logger.info("Starting data pipeline...")
 
-        # Setup if not done
-        if self.data_fetcher is None:
-            self.setup()
-
-        # Step 1: Fetch raw data
-        logger.info("Step 1: Fetching raw data...")
-        raw_data = self.data_fetcher.prepare_dataset(config, save_raw=True)
+        with Stopwatch() as stopwatch:
+            # Setup if not done
+            if self.data_fetcher is None:
+                self.setup(config)
+
+            # Step 1: Fetch raw data
+            logger.info("Step 1: Fetching raw data...")
+            raw_data = self.data_fetcher.prepare_dataset(config, save_raw=True)
+
+            if save_intermediate:
+                raw_path = "data/raw/trading_data.csv"
+                raw_data.to_csv(raw_path, index=False)
+                logger.info(f"Saved raw data to {raw_path}")
+
+            # Step 2: Apply triple-barrier labeling
+            logger.info("Step 2: Applying triple-barrier labeling...")
+            labeled_data = apply_triple_barrier_labeling(raw_data, config)
+
+            # Analyze labeling quality
+            labeling_quality = analyze_labeling_quality(labeled_data, config)
+            logger.info(f"Labeling quality metrics: {labeling_quality}")
+
+            if save_intermediate:
+                labeled_path = "data/processed/labeled_data.csv"
+                Path(labeled_path).parent.mkdir(parents=True, exist_ok=True)
+                labeled_data.to_csv(labeled_path, index=False)
+                logger.info(f"Saved labeled data to {labeled_path}")
+
+            # Step 3: Feature engineering
+            logger.info("Step 3: Engineering features...")
+            featured_data = self.feature_engineer.engineer_features(labeled_data, config)
+
+            if save_intermediate:
+                featured_path = "data/processed/featured_data.csv"
+                featured_data.to_csv(featured_path, index=False)
+                logger.info(f"Saved featured data to {featured_path}")
+
+            # Step 4: Data cleaning and validation
+            logger.info("Step 4: Cleaning and validating data...")
+            final_data = self.clean_and_validate_data(featured_data)
+
+            # Save final dataset
+            final_path = "data/final/final_dataset.csv"
+            Path(final_path).parent.mkdir(parents=True, exist_ok=True)
+            final_data.to_csv(final_path, index=False)
+            logger.info(f"Saved final dataset to {final_path}")
+
+        self._log_run_stats('batch', stopwatch.elapsed, len(final_data))
+        logger.info("Data pipeline completed successfully")
+        return final_data
 
-        if save_intermediate:
-            raw_path = "data/raw/trading_data.csv"
-            raw_data.to_csv(raw_path, index=False)
-            logger.info(f"Saved raw data to {raw_path}")
+    def run_streaming_pipeline(
+        self,
+        config: Dict[str, Any],
+        save_intermediate: bool = True
+    ) -> Path:
+        """Run the pipeline one ticker batch at a time
+
+        Each batch goes through fetch, labeling, feature engineering and row
+        filtering, and is appended to a Parquet part file in a private run
+        directory under data.pipeline.work_dir, so peak memory is bounded by
+        the largest batch rather than the universe. Missing and infinite
+        features are then filled with universe-wide values computed over the
+        parts without loading whole columns (see _streaming_fill_values), and
+        the parts are appended to the final CSV.
+        The output is identical to the batch mode except for hit_time and
+        vbar_end: labeling stores row-index values of the labeled frame in
+        them, i.e. positions within the ticker batch here and within the
+        whole universe in batch mode.
 
-        # Step 2: Apply triple-barrier labeling
-        logger.info("Step 2: Applying triple-barrier labeling...")
-        labeled_data = apply_triple_barrier_labeling(raw_data, config)
+        Args:
+            config: Configuration dictionary
+            save_intermediate: Whether to append intermediate results to the
+                raw/labeled/featured CSVs
 
-        # Analyze labeling quality
-        labeling_quality = analyze_labeling_quality(labeled_data, config)
-        logger.info(f"Labeling quality metrics: {labeling_quality}")
+        Returns:
+            Path of the final dataset CSV
+        """
+        logger.info("Starting streaming data pipeline...")
+        pipeline_config = config.get('data', {}).get('pipeline', {})
+        batch_size = int(pipeline_config.get('batch_size', 1))
+        work_dir = Path(pipeline_config.get('work_dir', 'data/store/pipeline'))
+
+        intermediate_paths = {
+            'raw': Path("data/raw/trading_data.csv"),
+            'labeled': Path("data/processed/labeled_data.csv"),
+            'featured': Path("data/processed/featured_data.csv"),
+        }
+        final_path = Path("data/final/final_dataset.csv")
+
+        with Stopwatch() as stopwatch:
+            if self.data_fetcher is None:
+                self.setup(config)
+
+            for path in [final_path, *intermediate_paths.values()]:
+                path.parent.mkdir(parents=True, exist_ok=True)
+                path.unlink(missing_ok=True)
+            work_dir.mkdir(parents=True, exist_ok=True)
+            parts_dir = Path(tempfile.mkdtemp(prefix="run-", dir=work_dir))
+
+            try:
+                parts: List[Path] = []
+                label_counts = pd.Series(dtype='int64')
+                hit_type_counts = pd.Series(dtype='int64')
+                initial_rows = 0
+
+                for raw_batch in self.data_fetcher.iter_dataset(config, batch_size):
+                    tickers = list(raw_batch['ticker'].unique())
+                    logger.info(f"Processing batch {len(parts) + 1}: {tickers} ({len(raw_batch)} rows)")
+
+                    labeled_batch = apply_triple_barrier_labeling(raw_batch, config)
+                    featured_batch = self.feature_engineer.engineer_features(labeled_batch, config)
+
+                    if save_intermediate:
+                        for name, batch in (('raw', raw_batch), ('labeled', labeled_batch),
+                                            ('featured', featured_batch)):
+                            path = intermediate_paths[name]
+                            batch.to_csv(path, mode='a', header=not path.exists(), index=False)
+
+                    if 'label' in labeled_batch.columns:
+                        labeled_rows = labeled_batch.dropna(subset=['label'])
+                        label_counts = label_counts.add(labeled_rows['label'].value_counts(), fill_value=0)
+                        hit_type_counts = hit_type_counts.add(
+                            labeled_rows['hit_type'].value_counts(), fill_value=0)
+                        del labeled_rows
+
+                    initial_rows += len(featured_batch)
+                    filtered = self._drop_incomplete_rows(featured_batch)
+                    del raw_batch, labeled_batch, featured_batch
+
+                    if filtered.empty:
+                        continue
+                    part_path = parts_dir / f"part-{len(parts):05d}.parquet"
+                    filtered.to_parquet(part_path, index=False)
+                    parts.append(part_path)
+
+                if not parts:
+                    raise ValueError("No valid data available")
+
+                labeling_quality = labeling_quality_from_counts(label_counts, hit_type_counts, config)
+                logger.info(f"Labeling quality metrics: {labeling_quality}")
+
+                total_rows = self._write_filled_parts(parts, final_path)
+            finally:
+                shutil.rmtree(parts_dir, ignore_errors=True)
+
+            logger.info(f"Removed {initial_rows - total_rows} rows without labels or with "
+                        f"excessive missing values")
+            logger.info(f"Saved final dataset to {final_path}")
+
+        self._log_run_stats('streaming', stopwatch.elapsed, total_rows)
+        logger.info("Streaming data pipeline completed successfully")
+        return final_path
+
+    def _log_run_stats(self, mode: str, elapsed: float, rows: int) -> None:
+        """Record and log runtime and peak memory of a pipeline run"""
+        peak = peak_rss_mb()
+        self.run_stats = {'mode': mode, 'seconds': elapsed, 'peak_rss_mb': peak, 'rows': rows}
+        peak_text = f"{peak:.0f} MB" if peak is not None else "n/a"
+        logger.info(f"Data pipeline ({mode}): {rows} rows in {elapsed:.1f}s, peak RSS {peak_text}")
+
+    def _drop_incomplete_rows(self, data: pd.DataFrame) -> pd.DataFrame:
+        """Remove rows without labels or with too many missing features
+
+        Both filters are row-local, so they can be applied per ticker batch.
+        """
+        if 'label' not in data.columns:
+            return data.iloc[0:0]
 
-        if save_intermediate:
-            labeled_path = "data/processed/labeled_data.csv"
-            Path(labeled_path).parent.mkdir(parents=True, exist_ok=True)
-            labeled_data.to_csv(labeled_path, index=False)
-            logger.info(f"Saved labeled data to {labeled_path}")
+        # Remove rows without labels
+        data = data.dropna(subset=['label'])
 
-        # Step 3: Feature engineering
-        logger.info("Step 3: Engineering features...")
-        featured_data = self.feature_engineer.engineer_features(labeled_data, config)
+        # Remove rows with too many missing features
+        feature_cols = self.feature_engineer.get_feature_list(data)
+        missing_threshold = 0.8   # Remove rows with >50% missing features
+        missing_counts = data[feature_cols].isnull().sum(axis=1)
+        valid_rows = missing_counts <= (len(feature_cols) * missing_threshold)
+        return data[valid_rows]
 
-        if save_intermediate:
-            featured_path = "data/processed/featured_data.csv"
-            featured_data.to_csv(featured_path, index=False)
-            logger.info(f"Saved featured data to {featured_path}")
+    @staticmethod
+    def _column_fill_values(column: pd.Series) -> Tuple[Any, Any]:
+        """Values used to fill missing and infinite entries of a feature column
 
-        # Step 4: Data cleaning and validation
-        logger.info("Step 4: Cleaning and validating data...")
-        final_data = self.clean_and_validate_data(featured_data)
+        Returns:
+            Tuple of (missing fill, infinite fill), None where nothing to fill
+        """
+        nan_fill = inf_fill = None
+        if column.isnull().any():
+            if pd.api.types.is_numeric_dtype(column):
+                # Fill numeric columns with median
+                nan_fill = column.median()
+            else:
+                # Fill categorical columns with mode
+                nan_fill = column.mode().iloc[0] if not column.mode().empty else 0
+            column = column.fillna(nan_fill)
+
+        # Infinite values are replaced by the median of the filled column
+        if pd.api.types.is_float_dtype(column) and np.isinf(column.to_numpy()).any():
+            inf_fill = column.median()
+        return nan_fill, inf_fill
+
+    @staticmethod
+    def _apply_fill_values(column: pd.Series, nan_fill: Any, inf_fill: Any) -> pd.Series:
+        """Fill a feature column with values from _column_fill_values"""
+        if nan_fill is not None:
+            column = column.fillna(nan_fill)
+        if inf_fill is not None:
+            column = column.replace([float('inf'), float('-inf')], inf_fill)
+        return column
+
+    def _streaming_fill_values(self, parts: List[Path], feature_cols: List[str]) -> Dict[str, Tuple[Any, Any]]:
+        """Same fill values as _column_fill_values, over columns split across parts
+
+        Columns are read a few at a time (FILL_COLUMNS_PER_PASS), one part
+        at a time: a first pass counts missing and infinite values (and the
+        values of non-numeric columns, for the mode), medians are then
+        selected exactly with _RadixSelect over further passes, first for the
+        missing fill and then for the infinite fill, whose column includes
+        the filled values.
 
-        # Save final dataset
-        final_path = "data/final/final_dataset.csv"
-        Path(final_path).parent.mkdir(parents=True, exist_ok=True)
-        final_data.to_csv(final_path, index=False)
-        logger.info(f"Saved final dataset to {final_path}")
+        Returns:
+            Column -> (missing fill, infinite fill) for columns with something to fill
+        """
+        fill_values = {}
+        for start in range(0, len(feature_cols), FILL_COLUMNS_PER_PASS):
+            group = feature_cols[start:start + FILL_COLUMNS_PER_PASS]
+            stats = {col: {'rows': 0, 'missing': 0, 'infinite': 0, 'values': None, 'empty': None}
+                     for col in group}
+            for path in parts:
+                data = pd.read_parquet(path, columns=group)
+                for col in group:
+                    column, col_stats = data[col], stats[col]
+                    col_stats['empty'] = (column.iloc[:0] if col_stats['empty'] is None
+                                          else pd.concat([col_stats['empty'], column.iloc[:0]]))
+                    col_stats['rows'] += len(column)
+                    col_stats['missing'] += int(column.isnull().sum())
+                    if pd.api.types.is_float_dtype(column):
+                        col_stats['infinite'] += int(np.isinf(column.to_numpy()).sum())
+                    elif not pd.api.types.is_numeric_dtype(column):
+                        counts = column.value_counts()
+                        col_stats['values'] = (counts if col_stats['values'] is None
+                                               else col_stats['values'].add(counts, fill_value=0))
+                del data
+
+            # Missing fill: median of the non-missing values, or mode
+            nan_fills, selections = {}, {}
+            for col, col_stats in stats.items():
+                if not col_stats['missing']:
+                    continue
+                if pd.api.types.is_numeric_dtype(col_stats['empty']):
+                    size = col_stats['rows'] - col_stats['missing']
+                    selections[col] = _RadixSelect(_median_ranks(size), size)
+                else:
+                    counts = col_stats['values']
+                    modes = counts[counts == counts.max()].index if counts is not None and len(counts) else []
+                    nan_fills[col] = (pd.Series(modes, dtype=col_stats['empty'].dtype).sort_values().iloc[0]
+                                      if len(modes) else 0)
+            self._run_selections(parts, selections)
+            for col, selection in selections.items():
+                nan_fills[col] = _median_value(selection, stats[col]['empty'].dtype)
+
+            # Infinite fill: median of the column with missing values filled
+            selections = {}
+            for col, col_stats in stats.items():
+                if not col_stats['infinite']:
+                    continue
+                size, extra = col_stats['rows'] - col_stats['missing'], None
+                if col in nan_fills and not pd.isna(nan_fills[col]):
+                    fill = np.array([nan_fills[col]], dtype=col_stats['empty'].dtype)
+                    size, extra = col_stats['rows'], (_sortable_keys(fill)[0], col_stats['missing'])
+                selections[col] = _RadixSelect(_median_ranks(size), size, extra)
+            self._run_selections(parts, selections)
+
+            for col in group:
+                nan_fill = nan_fills.get(col)
+                inf_fill = (_median_value(selections[col], stats[col]['empty'].dtype)
+                            if col in selections else None)
+                if nan_fill is not None or inf_fill is not None:
+                    fill_values[col] = (nan_fill, inf_fill)
+        return fill_values
+
+    @staticmethod
+    def _run_selections(parts: List[Path], selections: Dict[str, "_RadixSelect"]) -> None:
+        """Stream the non-missing values of the selected columns until all are resolved"""
+        while True:
+            active = {col: selection for col, selection in selections.items() if not selection.done}
+            if not active:
+                return
+            for selection in active.values():
+                selection.start_pass()
+            for path in parts:
+                data = pd.read_parquet(path, columns=list(active))
+                for col, selection in active.items():
+                    values = data[col].to_numpy(dtype=np.float64, na_value=np.nan)
+                    selection.update(_sortable_keys(values[~np.isnan(values)]))
+                del data
+            for selection in active.values():
+                selection.finish_pass()
+
+    def _write_filled_parts(self, parts: List[Path], final_path: Path) -> int:
+        """Fill features with universe-wide values and append parts to the final CSV
 
-        logger.info("Data pipeline completed successfully")
-        return final_data
+        Returns:
+            Number of rows written
+        """
+        columns = pq.read_schema(parts[0]).names
+        feature_cols = self.feature_engineer.get_feature_list(pd.DataFrame(columns=columns))
+        fill_values = self._streaming_fill_values(parts, feature_cols)
+
+        total_rows = 0
+        label_counts = pd.Series(dtype='int64')
+        for i, path in enumerate(parts):
+            data = pd.read_parquet(path)
+            for col, (nan_fill, inf_fill) in fill_values.items():
+                data[col] = self._apply_fill_values(data[col], nan_fill, inf_fill)
+            data.to_csv(final_path, mode='a', header=i == 0, index=False)
+            total_rows += len(data)
+            label_counts = label_counts.add(data['label'].value_counts(), fill_value=0)
+
+        logger.info(f"Final dataset: {total_rows} rows, {len(feature_cols)} features")
+        logger.info(f"Label distribution: {dict(label_counts.sort_index().astype(int))}")
+        return total_rows
 
     def clean_and_validate_data(self, data: pd.DataFrame) -> pd.DataFrame:
         """Clean and validate processed data
@@ -116,36 +549,20 @@ class DataPipeline:
 
         initial_rows = len(data)
 
-        # Remove rows without labels
-        data = data.dropna(subset=['label'])
-        logger.info(f"Removed {initial_rows - len(data)} rows without labels")
-
-        # Get feature columns
-        feature_cols = self.feature_engineer.get_feature_list(data)
-
-        # Remove rows with too many missing features
-        missing_threshold = 0.8   # Remove rows with >50% missing features
-        missing_counts = data[feature_cols].isnull().sum(axis=1)
-        valid_rows = missing_counts <= (len(feature_cols) * missing_threshold)
-        data = data[valid_rows]
+        # Remove rows without labels and rows with too many missing features
+        data = self._drop_incomplete_rows(data)
 
         removed_rows = initial_rows - len(data)
-        logger.info(f"Removed {removed_rows} rows with excessive missing values")
+        logger.info(f"Removed {removed_rows} rows without labels or with excessive missing values")
 
-        # Fill remaining missing values
-        for col in feature_cols:
-            if data[col].isnull().any():
-                if data[col].dtype in ['float64', 'int64']:
-                    # Fill numeric columns with median
-                    data[col] = data[col].fillna(data[col].median())
-                else:
-                    # Fill categorical columns with mode
-                    data[col] = data[col].fillna(data[col].mode().iloc[0] if not data[col].mode().empty else 0)
+        # Get feature columns
+        feature_cols = self.feature_engineer.get_feature_list(data)
 
-        # Remove infinite values
+        # Fill remaining missing and infinite values
         for col in feature_cols:
-            if data[col].dtype in ['float64', 'int64']:
-                data[col] = data[col].replace([float('inf'), float('-inf')], data[col].median())
+            nan_fill, inf_fill = self._column_fill_values(data[col])
+            if nan_fill is not None or inf_fill is not None:
+                data[col] = self._apply_fill_values(data[col], nan_fill, inf_fill)
 
         logger.info(f"Final dataset: {len(data)} rows, {len(feature_cols)} features")
 
@@ -155,6 +572,14 @@ class DataPipeline:
 
         return data
 
+    @staticmethod
+    def _split_bounds(n: int, config: Dict[str, Any]) -> Tuple[int, int]:
+        """End positions of the train and validation splits in time order"""
+        splits_config = config.get('data', {}).get('splits', {})
+        train_ratio = splits_config.get('train_ratio', 0.6)
+        val_ratio = splits_config.get('validation_ratio', 0.2)
+        return int(n * train_ratio), int(n * (train_ratio + val_ratio))
+
     def split_data(
         self,
         data: pd.DataFrame,
@@ -169,17 +594,12 @@ class DataPipeline:
         Returns:
             Tuple of (train_data, val_data, test_data)
         """
-        splits_config = config.get('data', {}).get('splits', {})
-        train_ratio = splits_config.get('train_ratio', 0.6)
-        val_ratio = splits_config.get('validation_ratio', 0.2)
-
-        # Sort by timestamp for time-based splitting
+        # Sort by timestamp for time-based splitting (stable, so that rows
+        # of a date keep their order, as in split_dataset_file)
         if 'timestamp' in data.columns:
-            data = data.sort_values('timestamp')
+            data = data.sort_values('timestamp', kind='stable')
 
-        n = len(data)
-        train_end = int(n * train_ratio)
-        val_end = int(n * (train_ratio + val_ratio))
+        train_end, val_end = self._split_bounds(len(data), config)
 
         train_data = data.iloc[:train_end]
         val_data = data.iloc[train_end:val_end]
@@ -199,6 +619,98 @@ class DataPipeline:
 
         return train_data, val_data, test_data
 
+    def split_dataset_file(
+        self,
+        path: Path,
+        config: Dict[str, Any],
+        block_rows: int = SPLIT_BLOCK_ROWS,
+        chunk_rows: int = SPLIT_CHUNK_ROWS
+    ) -> Tuple[int, int, int]:
+        """Write the same split CSVs as split_data, without loading the dataset
+
+        A first pass counts the rows of each timestamp, which gives the
+        position in split_data's (stable) time order of the first row of
+        each date. The CSV is then read in chunks of chunk_rows; each row's
+        position is its date's first position plus the rows of that date
+        seen before it, and rows are spilled to the file of their block of
+        block_rows consecutive positions. Each block is then sorted and
+        appended to the split files in turn, so peak memory is the per-date
+        counts plus about one chunk and one block.
+
+        Args:
+            path: Dataset CSV (e.g. the streaming pipeline's final CSV)
+            config: Configuration with split ratios
+            block_rows: Rows per sorted block
+            chunk_rows: Rows per read chunk
+
+        Returns:
+            Rows in the train, validation and test splits
+        """
+        path = Path(path)
+        date_counts = pd.Series(dtype='int64')
+        for chunk in iter_market_csv(str(path), chunk_rows, usecols=['timestamp']):
+            date_counts = date_counts.add(chunk['timestamp'].value_counts(), fill_value=0)
+        date_counts = date_counts.sort_index().astype('int64')
+        first_position = date_counts.cumsum() - date_counts
+        n = int(date_counts.sum())
+        train_end, val_end = self._split_bounds(n, config)
+        bounds = dict(zip(SPLIT_NAMES, ((0, train_end), (train_end, val_end), (val_end, n))))
+
+        splits_dir = Path("data/final")
+        splits_dir.mkdir(parents=True, exist_ok=True)
+        split_paths = {name: splits_dir / f"{name}_data.csv" for name in SPLIT_NAMES}
+        for split_path in split_paths.values():
+            split_path.unlink(missing_ok=True)
+
+        spill_dir = Path(tempfile.mkdtemp(prefix="splits_", dir=path.parent))
+        try:
+            columns = None
+            seen = pd.Series(0, index=date_counts.index, dtype='int64')
+            for chunk in iter_market_csv(str(path), chunk_rows):
+                columns = chunk.columns.copy()
+                timestamps = chunk['timestamp']
+                within_date = timestamps.groupby(timestamps).cumcount().to_numpy()
+                position = (first_position.reindex(timestamps).to_numpy()
+                            + seen.reindex(timestamps).to_numpy() + within_date)
+                seen = seen.add(timestamps.value_counts(), fill_value=0).astype('int64')
+                chunk['_position'] = position
+                blocks = position // block_rows
+                # Pickled frames appended per block keep the dtypes as they are
+                for block in np.unique(blocks):
+                    with open(spill_dir / f"block-{block:05d}.pkl", 'ab') as spill:
+                        pickle.dump(chunk[blocks == block], spill, protocol=pickle.HIGHEST_PROTOCOL)
+                del chunk, timestamps
+
+            for block in range(-(-n // block_rows)):
+                pieces = []
+                with open(spill_dir / f"block-{block:05d}.pkl", 'rb') as spill:
+                    while True:
+                        try:
+                            pieces.append(pickle.load(spill))
+                        except EOFError:
+                            break
+                rows = pd.concat(pieces, ignore_index=True).sort_values('_position')
+                del pieces
+                positions = rows.pop('_position').to_numpy()
+                for name, (start, stop) in bounds.items():
+                    split_rows = rows[(positions >= start) & (positions < stop)]
+                    if len(split_rows):
+                        split_path = split_paths[name]
+                        split_rows.to_csv(split_path, mode='a', header=not split_path.exists(), index=False)
+                del rows
+        finally:
+            shutil.rmtree(spill_dir, ignore_errors=True)
+
+        # Empty splits still get a header, as in split_data
+        for split_path in split_paths.values():
+            if not split_path.exists() and columns is not None:
+                pd.DataFrame(columns=columns).to_csv(split_path, index=False)
+
+        sizes = tuple(stop - start for start, stop in bounds.values())
+        logger.info(f"Data split - Train: {sizes[0]}, Val: {sizes[1]}, Test: {sizes[2]}")
+        logger.info("Data splits saved")
+        return sizes
+
 
 def run_data_pipeline(
     username: str,
@@ -236,6 +748,39 @@ def run_data_pipeline(
     return final_data
 
 
+def run_streaming_data_pipeline(
+    username: str,
+    password: str,
+    data_config_path: str = "config/data_config.yaml",
+    labeling_config_path: str = "config/labeling_config.yaml"
+) -> int:
+    """Run the streaming data pipeline with configuration files
+
+    The final dataset and its train/val/test splits are written under
+    data/final without the dataset ever being held in memory whole.
+
+    Args:
+        username: FiinQuantX username
+        password: FiinQuantX password
+        data_config_path: Path to data configuration
+        labeling_config_path: Path to labeling configuration
+
+    Returns:
+        Number of rows in the final dataset
+    """
+    # Load configurations
+    data_config = config_loader.load_config("data_config")
+    labeling_config = config_loader.load_config("labeling_config")
+
+    # Combine configs
+    combined_config = {**data_config, **labeling_config}
+
+    # Create and run pipeline, then split the final CSV
+    pipeline = DataPipeline(username, password)
+    final_path = pipeline.run_streaming_pipeline(combined_config)
+    return sum(pipeline.split_dataset_file(final_path, combined_config))
+
+
 if __name__ == "__main__":
     # Example usage
     import os
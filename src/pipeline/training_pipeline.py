@@ -7,6 +7,7 @@ from pathlib import Path
 from typing import Dict, Any, Tuple
 from loguru import logger
 
+from ..data.schema import read_market_csv
 from ..models.xgboost_trainer import create_xgboost_trainer
 from ..utils.config_loader import config_loader
 from ..utils.time_series_split import create_time_series_splits
@@ -39,9 +40,9 @@ class TrainingPipeline:
         """
         data_dir = Path("data/final")
 
-        train_data = pd.read_csv(data_dir / "train_data.csv")
-        val_data = pd.read_csv(data_dir / "val_data.csv")
-        test_data = pd.read_csv(data_dir / "test_data.csv")
+        train_data = read_market_csv(data_dir / "train_data.csv")
+        val_data = read_market_csv(data_dir / "val_data.csv")
+        test_data = read_market_csv(data_dir / "test_data.csv")
 
         logger.info(f"Loaded data - Train: {len(train_data)}, Val: {len(val_data)}, Test: {len(test_data)}")
 
@@ -220,7 +221,8 @@ class TrainingPipeline:
         """Create a prediction function for production use
 
         Returns:
-            Prediction function
+            Prediction function, with the model's input columns in its
+            feature_names attribute
         """
         if self.trainer is None or self.trainer.model is None:
             raise ValueError("Model not trained yet")
@@ -247,6 +249,8 @@ class TrainingPipeline:
 
             return self.trainer.predict(data_features)
 
+        # Lets callers engineer only these features (engineer_features(features=...))
+        predict.feature_names = feature_names
         return predict
 
 
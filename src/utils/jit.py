@@ -0,0 +1,44 @@
+"""Optional Numba JIT compilation for loop kernels
+
+Kernels decorated with ``jit`` are compiled with ``numba.njit(cache=True)``
+when Numba is installed: machine code is written next to the module's
+``__pycache__`` (or under ``NUMBA_CACHE_DIR``) on first use and reloaded by
+later processes, so CLI runs do not pay the compile time again. Without
+Numba the decorator returns the function unchanged, and callers pick their
+NumPy implementation instead (see ``NUMBA_AVAILABLE``). Setting
+``NUMBA_DISABLE_JIT=1`` runs the kernels as plain Python for debugging.
+"""
+
+from typing import Callable, Optional
+
+try:
+    import numba
+except ImportError:
+    numba = None
+
+NUMBA_AVAILABLE = numba is not None
+
+
+def jit(func: Optional[Callable] = None, **options) -> Callable:
+    """Compile a kernel with Numba in nopython mode, cached on disk
+
+    Usable as ``@jit`` or ``@jit(fastmath=False, ...)``.
+
+    Args:
+        func: Kernel to compile
+        **options: Extra ``numba.njit`` options
+
+    Returns:
+        Compiled kernel, or func itself when Numba is not installed
+    """
+    def decorate(kernel: Callable) -> Callable:
+        if numba is None:
+            return kernel
+        return numba.njit(cache=True, **options)(kernel)
+
+    return decorate(func) if func is not None else decorate
+
+
+def python_function(kernel: Callable) -> Callable:
+    """Uncompiled Python implementation of a (possibly compiled) kernel"""
+    return getattr(kernel, 'py_func', kernel)
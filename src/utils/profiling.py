@@ -0,0 +1,64 @@
+"""Runtime and memory measurement helpers"""
+
+import sys
+import time
+from typing import Optional
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+
+def peak_rss_mb() -> Optional[float]:
+    """Peak resident set size of the current process in megabytes
+
+    On Linux the peak is read from /proc/self/status (VmHWM): ru_maxrss
+    survives exec, so in a spawned process it also covers the parent's RSS
+    at the time of the fork.
+
+    Returns:
+        Peak RSS, None where neither source is available
+    """
+    try:
+        with open('/proc/self/status') as status:
+            for line in status:
+                if line.startswith('VmHWM:'):
+                    return int(line.split()[1]) / 1024
+    except OSError:
+        pass
+
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is reported in bytes on macOS and in kilobytes elsewhere
+    return peak / 1024 ** 2 if sys.platform == 'darwin' else peak / 1024
+
+
+def minor_page_faults() -> Optional[int]:
+    """Minor page faults of the current process so far
+
+    Every page of freshly allocated memory faults in once when first touched,
+    so the difference across a call tracks how much new memory it allocated.
+
+    Returns:
+        Fault count, None where the resource module is unavailable
+    """
+    if resource is None:
+        return None
+    return resource.getrusage(resource.RUSAGE_SELF).ru_minflt
+
+
+class Stopwatch:
+    """Wall-clock timer usable as a context manager"""
+
+    def __init__(self):
+        self.started = None
+        self.elapsed = 0.0
+
+    def __enter__(self) -> "Stopwatch":
+        self.started = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.elapsed = time.perf_counter() - self.started